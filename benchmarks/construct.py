@@ -0,0 +1,263 @@
+"""Benchmark of `construct_open_api_with_schema_class` on synthetic
+documents.
+
+Run `python -m benchmarks.construct` from the repository root. The results are written to a JSON file, so
+that the results of different releases can be compared.
+"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+import pydantic
+from pydantic import BaseModel, Field, create_model
+
+from pydantic_openapi_schema.utils.cache import SchemaDefinitionsCache
+from pydantic_openapi_schema.utils.utils import (
+    OpenAPI310PydanticSchema,
+    construct_open_api_with_schema_class,
+)
+from pydantic_openapi_schema.v3_1_0 import (
+    Info,
+    MediaType,
+    OpenAPI,
+    Operation,
+    PathItem,
+    RequestBody,
+    Response,
+)
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+"""The default numbers of paths of the synthetic documents."""
+
+RENAMED_EVERY = 10
+"""Every n-th response class sets `__schema_name__`."""
+
+SHARED_MODELS = 50
+"""The number of nested classes shared between the paths."""
+
+
+class Tag(BaseModel):
+    name: str
+    color: str = Field(default="blue", alias="tagColor")
+
+
+def create_models(index: int, shared_models: Sequence[Type[BaseModel]]) -> Tuple[Type[BaseModel], Type[BaseModel]]:
+    """Create the request and response classes of a path.
+
+    Args:
+        index: The index of the path.
+        shared_models: The nested classes shared between the paths.
+
+    Returns:
+        The request and the response class.
+    """
+    item = create_model(
+        f"Item{index}",
+        __module__=__name__,
+        item_id=(int, Field(alias="itemId")),
+        tags=(List[Tag], Field(default_factory=list)),
+        owner=(shared_models[index % len(shared_models)], ...),
+    )
+    request = create_model(
+        f"Request{index}",
+        __module__=__name__,
+        name=(str, Field(alias="displayName", description="The name of the item.", max_length=64)),
+        items=(List[item], ...),  # type: ignore[valid-type]
+        parent=(Optional[item], None),
+    )
+    response = create_model(
+        f"Response{index}",
+        __module__=__name__,
+        request_id=(int, Field(alias="requestId", ge=0)),
+        result=(item, ...),
+        extra=(Dict[str, float], Field(default_factory=dict)),
+    )
+    if index % RENAMED_EVERY == 0:
+        setattr(response, "__schema_name__", f"RenamedResponse{index}")
+    return request, response
+
+
+def create_document(size: int) -> OpenAPI:
+    """Create a synthetic OpenAPI document.
+
+    Args:
+        size: The number of paths.
+
+    Returns:
+        A document with one operation per path, whose request and response bodies are pydantic classes.
+    """
+    shared_models = [
+        create_model(f"Owner{index}", __module__=__name__, name=(str, ...), email=(Optional[str], None))
+        for index in range(SHARED_MODELS)
+    ]
+    paths = {}
+    for index in range(size):
+        request, response = create_models(index, shared_models)
+        paths[f"/items/{index}"] = PathItem(
+            post=Operation(
+                operationId=f"createItem{index}",
+                requestBody=RequestBody(
+                    content={
+                        "application/json": MediaType(media_type_schema=OpenAPI310PydanticSchema(schema_class=request))
+                    }
+                ),
+                responses={
+                    "200": Response(
+                        description="The created item.",
+                        content={
+                            "application/json": MediaType(
+                                media_type_schema=OpenAPI310PydanticSchema(schema_class=response)
+                            )
+                        },
+                    )
+                },
+            )
+        )
+    return OpenAPI(info=Info(title="Benchmark", version="1.0.0"), paths=paths)
+
+
+def count_models(size: int) -> int:
+    """Count the pydantic classes of a synthetic document.
+
+    Args:
+        size: The number of paths.
+
+    Returns:
+        The number of classes in "#/components/schemas".
+    """
+    return 3 * size + min(size, SHARED_MODELS) + 1
+
+
+def get_cases(cache: SchemaDefinitionsCache) -> Dict[str, Callable[[OpenAPI], OpenAPI]]:
+    """Get the benchmarked variants of `construct_open_api_with_schema_class`.
+
+    Args:
+        cache: The cache used by the "cached" case, it is warmed up before the first measurement.
+
+    Returns:
+        A map of case names to functions that construct a document.
+    """
+    return {
+        "default": lambda document: construct_open_api_with_schema_class(document, cache=None),
+        "copy_on_write": lambda document: construct_open_api_with_schema_class(
+            document, copy_on_write=True, cache=None
+        ),
+        "trusted": lambda document: construct_open_api_with_schema_class(document, cache=None, trusted=True),
+        "cached": lambda document: construct_open_api_with_schema_class(document, cache=cache),
+    }
+
+
+def measure(function: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """Measure the run time and the peak memory of a function.
+
+    Args:
+        function: The function to call.
+        repeat: The number of timed calls.
+
+    Returns:
+        The run times in seconds and the peak of the memory allocated by one more call, traced by `tracemalloc`.
+    """
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "min_seconds": min(timings),
+        "median_seconds": statistics.median(timings),
+        "max_seconds": max(timings),
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def run(sizes: Sequence[int], repeat: int, cases: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Run the benchmark.
+
+    Args:
+        sizes: The numbers of paths of the synthetic documents.
+        repeat: The number of timed calls per case.
+        cases: The names of the cases to run, all cases by default.
+
+    Returns:
+        The results, with the versions and the platform they were measured with.
+    """
+    results = []
+    for size in sizes:
+        document = create_document(size)
+        cache = SchemaDefinitionsCache(maxsize=4 * size)
+        for name, function in get_cases(cache).items():
+            if cases is not None and name not in cases:
+                continue
+            if name == "cached":
+                function(document)
+            result: Dict[str, Any] = {"case": name, "paths": size, "models": count_models(size), "repeat": repeat}
+            result.update(measure(partial(function, document), repeat=repeat))
+            results.append(result)
+            sys.stdout.write(
+                f"{name:>14} {size:>6} paths: {result['min_seconds']:.4f}s, "
+                f"{result['peak_memory_bytes'] / 2 ** 20:.1f} MiB\n"
+            )
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "versions": {
+            "pydantic-openapi-schema": get_package_version(),
+            "pydantic": str(pydantic.VERSION),
+            "python": platform.python_version(),
+        },
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def get_package_version() -> str:
+    """Get the installed version of pydantic-openapi-schema.
+
+    Returns:
+        The version, or "unknown" if the package is not installed.
+    """
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:  # pragma: no cover
+        return "unknown"
+    try:
+        return version("pydantic-openapi-schema")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Run the benchmark from the command line.
+
+    Args:
+        argv: The command line arguments, `sys.argv` by default.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="numbers of paths")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timed calls per case")
+    parser.add_argument("--cases", nargs="+", help="names of the cases to run, all cases by default")
+    parser.add_argument("--output", default="benchmark-results.json", help="path of the JSON results file")
+    args = parser.parse_args(argv)
+    results = run(args.sizes, repeat=args.repeat, cases=args.cases)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+        file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
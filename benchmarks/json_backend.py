@@ -0,0 +1,151 @@
+"""Benchmark of the JSON backends.
+
+Run `python -m benchmarks.json_backend` from the repository root. Documents are parsed with `OpenAPI.parse_raw`
+and serialized with `to_json_bytes`, using the standard library and orjson, if it is installed.
+"""
+import argparse
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pydantic
+
+from benchmarks.construct import create_document, get_package_version, measure
+from pydantic_openapi_schema import json_backend
+from pydantic_openapi_schema.json_backend import JSONBackend
+from pydantic_openapi_schema.utils.serializer import to_json_bytes
+from pydantic_openapi_schema.utils.utils import construct_open_api_with_schema_class
+from pydantic_openapi_schema.v3_1_0 import OpenAPI
+
+SWAGGER_PATH = Path(__file__).parent.parent / "tests" / "data" / "swagger_openapi_v3.0.1.json"
+"""The sample document of the tests."""
+
+DEFAULT_SIZES = (100, 1_000)
+"""The default numbers of paths of the synthetic documents."""
+
+
+def get_backends() -> List[JSONBackend]:
+    """Create the installed JSON backends.
+
+    Returns:
+        The standard library backend, followed by the orjson backend if orjson is installed.
+    """
+    backends = [JSONBackend()]
+    try:
+        backends.append(json_backend.OrjsonBackend())
+    except ImportError:
+        sys.stdout.write("orjson is not installed, only the standard library is measured\n")
+    return backends
+
+
+def get_documents(sizes: Sequence[int]) -> List[Tuple[str, bytes]]:
+    """Load the sample document and create the synthetic documents.
+
+    Args:
+        sizes: The numbers of paths of the synthetic documents.
+
+    Returns:
+        The names and the JSON of the documents.
+    """
+    documents = [("swagger", SWAGGER_PATH.read_bytes())]
+    for size in sizes:
+        document = construct_open_api_with_schema_class(create_document(size))
+        documents.append((f"synthetic-{size}", to_json_bytes(document, backend=JSONBackend())))
+    return documents
+
+
+def parse(data: bytes) -> OpenAPI:
+    """Parse a document with the process-wide backend.
+
+    Args:
+        data: The JSON document.
+
+    Returns:
+        The parsed document.
+    """
+    return OpenAPI.parse_raw(data)
+
+
+def get_cases(data: bytes, backend: JSONBackend) -> Dict[str, Callable[[], Any]]:
+    """Get the measured functions of a document.
+
+    Args:
+        data: The JSON document.
+        backend: The JSON backend.
+
+    Returns:
+        The functions by case name.
+    """
+    open_api = OpenAPI.parse_raw(data)
+    return {
+        "loads": partial(backend.loads, data),
+        "parse_raw": partial(parse, data),
+        "to_json_bytes": partial(to_json_bytes, open_api, backend=backend),
+    }
+
+
+def run(sizes: Sequence[int], repeat: int) -> Dict[str, Any]:
+    """Run the benchmark.
+
+    Args:
+        sizes: The numbers of paths of the synthetic documents.
+        repeat: The number of timed calls per case.
+
+    Returns:
+        The results, with the versions and the platform they were measured with.
+    """
+    results = []
+    for document_name, data in get_documents(sizes):
+        for backend in get_backends():
+            previous = json_backend.set_json_backend(backend)
+            try:
+                for name, function in get_cases(data, backend).items():
+                    result: Dict[str, Any] = {
+                        "case": name,
+                        "document": document_name,
+                        "backend": backend.name,
+                        "bytes": len(data),
+                        "repeat": repeat,
+                    }
+                    result.update(measure(function, repeat=repeat))
+                    results.append(result)
+                    sys.stdout.write(
+                        f"{document_name:>16} {backend.name:>6} {name:>13}: {result['min_seconds'] * 1000:.2f}ms\n"
+                    )
+            finally:
+                json_backend.set_json_backend(previous)
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "versions": {
+            "pydantic-openapi-schema": get_package_version(),
+            "pydantic": str(pydantic.VERSION),
+            "python": platform.python_version(),
+        },
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Run the benchmark from the command line.
+
+    Args:
+        argv: The command line arguments, `sys.argv` by default.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="numbers of paths")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timed calls per case")
+    parser.add_argument("--output", default="benchmark-json-backend.json", help="path of the JSON results file")
+    args = parser.parse_args(argv)
+    results = run(args.sizes, repeat=args.repeat)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+        file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
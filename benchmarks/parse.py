@@ -0,0 +1,188 @@
+"""Benchmark of the validation of `Union[Reference, X]` fields.
+
+Run `python -m benchmarks.parse` from the repository root. Documents are parsed with `OpenAPI.parse_obj` and
+`Schema.parse_obj`, once with the checks of `v3_1_0.reference.dispatch_references` and once with the plain
+`Union` validation of pydantic, which tries every member in order. The deepest nesting of schemas that parses
+without a `RecursionError` is measured in both modes too.
+"""
+import argparse
+import json
+import platform
+import sys
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pydantic
+from pydantic import BaseModel
+from pydantic.fields import ModelField
+
+from benchmarks.construct import get_package_version, measure
+from pydantic_openapi_schema import v3_1_0
+from pydantic_openapi_schema.v3_1_0 import OpenAPI, Schema
+from pydantic_openapi_schema.v3_1_0.reference import ReferenceUnionField
+
+SWAGGER_PATH = Path(__file__).parent.parent / "tests" / "data" / "swagger_openapi_v3.0.1.json"
+"""The sample document of the tests."""
+
+DEFAULT_DEPTHS = (4, 8)
+"""The default nesting depths of the synthetic schemas."""
+
+MAX_DEPTH = 10_000
+"""The deepest nesting of schemas that is tried."""
+
+
+def create_schema(depth: int) -> Dict[str, Any]:
+    """Create a schema with nested properties, items and `$ref`s.
+
+    Args:
+        depth: The nesting depth.
+
+    Returns:
+        The data of the schema, with three nested schemas and two `$ref`s per level.
+    """
+    schema: Dict[str, Any] = {"type": "string"}
+    for level in range(depth):
+        schema = {
+            "type": "object",
+            "properties": {
+                "value": schema,
+                "items": {"type": "array", "items": schema},
+                "ref": {"$ref": f"#/components/schemas/Level{level}"},
+            },
+            "allOf": [{"$ref": "#/components/schemas/Base"}],
+        }
+    return schema
+
+
+def create_nested_items(depth: int) -> Dict[str, Any]:
+    """Create a schema of arrays nested in arrays.
+
+    Args:
+        depth: The nesting depth.
+
+    Returns:
+        The data of the schema.
+    """
+    schema: Dict[str, Any] = {"type": "string"}
+    for _ in range(depth):
+        schema = {"type": "array", "items": schema}
+    return schema
+
+
+def get_max_depth() -> int:
+    """Find the deepest nesting of schemas that parses without a
+    `RecursionError`.
+
+    Returns:
+        The nesting depth.
+    """
+    low, high = 0, MAX_DEPTH
+    while low < high:
+        depth = (low + high + 1) // 2
+        try:
+            Schema.parse_obj(create_nested_items(depth))
+        except RecursionError:
+            high = depth - 1
+        else:
+            low = depth
+    return low
+
+
+@contextmanager
+def pydantic_unions() -> Iterator[None]:
+    """Remove the checks of `dispatch_references` from the `v3_1_0` models
+    while the context is active."""
+    removed: List[Tuple[ModelField, Any]] = []
+    for member in _get_union_members():
+        check = member.validators[0] if member.validators else None
+        if isinstance(getattr(check, "__self__", None), ReferenceUnionField):
+            removed.append((member, member.validators.pop(0)))
+    try:
+        yield
+    finally:
+        for member, check in removed:
+            member.validators.insert(0, check)
+
+
+def get_cases(depths: Sequence[int]) -> Dict[str, Callable[[], Any]]:
+    """Get the measured functions.
+
+    Args:
+        depths: The nesting depths of the synthetic schemas.
+
+    Returns:
+        The functions by case name.
+    """
+    cases: Dict[str, Callable[[], Any]] = {"swagger": partial(OpenAPI.parse_obj, json.loads(SWAGGER_PATH.read_text()))}
+    for depth in depths:
+        cases[f"schema-{depth}"] = partial(Schema.parse_obj, create_schema(depth))
+    return cases
+
+
+def run(depths: Sequence[int], repeat: int) -> Dict[str, Any]:
+    """Run the benchmark.
+
+    Args:
+        depths: The nesting depths of the synthetic schemas.
+        repeat: The number of timed calls per case.
+
+    Returns:
+        The results, with the versions and the platform they were measured with.
+    """
+    results = []
+    for mode in ("dispatched", "pydantic"):
+        with pydantic_unions() if mode == "pydantic" else nullcontext():
+            for name, function in get_cases(depths).items():
+                result: Dict[str, Any] = {"case": name, "mode": mode, "repeat": repeat}
+                result.update(measure(function, repeat=repeat))
+                results.append(result)
+                sys.stdout.write(f"{name:>10} {mode:>10}: {result['min_seconds'] * 1000:.2f}ms\n")
+            max_depth = get_max_depth()
+            results.append({"case": "max_depth", "mode": mode, "depth": max_depth})
+            sys.stdout.write(f"{'max_depth':>10} {mode:>10}: {max_depth}\n")
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "versions": {
+            "pydantic-openapi-schema": get_package_version(),
+            "pydantic": str(pydantic.VERSION),
+            "python": platform.python_version(),
+        },
+        "platform": platform.platform(),
+        "recursion_limit": sys.getrecursionlimit(),
+        "results": results,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Run the benchmark from the command line.
+
+    Args:
+        argv: The command line arguments, `sys.argv` by default.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument("--depths", type=int, nargs="+", default=list(DEFAULT_DEPTHS), help="nesting depths")
+    parser.add_argument("--repeat", type=int, default=20, help="number of timed calls per case")
+    parser.add_argument("--output", default="benchmark-parse.json", help="path of the JSON results file")
+    args = parser.parse_args(argv)
+    results = run(args.depths, repeat=args.repeat)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+        file.write("\n")
+
+
+def _get_union_members() -> Iterator[ModelField]:
+    for name in v3_1_0.__all__:
+        model = getattr(v3_1_0, name)
+        if not isinstance(model, type) or not issubclass(model, BaseModel):
+            continue
+        for field in model.__fields__.values():
+            union_fields = [field, *(field.sub_fields or [])]
+            for union_field in union_fields:
+                yield from union_field.sub_fields or []
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Benchmark of the memory used by `Schema` objects.
+
+Run `python -m benchmarks.schema_memory` from the repository root. The memory of parsed schema nodes is
+compared to that of the same nodes storing a value for every field, like a plain `BaseModel`.
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import pydantic
+
+from benchmarks.construct import get_package_version
+from pydantic_openapi_schema.v3_1_0 import Schema
+
+DEFAULT_NODES = 100_000
+"""The default number of schema nodes."""
+
+DOCUMENT = {
+    "type": "object",
+    "title": "Pet",
+    "required": ["id"],
+    "properties": {"id": {"type": "integer", "format": "int64"}, "name": {"type": "string"}},
+}
+"""A typical schema with 3 schema nodes."""
+
+NODES_PER_DOCUMENT = 3
+
+
+def parse_compact() -> Schema:
+    """Parse the schema like `Schema.parse_obj`.
+
+    Returns:
+        The parsed schema.
+    """
+    return Schema.parse_obj(DOCUMENT)
+
+
+def parse_dense() -> Schema:
+    """Parse the schema and store a value for every field of each node.
+
+    Returns:
+        The parsed schema, whose nodes are as large as those of a plain `BaseModel`.
+    """
+    schema = Schema.parse_obj(DOCUMENT)
+    pending: List[Any] = [schema]
+    while pending:
+        node = pending.pop()
+        object.__setattr__(node, "__dict__", dict(node))
+        pending.extend(node.properties.values() if node.properties else ())
+    return schema
+
+
+def measure(parse: Callable[[], Schema], nodes: int) -> Dict[str, Any]:
+    """Measure the memory of parsed schema nodes.
+
+    Args:
+        parse: The function that parses one schema document.
+        nodes: The number of schema nodes to create.
+
+    Returns:
+        The memory traced by `tracemalloc` while the nodes are alive, in total and per node.
+    """
+    documents = max(nodes // NODES_PER_DOCUMENT, 1)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        parsed = [parse() for _ in range(documents)]
+        memory, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del parsed
+    created_nodes = documents * NODES_PER_DOCUMENT
+    return {"nodes": created_nodes, "memory_bytes": memory, "bytes_per_node": memory / created_nodes}
+
+
+def run(nodes: int) -> Dict[str, Any]:
+    """Run the benchmark.
+
+    Args:
+        nodes: The number of schema nodes per case.
+
+    Returns:
+        The results, with the versions and the platform they were measured with.
+    """
+    results = []
+    for name, parse in (("dense", parse_dense), ("compact", parse_compact)):
+        result: Dict[str, Any] = {"case": name}
+        result.update(measure(parse, nodes))
+        results.append(result)
+        sys.stdout.write(
+            f"{name:>8} {result['nodes']:>7} nodes: {result['memory_bytes'] / 2 ** 20:.1f} MiB, "
+            f"{result['bytes_per_node']:.0f} bytes per node\n"
+        )
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "versions": {
+            "pydantic-openapi-schema": get_package_version(),
+            "pydantic": str(pydantic.VERSION),
+            "python": platform.python_version(),
+        },
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Run the benchmark from the command line.
+
+    Args:
+        argv: The command line arguments, `sys.argv` by default.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument("--nodes", type=int, default=DEFAULT_NODES, help="number of schema nodes")
+    parser.add_argument("--output", default="benchmark-schema-memory.json", help="path of the JSON results file")
+    args = parser.parse_args(argv)
+    results = run(args.nodes)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+        file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
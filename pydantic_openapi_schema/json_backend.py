@@ -0,0 +1,174 @@
+import json
+import re
+from typing import Any, Callable, Optional, Union
+
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?')
+_DIGITS = bytes.maketrans(b"123456789E", b"000000000e")
+"""Replaces every digit with `0` and `E` with `e`, so that long integers and exponents are found with
+`bytes.find`, which is much faster than a regex."""
+_LARGE_INTEGER = b"0" * 19
+_SCAN_CHUNK_SIZE = 16384
+"""The length of the slices of a decoded document that are searched for long integers, so that the
+translated copies stay small."""
+_EXPONENT = b"0e"
+_SMALL_FLOAT = b"0.0000"
+
+
+class JSONBackend:
+    """Encoder and decoder of JSON documents, using the `json` module of
+    the standard library.
+
+    Every backend decodes documents to the same Python objects, and encodes them to the same bytes: UTF-8
+    without escaping non-ASCII characters, either compact or indented by 2 spaces. Subclasses only change
+    how fast this is done.
+    """
+
+    name = "json"
+    """The name of the backend, see [get_json_backend][pydantic_openapi_schema.json_backend.get_json_backend]."""
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """Decode a JSON document.
+
+        Args:
+            data: The document, bytes must be encoded in UTF-8.
+
+        Returns:
+            The decoded document.
+        """
+        return json.loads(data)
+
+    def dumps(self, obj: Any, *, default: Optional[Callable[[Any], Any]] = None, indent: bool = False) -> bytes:
+        """Encode a JSON document.
+
+        Args:
+            obj: The document, made of dicts, lists, strings, numbers, booleans and `None`.
+            default: The function that converts other objects to values that can be encoded.
+            indent: Whether to indent nested values by 2 spaces.
+
+        Returns:
+            The document encoded in UTF-8.
+        """
+        if indent:
+            return json.dumps(obj, default=default, ensure_ascii=False, indent=2).encode()
+        return json.dumps(obj, default=default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class OrjsonBackend(JSONBackend):
+    """JSON backend using [orjson](https://github.com/ijl/orjson).
+
+    orjson writes floats in another notation than the standard library, e.g. `1e16` instead of `1e+16`,
+    such numbers are rewritten in the output. Documents that orjson cannot process, e.g. integers beyond 64
+    bits, are handled by the standard library. Only non-finite floats, which are not valid JSON, are encoded
+    differently: orjson writes them as `null`.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        """Initialize `OrjsonBackend`.
+
+        Raises:
+            ImportError: If orjson is not installed.
+        """
+        import orjson  # pylint: disable=import-outside-toplevel
+
+        self._orjson = orjson
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        if not _has_large_integer(data):
+            try:
+                return self._orjson.loads(data)
+            except self._orjson.JSONDecodeError:
+                pass
+        return json.loads(data)
+
+    def dumps(self, obj: Any, *, default: Optional[Callable[[Any], Any]] = None, indent: bool = False) -> bytes:
+        option = self._orjson.OPT_NON_STR_KEYS | (self._orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            output: bytes = self._orjson.dumps(obj, default=default, option=option)
+        except TypeError:
+            return super().dumps(obj, default=default, indent=indent)
+        if _SMALL_FLOAT not in output and output.translate(_DIGITS).find(_EXPONENT) < 0:
+            return output
+        return _TOKEN.sub(_repr_float, output)
+
+
+def get_json_backend(name: Optional[str] = None) -> JSONBackend:
+    """Create a JSON backend.
+
+    Args:
+        name: `"orjson"` or `"json"`, by default orjson if it is installed, otherwise the standard library.
+
+    Raises:
+        ValueError: If the backend is unknown.
+        ImportError: If orjson is requested but not installed.
+
+    Returns:
+        The backend.
+    """
+    if name is None:
+        try:
+            return OrjsonBackend()
+        except ImportError:
+            return JSONBackend()
+    for backend_class in (OrjsonBackend, JSONBackend):
+        if backend_class.name == name:
+            return backend_class()
+    raise ValueError(f"unknown JSON backend {name!r}")
+
+
+json_backend = get_json_backend()
+"""The process-wide backend, used by `loads` and by default for serialization."""
+
+
+def set_json_backend(backend: Union[str, JSONBackend, None]) -> JSONBackend:
+    """Replace the process-wide JSON backend.
+
+    Args:
+        backend: A backend, the name of a backend, or `None` for the fastest installed backend.
+
+    Returns:
+        The previous backend.
+    """
+    global json_backend  # pylint: disable=global-statement
+    previous = json_backend
+    json_backend = backend if isinstance(backend, JSONBackend) else get_json_backend(backend)
+    return previous
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode a JSON document with the process-wide backend.
+
+    This is the `json_loads` of `v3_1_0.OpenAPI`, used by `parse_raw` and `parse_file`.
+
+    Args:
+        data: The document.
+
+    Returns:
+        The decoded document.
+    """
+    return json_backend.loads(data)
+
+
+def _has_large_integer(data: Union[str, bytes]) -> bool:
+    """Check whether a document has a number of at least 19 digits, which
+    orjson could decode to a float.
+
+    The document is searched slice by slice, the slices overlap so that numbers are found across their
+    boundaries.
+    """
+    overlap = len(_LARGE_INTEGER) - 1
+    for end in range(_SCAN_CHUNK_SIZE, len(data) + _SCAN_CHUNK_SIZE, _SCAN_CHUNK_SIZE):
+        start = max(end - _SCAN_CHUNK_SIZE - overlap, 0)
+        chunk = data[start:end]
+        encoded = chunk.encode("utf-8", "surrogatepass") if isinstance(chunk, str) else chunk
+        if encoded.translate(_DIGITS).find(_LARGE_INTEGER) >= 0:
+            return True
+    return False
+
+
+def _repr_float(match: "re.Match[bytes]") -> bytes:
+    token = match.group()
+    if token[:1] == b'"' or not (b"." in token or b"e" in token or b"E" in token):
+        return token
+    return repr(float(token)).encode()
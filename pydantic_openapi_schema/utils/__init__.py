@@ -1,3 +1,61 @@
+from .async_builder import AsyncOpenAPIBuilder
+from .builder import OpenAPIBuilder
+from .bundler import Bundler, ParsedFileCache, bundle, fetch_file, fetch_url
+from .dereference import Dereferencer, dereference
+from .hash_consing import HashConsStats, HashConsTable, hash_cons
+from .interning import InternStats, StringInterner, intern_strings
+from .json_cache import JSONCache, cached_json
+from .lazy import LazyModelDict, lazy_parse_file, lazy_parse_obj, lazy_parse_raw
+from .profiling import BuildProfiler, PhaseStats
+from .ref_index import ReferenceIndex
+from .serializer import to_dict, to_json, to_json_bytes
+from .spec_index import SpecIndex
+from .streaming import StreamEntry, iter_entries, iter_path_items, iter_schemas
+from .trusted import trusted_parse_file, trusted_parse_obj, trusted_parse_raw
 from .utils import construct_open_api_with_schema_class
+from .writer import aiter_json, aiter_yaml, iter_json, iter_yaml, write_json, write_yaml
 
-__all__ = ["construct_open_api_with_schema_class"]
+__all__ = [
+    "AsyncOpenAPIBuilder",
+    "BuildProfiler",
+    "Bundler",
+    "Dereferencer",
+    "HashConsStats",
+    "HashConsTable",
+    "InternStats",
+    "JSONCache",
+    "LazyModelDict",
+    "OpenAPIBuilder",
+    "ParsedFileCache",
+    "PhaseStats",
+    "ReferenceIndex",
+    "SpecIndex",
+    "StreamEntry",
+    "StringInterner",
+    "aiter_json",
+    "aiter_yaml",
+    "bundle",
+    "cached_json",
+    "construct_open_api_with_schema_class",
+    "dereference",
+    "fetch_file",
+    "fetch_url",
+    "hash_cons",
+    "intern_strings",
+    "iter_entries",
+    "iter_json",
+    "iter_path_items",
+    "iter_schemas",
+    "iter_yaml",
+    "lazy_parse_file",
+    "lazy_parse_obj",
+    "lazy_parse_raw",
+    "to_dict",
+    "to_json",
+    "to_json_bytes",
+    "trusted_parse_file",
+    "trusted_parse_obj",
+    "trusted_parse_raw",
+    "write_json",
+    "write_yaml",
+]
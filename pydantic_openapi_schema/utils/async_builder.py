@@ -0,0 +1,123 @@
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, Dict, Generator, Optional, Tuple, TypeVar, cast
+
+from pydantic_openapi_schema import v3_1_0
+from pydantic_openapi_schema.utils.builder import OpenAPIBuilder
+from pydantic_openapi_schema.utils.profiling import profile_phase
+from pydantic_openapi_schema.utils.utils import (
+    References,
+    T,
+    _walk_copy_on_write,
+    _walk_extract_references,
+)
+
+W = TypeVar("W")
+
+
+class AsyncOpenAPIBuilder:
+    """Awaitable variant of
+    [OpenAPIBuilder][pydantic_openapi_schema.utils.builder.OpenAPIBuilder] that does not block the event loop.
+
+    The replacement of the pydantic classes with references walks the document on the event loop, and gives
+    control back to the loop after every `yield_every` visited containers. The deep copy of the document (if
+    the builder does not use `copy_on_write`), the generation of the JSON schemas and the creation of the
+    `Schema` objects run in `executor`.
+
+    Concurrent calls of [build][pydantic_openapi_schema.utils.async_builder.AsyncOpenAPIBuilder.build] with
+    the same document share one build. Builds of different documents run one after another. A build is not
+    cancelled when the callers awaiting it are cancelled.
+    """
+
+    def __init__(
+        self,
+        builder: Optional[OpenAPIBuilder] = None,
+        executor: Optional[Executor] = None,
+        yield_every: int = 1000,
+    ) -> None:
+        """Initialize `AsyncOpenAPIBuilder`.
+
+        Args:
+            builder: The builder that generates the component schemas, a copy-on-write `OpenAPIBuilder` by
+                default. The builder must not be used elsewhere while an async build runs.
+            executor: The executor of the CPU-bound phases, the default executor of the event loop if `None`.
+            yield_every: The number of containers visited between two yields to the event loop.
+        """
+        self.builder = builder if builder is not None else OpenAPIBuilder(copy_on_write=True)
+        self.executor = executor
+        self.yield_every = yield_every
+        self._in_flight: Dict[int, Tuple[v3_1_0.OpenAPI, "asyncio.Future[Any]"]] = {}
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def build(self, open_api_schema: T) -> T:
+        """Construct a new OpenAPI object, reusing the JSON schemas of
+        previous builds.
+
+        Args:
+            open_api_schema: An instance of the OpenAPI model, it must not be modified until the build is done.
+
+        Returns:
+            new OpenAPI object with "#/components/schemas" values updated. If there is no update in
+                "#/components/schemas" values, the original `open_api` will be returned.
+        """
+        key = id(open_api_schema)
+        future: "asyncio.Future[Any]"
+        in_flight = self._in_flight.get(key)
+        if in_flight is None:
+            future = asyncio.ensure_future(self._build(open_api_schema))
+            self._in_flight[key] = (open_api_schema, future)
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            future = in_flight[1]
+        return cast("T", await asyncio.shield(future))
+
+    async def _build(self, open_api_schema: T) -> T:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            loop = asyncio.get_event_loop()
+            builder = self.builder
+            references: References = {}
+            if builder.copy_on_write:
+                with profile_phase(builder.profiler, "extract") as phase:
+                    copied_schema, nodes = await self._run_walk(
+                        _walk_copy_on_write(
+                            open_api_schema, ref_class=v3_1_0.Reference, references=references, budget=self.yield_every
+                        )
+                    )
+                    phase.count(nodes=nodes, schema_classes=len(references))
+            else:
+                with profile_phase(builder.profiler, "copy"):
+                    copied_schema = await loop.run_in_executor(self.executor, partial(open_api_schema.copy, deep=True))
+                with profile_phase(builder.profiler, "extract") as phase:
+                    nodes = await self._run_walk(
+                        _walk_extract_references(
+                            copied_schema, ref_class=v3_1_0.Reference, references=references, budget=self.yield_every
+                        )
+                    )
+                    phase.count(nodes=nodes, schema_classes=len(references))
+            return cast(
+                "T",
+                await loop.run_in_executor(
+                    self.executor, builder.update_components, open_api_schema, copied_schema, references
+                ),
+            )
+
+    @staticmethod
+    async def _run_walk(walk: Generator[None, None, W]) -> W:
+        """Run a walk of the document, yielding to the event loop whenever
+        the walk yields.
+
+        Args:
+            walk: A generator created by one of the `_walk_*` functions.
+
+        Returns:
+            The return value of the walk.
+        """
+        while True:
+            try:
+                next(walk)
+            except StopIteration as stop:
+                return cast("W", stop.value)
+            await asyncio.sleep(0)
@@ -0,0 +1,170 @@
+from concurrent.futures import Executor
+from typing import Dict, FrozenSet, NamedTuple, Optional, Type
+
+from pydantic import BaseModel
+
+from pydantic_openapi_schema import v3_1_0
+from pydantic_openapi_schema.utils.cache import (
+    SchemaDefinitions,
+    SchemaDefinitionsCache,
+)
+from pydantic_openapi_schema.utils.interning import StringInterner
+from pydantic_openapi_schema.utils.profiling import BuildProfiler, profile_phase
+from pydantic_openapi_schema.utils.registry import (
+    SchemaNameRegistry,
+    resolve_schema_names,
+    schema_name_registry,
+)
+from pydantic_openapi_schema.utils.utils import (
+    References,
+    T,
+    create_model_name_map,
+    get_component_schemas,
+    get_schema_definitions_map,
+    parse_schema_definitions,
+    replace_pydantic_types_with_references,
+    sort_schema_classes,
+    update_references,
+)
+
+
+class _SchemaClassEntry(NamedTuple):
+    definitions: SchemaDefinitions
+    """The JSON schema definitions of the class and its nested models."""
+
+    schemas: Dict[str, v3_1_0.Schema]
+    """The component schemas parsed from the definitions."""
+
+
+class OpenAPIBuilder:
+    """Incremental variant of
+    [construct_open_api_with_schema_class][pydantic_openapi_schema.utils.utils.construct_open_api_with_schema_class].
+
+    The builder remembers the component schemas it generated for every pydantic class it has seen. When it
+    is called again, only the definitions of classes that were added (or whose definition names changed) are
+    generated, the `Schema` objects of all other classes are reused from the previous build.
+
+    Classes are tracked by identity: a class that is re-created, e.g. by reloading its module, is treated as
+    a new class and the definitions of classes that are no longer referenced are dropped.
+    """
+
+    def __init__(
+        self,
+        copy_on_write: bool = False,
+        cache: Optional[SchemaDefinitionsCache] = None,
+        registry: SchemaNameRegistry = schema_name_registry,
+        executor: Optional[Executor] = None,
+        trusted: bool = False,
+        profiler: Optional[BuildProfiler] = None,
+        interner: Optional[StringInterner] = None,
+    ) -> None:
+        """Initialize `OpenAPIBuilder`.
+
+        Args:
+            copy_on_write: If `True`, built documents share all objects that hold no pydantic classes
+                with the input document.
+            cache: The cache of generated JSON schema definitions, e.g. `schema_definitions_cache`, if any.
+            registry: The registry of the classes used to generate the JSON schemas.
+            executor: The executor used to generate the JSON schemas of classes that share no nested
+                models in parallel, if any.
+            trusted: If `True`, the `Schema` objects are created from the generated definitions without
+                validation.
+            profiler: A profiler that records the statistics of the phases of every build, if any.
+            interner: If set, the $references and the repeated strings of the generated `Schema` objects
+                are interned.
+        """
+        self.copy_on_write = copy_on_write
+        self.cache = cache
+        self.registry = registry
+        self.executor = executor
+        self.trusted = trusted
+        self.profiler = profiler
+        self.interner = interner
+        self._entries: Dict[Type[BaseModel], _SchemaClassEntry] = {}
+
+    @property
+    def schema_classes(self) -> FrozenSet[Type[BaseModel]]:
+        """The pydantic classes referenced by the most recently built document."""
+        return frozenset(self._entries)
+
+    def build(self, open_api_schema: T) -> T:
+        """Construct a new OpenAPI object, reusing the JSON schemas of
+        previous builds.
+
+        Args:
+            open_api_schema: An instance of the OpenAPI model.
+
+        Returns:
+            new OpenAPI object with "#/components/schemas" values updated. If there is no update in
+                "#/components/schemas" values, the original `open_api` will be returned.
+        """
+        copied_schema, references = replace_pydantic_types_with_references(
+            open_api_schema, copy_on_write=self.copy_on_write, profiler=self.profiler
+        )
+        return self.update_components(open_api_schema, copied_schema, references)
+
+    def update_components(self, open_api_schema: T, copied_schema: T, references: References) -> T:
+        """Update "#/components/schemas" of a document whose pydantic
+        classes were replaced with references.
+
+        Args:
+            open_api_schema: The input document.
+            copied_schema: The document with references, see
+                [replace_pydantic_types_with_references][pydantic_openapi_schema.utils.utils.replace_pydantic_types_with_references].
+            references: The pydantic classes and the references created for them.
+
+        Returns:
+            `copied_schema` with updated component schemas, or `open_api_schema` if there are no references.
+        """
+        if not references:
+            self._entries = {}
+            return open_api_schema
+
+        with profile_phase(self.profiler, "resolve_names") as phase:
+            schema_names = resolve_schema_names(references)
+            update_references(references, schema_names, interner=self.interner)
+            phase.count(schema_classes=len(schema_names))
+        component_schemas = get_component_schemas(copied_schema)
+
+        with profile_phase(self.profiler, "create_classes") as phase:
+            schema_classes = {
+                self.registry.get_schema_class(model, name): model for model, name in schema_names.items()
+            }
+            phase.count(schema_classes=len(schema_classes))
+        with profile_phase(self.profiler, "generate") as phase:
+            model_name_map = create_model_name_map(schema_classes)
+            definition_names = set(model_name_map.values())
+            sorted_classes = sort_schema_classes(schema_classes)
+            entries: Dict[Type[BaseModel], _SchemaClassEntry] = {}
+            changed_classes: Dict[Type[BaseModel], Type[BaseModel]] = {}
+            for schema_class in sorted_classes:
+                model = schema_classes[schema_class]
+                entry = self._entries.get(model)
+                if entry is None or not entry.definitions.is_valid(model_name_map[schema_class], definition_names):
+                    changed_classes[schema_class] = model
+                else:
+                    entries[model] = entry
+            changed_definitions = get_schema_definitions_map(
+                changed_classes,
+                model_name_map=model_name_map,
+                definition_names=definition_names,
+                cache=self.cache,
+                executor=self.executor,
+            )
+            phase.count(
+                nodes=sum(len(entry.definitions) for entry in changed_definitions.values()),
+                schema_classes=len(changed_classes),
+            )
+        with profile_phase(self.profiler, "parse") as phase:
+            for schema_class, definitions in changed_definitions.items():
+                entries[changed_classes[schema_class]] = _SchemaClassEntry(
+                    definitions=definitions,
+                    schemas=parse_schema_definitions(
+                        definitions.definitions, trusted=self.trusted, interner=self.interner
+                    ),
+                )
+                phase.count(nodes=len(definitions.definitions))
+        for schema_class in sorted_classes:
+            component_schemas.update(entries[schema_classes[schema_class]].schemas)
+        self._entries = entries
+        return copied_schema
@@ -0,0 +1,383 @@
+import hashlib
+import re
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
+from threading import Lock
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple, Type, Union
+from urllib.parse import unquote, urldefrag, urljoin, urlparse
+from urllib.request import url2pathname, urlopen
+
+from pydantic import BaseModel
+
+from pydantic_openapi_schema import json_backend, v3_1_0
+from pydantic_openapi_schema.utils.ref_index import (
+    _MISSING,
+    _escape,
+    _get_field_names,
+    _get_ref_name,
+    _resolve_pointer,
+)
+from pydantic_openapi_schema.v3_1_0.reference import REF_KEY, get_reference_union_fields
+
+Fetcher = Callable[[str], bytes]
+"""A function that reads the content of an absolute URI."""
+
+_COMPONENT_SECTIONS: Tuple[Tuple[Type[BaseModel], str], ...] = (
+    (v3_1_0.Schema, "schemas"),
+    (v3_1_0.Response, "responses"),
+    (v3_1_0.Parameter, "parameters"),
+    (v3_1_0.Example, "examples"),
+    (v3_1_0.RequestBody, "requestBodies"),
+    (v3_1_0.Header, "headers"),
+    (v3_1_0.SecurityScheme, "securitySchemes"),
+    (v3_1_0.Link, "links"),
+    (v3_1_0.PathItem, "pathItems"),
+)
+"""The map of `Components` each class of bundled objects is added to."""
+
+_INVALID_NAME_CHARACTERS = re.compile(r"[^A-Za-z0-9._-]+")
+_YAML_SUFFIXES = (".yaml", ".yml")
+
+_Child = Tuple[Any, Optional[Type[BaseModel]]]
+"""A node and the class of the objects its `Reference`s stand for."""
+
+DEFAULT_MAX_WORKERS = 8
+"""The default number of files loaded at the same time."""
+
+
+class ParsedFileCache:
+    """Thread-safe cache of parsed JSON and YAML files, by the SHA-256 of
+    their content.
+
+    Files with the same content are parsed once, also when they are loaded from different URIs or by
+    different bundles. The parsed values are shared and must not be changed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize `ParsedFileCache`."""
+        self._values: Dict[Tuple[str, str], Any] = {}
+        self._lock = Lock()
+        self.hits = 0
+        """The number of files whose parsed value was reused."""
+        self.misses = 0
+        """The number of files that were parsed."""
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, content: bytes, yaml: bool = False) -> Any:
+        """Parse the content of a file, or get the value parsed before.
+
+        Args:
+            content: The content of the file, encoded in UTF-8.
+            yaml: Whether the file is YAML rather than JSON.
+
+        Raises:
+            ImportError: If the file is YAML and PyYAML is not installed.
+
+        Returns:
+            The parsed value.
+        """
+        key = ("yaml" if yaml else "json", hashlib.sha256(content).hexdigest())
+        with self._lock:
+            if key in self._values:
+                self.hits += 1
+                return self._values[key]
+        value = _load_yaml(content) if yaml else json_backend.loads(content)
+        with self._lock:
+            self.misses += 1
+            return self._values.setdefault(key, value)
+
+    def clear(self) -> None:
+        """Remove all parsed values."""
+        with self._lock:
+            self._values.clear()
+
+
+class Bundler:
+    """Bundler of OpenAPI documents split across files.
+
+    [bundle][pydantic_openapi_schema.utils.bundler.Bundler.bundle] loads a document and every file its
+    `$ref`s point to, e.g. `Pet.json` or `definitions.json#/Pet`, and returns one self-contained document.
+    The objects the external `$ref`s point to are validated as the class of the field the `Reference` is
+    in, added to the `Components` of the document, and the `$ref`s are rewritten to point to them, e.g.
+    `#/components/schemas/Pet`. The `$ref`s within the bundled objects are resolved relative to the file
+    they come from, so internal `$ref`s of other files are bundled as well.
+
+    Files are read by `fetcher`, which by default only reads local files, and loaded at the same time in
+    `executor`. Each file is loaded once per bundle, and parsed once per content by the `ParsedFileCache`.
+    """
+
+    def __init__(
+        self,
+        fetcher: Optional[Fetcher] = None,
+        cache: Optional[ParsedFileCache] = None,
+        executor: Optional[Executor] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        model_class: Type[v3_1_0.OpenAPI] = v3_1_0.OpenAPI,
+    ) -> None:
+        """Initialize `Bundler`.
+
+        Args:
+            fetcher: The function that reads a file by URI, `fetch_file` by default. Use `fetch_url` to also
+                load `$ref`s to http and https URLs.
+            cache: The cache of parsed files, shared by all bundles of the bundler if `None`.
+            executor: The executor the files are loaded in, a thread pool with `max_workers` threads per
+                bundle if `None`.
+            max_workers: The number of threads if `executor` is `None`.
+            model_class: The OpenAPI model class the document is validated with.
+        """
+        self.fetcher = fetcher if fetcher is not None else fetch_file
+        self.cache = cache if cache is not None else ParsedFileCache()
+        self.executor = executor
+        self.max_workers = max_workers
+        self.model_class = model_class
+
+    def bundle(self, source: Union[str, Path]) -> v3_1_0.OpenAPI:
+        """Bundle a document and the files it references.
+
+        Args:
+            source: The path or the URI of the document.
+
+        Raises:
+            KeyError: If a `$ref` does not point to anything.
+            ValueError: If `$ref`s point to each other in a cycle, or a `$ref` is in a field whose objects
+                cannot be added to `Components`.
+
+        Returns:
+            The self-contained document.
+        """
+        root_uri = _to_uri(source)
+        open_api = self.model_class.parse_obj(self._load(root_uri))
+        if self.executor is not None:
+            return _BundleRun(self, self.executor, root_uri, open_api).run()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return _BundleRun(self, executor, root_uri, open_api).run()
+
+    def _load(self, uri: str) -> Any:
+        content = self.fetcher(uri)
+        return self.cache.get(content, yaml=urlparse(uri).path.lower().endswith(_YAML_SUFFIXES))
+
+
+def bundle(source: Union[str, Path], fetcher: Optional[Fetcher] = None) -> v3_1_0.OpenAPI:
+    """Bundle a document and the files it references into one document.
+
+    See [Bundler][pydantic_openapi_schema.utils.bundler.Bundler], create one to reuse the parsed files across
+    bundles.
+
+    Args:
+        source: The path or the URI of the document.
+        fetcher: The function that reads a file by URI, `fetch_file` by default.
+
+    Returns:
+        The self-contained document.
+    """
+    return Bundler(fetcher=fetcher).bundle(source)
+
+
+def fetch_file(uri: str) -> bytes:
+    """Read a local file.
+
+    Args:
+        uri: A `file` URI.
+
+    Raises:
+        ValueError: If the URI is not a `file` URI.
+
+    Returns:
+        The content of the file.
+    """
+    parsed = urlparse(uri)
+    if parsed.scheme != "file":
+        raise ValueError(f"cannot load {uri!r}, only local files are loaded by default")
+    with open(url2pathname(parsed.path), "rb") as file:
+        return file.read()
+
+
+def fetch_url(uri: str, timeout: float = 30) -> bytes:
+    """Read a local file, or a file over http or https.
+
+    Args:
+        uri: A `file`, `http` or `https` URI.
+        timeout: The timeout of http requests, in seconds.
+
+    Raises:
+        ValueError: If the URI has another scheme.
+
+    Returns:
+        The content of the file.
+    """
+    scheme = urlparse(uri).scheme
+    if scheme == "file":
+        return fetch_file(uri)
+    if scheme not in ("http", "https"):
+        raise ValueError(f"cannot load {uri!r}, unsupported scheme {scheme!r}")
+    with urlopen(uri, timeout=timeout) as response:  # nosec: the scheme is checked
+        content: bytes = response.read()
+        return content
+
+
+class _PendingRef:
+    """An object with a `$ref` to bundle."""
+
+    __slots__ = ("node", "ref_name", "model", "uri", "seen")
+
+    def __init__(self, node: BaseModel, ref_name: str, model: Optional[Type[BaseModel]], uri: str) -> None:
+        self.node = node
+        self.ref_name = ref_name
+        self.model = model
+        """The class of the object the `$ref` points to."""
+        self.uri = uri
+        """The absolute URI of the `$ref`."""
+        self.seen: Set[str] = set()
+        """The URIs of the `$ref`s followed to get to `uri`."""
+
+
+class _BundleRun:
+    """The state of one bundle."""
+
+    def __init__(self, bundler: Bundler, executor: Executor, root_uri: str, open_api: v3_1_0.OpenAPI) -> None:
+        self.bundler = bundler
+        self.executor = executor
+        self.root_uri = root_uri
+        self.open_api = open_api
+        self.loaded: Dict[str, Any] = {}
+        self.loading: Dict[str, "Future[Any]"] = {}
+        self.waiting: Dict[str, List[_PendingRef]] = {}
+        self.bundled: Dict[Tuple[str, Optional[Type[BaseModel]]], str] = {}
+        """The rewritten `$ref`s, by absolute URI and class of the target."""
+        self.queue: Deque[_PendingRef] = deque()
+
+    def run(self) -> v3_1_0.OpenAPI:
+        self.add_refs(self.open_api, self.root_uri)
+        while self.queue or self.loading:
+            while self.queue:
+                self.process(self.queue.popleft())
+            if self.loading:
+                # The files are used in the order they were requested, while the others are still loading, so
+                # that the components are added in the same order every time.
+                uri = next(iter(self.loading))
+                self.loaded[uri] = self.loading.pop(uri).result()
+                self.queue.extend(self.waiting.pop(uri))
+        return self.open_api
+
+    def add_refs(self, node: Any, base_uri: str) -> None:
+        """Queue the `$ref`s of a node, without recursion."""
+        pending: List[_Child] = [(node, None)]
+        while pending:
+            node, model = pending.pop()
+            if isinstance(node, BaseModel):
+                children = self.get_model_children(node, model, base_uri)
+            elif isinstance(node, dict):
+                children = [(value, model) for value in node.values()]
+            elif isinstance(node, list):
+                children = [(value, model) for value in node]
+            else:
+                continue
+            pending.extend(reversed(children))
+
+    def get_model_children(self, node: BaseModel, model: Optional[Type[BaseModel]], base_uri: str) -> List[_Child]:
+        ref_name = _get_ref_name(type(node))
+        ref = None if ref_name is None else node.__dict__.get(ref_name)
+        if ref_name is not None and isinstance(ref, str):
+            target_model = model if isinstance(node, v3_1_0.Reference) else type(node)
+            self.queue.append(_PendingRef(node, ref_name, target_model, urljoin(base_uri, ref)))
+        union_models = _get_union_models(type(node))
+        return [
+            (value, union_models.get(name))
+            for name, value in node.__dict__.items()
+            if isinstance(value, (BaseModel, dict, list))
+        ]
+
+    def process(self, pending: _PendingRef) -> None:
+        document_uri, fragment = urldefrag(pending.uri)
+        if document_uri == self.root_uri:
+            setattr(pending.node, pending.ref_name, "#" + fragment)
+            return
+        if document_uri not in self.loaded:
+            self.waiting.setdefault(document_uri, []).append(pending)
+            if document_uri not in self.loading:
+                self.loading[document_uri] = self.executor.submit(self.bundler._load, document_uri)
+            return
+        bundled_ref = self.bundled.get((pending.uri, pending.model))
+        if bundled_ref is None:
+            target = _resolve_pointer(self.loaded[document_uri], unquote(fragment))
+            if target is _MISSING:
+                raise KeyError(pending.uri)
+            if isinstance(target, dict) and isinstance(target.get(REF_KEY), str):
+                self.follow(pending, urljoin(document_uri, target[REF_KEY]))
+                return
+            bundled_ref = self.add_component(pending, target, document_uri, fragment)
+        setattr(pending.node, pending.ref_name, bundled_ref)
+
+    def follow(self, pending: _PendingRef, uri: str) -> None:
+        """Queue the `$ref` of an object a `$ref` points to."""
+        pending.seen.add(pending.uri)
+        if uri in pending.seen:
+            raise ValueError(f"circular $ref {uri!r}")
+        pending.uri = uri
+        self.queue.append(pending)
+
+    def add_component(self, pending: _PendingRef, target: Any, document_uri: str, fragment: str) -> str:
+        if pending.model is None:
+            raise ValueError(f"cannot bundle $ref {pending.uri!r}, the class of its target is unknown")
+        section = next((name for model, name in _COMPONENT_SECTIONS if issubclass(pending.model, model)), None)
+        if section is None:
+            raise ValueError(f"cannot bundle $ref {pending.uri!r}, {pending.model.__name__} is not a component")
+        component = pending.model.parse_obj(target)
+        if self.open_api.components is None:
+            self.open_api.components = v3_1_0.Components()
+        components_map = getattr(self.open_api.components, section)
+        if components_map is None:
+            components_map = {}
+            setattr(self.open_api.components, section, components_map)
+        name = _create_component_name(document_uri, fragment, components_map)
+        components_map[name] = component
+        bundled_ref = f"#/components/{section}/{_escape(name)}"
+        self.bundled[(pending.uri, pending.model)] = bundled_ref
+        for uri in pending.seen:
+            self.bundled[(uri, pending.model)] = bundled_ref
+        self.add_refs(component, document_uri)
+        return bundled_ref
+
+
+def _to_uri(source: Union[str, Path]) -> str:
+    if isinstance(source, str) and urlparse(source).scheme in ("file", "http", "https"):
+        return source
+    return Path(source).resolve().as_uri()
+
+
+def _load_yaml(content: bytes) -> Any:
+    try:
+        import yaml  # pylint: disable=import-outside-toplevel
+    except ImportError as error:
+        raise ImportError("PyYAML is required to load YAML files") from error
+    return yaml.safe_load(content)
+
+
+def _create_component_name(document_uri: str, fragment: str, components_map: Dict[str, Any]) -> str:
+    """Create a unique name for a bundled component, from the last token of
+    the fragment or the name of the file."""
+    tokens = [token for token in unquote(fragment).split("/") if token]
+    name = (
+        tokens[-1].replace("~1", "/").replace("~0", "~") if tokens else PurePosixPath(urlparse(document_uri).path).stem
+    )
+    name = _INVALID_NAME_CHARACTERS.sub("_", name) or "Component"
+    unique_name, index = name, 1
+    while unique_name in components_map:
+        index += 1
+        unique_name = f"{name}{index}"
+    return unique_name
+
+
+@lru_cache(maxsize=256)
+def _get_union_models(model_class: Type[BaseModel]) -> Dict[str, Optional[Type[BaseModel]]]:
+    """Get the class of the objects a `Reference` in each field of a pydantic
+    class stands for, by field name."""
+    field_names = _get_field_names(model_class)
+    return {
+        field_names.get(union_field.keys[0], union_field.keys[0]): union_field.model
+        for union_field in get_reference_union_fields(model_class)
+    }
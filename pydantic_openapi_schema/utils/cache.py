@@ -0,0 +1,164 @@
+import pickle
+from collections import OrderedDict
+from threading import RLock
+from typing import Any, Dict, FrozenSet, NamedTuple, Optional, Set, Tuple, Type
+from weakref import ref
+
+from pydantic import BaseModel
+
+_CacheKey = Tuple["ref[Type[BaseModel]]", str, Optional[str]]
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    """Number of lookups that returned cached definitions."""
+
+    misses: int
+    """Number of lookups that found no (valid) cached definitions."""
+
+    maxsize: int
+    """Maximum number of cached entries."""
+
+    currsize: int
+    """Current number of cached entries."""
+
+
+class SchemaDefinitions(NamedTuple):
+    name: str
+    """The definition name of the class."""
+
+    nested_names: FrozenSet[str]
+    """The definition names of all models nested in the class."""
+
+    definitions: Dict[str, Dict[str, Any]]
+    """The JSON schema definitions of the class and its nested models."""
+
+    def is_valid(self, name: Optional[str], definition_names: Set[str]) -> bool:
+        """Check whether the definitions use the given definition names.
+
+        Args:
+            name: The definition name of the class in the current document.
+            definition_names: All definition names of the current document.
+
+        Returns:
+            `True` if the definitions can be used for the current document.
+        """
+        return name == self.name and self.nested_names.issubset(definition_names)
+
+
+class _CacheEntry(NamedTuple):
+    entry: SchemaDefinitions
+    """The cached entry, without its definitions."""
+
+    definitions: bytes
+    """The pickled definitions of the entry."""
+
+
+class SchemaDefinitionsCache:
+    """A bounded, thread-safe LRU cache of the JSON schema definitions
+    generated for pydantic classes.
+
+    Entries are keyed by the pydantic class, the `$ref` prefix and the `__schema_name__` of the class. The
+    classes are referenced weakly, entries are dropped once their class is garbage collected.
+
+    The cache does not hold the definition dicts themselves, it stores them pickled. Every lookup unpickles a
+    new copy, so that the values of a built document, e.g. the `default` of a schema, are not shared with the
+    cache and other documents. This is several times faster than deep copies of the dicts.
+
+    No cache is used unless one is passed to
+    [construct_open_api_with_schema_class][pydantic_openapi_schema.utils.utils.construct_open_api_with_schema_class]
+    or [OpenAPIBuilder][pydantic_openapi_schema.utils.builder.OpenAPIBuilder], e.g. the process-wide
+    `schema_definitions_cache`.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        """Initialize `SchemaDefinitionsCache`.
+
+        Args:
+            maxsize: Maximum number of cached entries, the least recently used entry is evicted first.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[_CacheKey, _CacheEntry]" = OrderedDict()
+        self._lock = RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self,
+        model: Type[BaseModel],
+        ref_prefix: str,
+        schema_name: Optional[str],
+        name: Optional[str],
+        definition_names: Set[str],
+    ) -> Optional[SchemaDefinitions]:
+        """Look up the cached definitions of a class.
+
+        Args:
+            model: Pydantic model class.
+            ref_prefix: The prefix of the `$ref` values in the definitions.
+            schema_name: The `__schema_name__` of the class, if any.
+            name: The definition name of the class in the current document.
+            definition_names: All definition names of the current document.
+
+        Returns:
+            A new copy of the cached definitions, or `None` if there are none or they use different definition
+                names.
+        """
+        key = (ref(model), ref_prefix, schema_name)
+        with self._lock:
+            cache_entry = self._entries.get(key)
+            if cache_entry is None or not cache_entry.entry.is_valid(name=name, definition_names=definition_names):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return cache_entry.entry._replace(definitions=pickle.loads(cache_entry.definitions))
+
+    def set(
+        self, model: Type[BaseModel], ref_prefix: str, schema_name: Optional[str], entry: SchemaDefinitions
+    ) -> None:
+        """Store the definitions of a class.
+
+        Args:
+            model: Pydantic model class.
+            ref_prefix: The prefix of the `$ref` values in the definitions.
+            schema_name: The `__schema_name__` of the class, if any.
+            entry: The definitions to store, they are pickled.
+        """
+        key = (ref(model, self._remove_dead_entries), ref_prefix, schema_name)
+        cache_entry = _CacheEntry(
+            entry=entry._replace(definitions={}),
+            definitions=pickle.dumps(entry.definitions, protocol=pickle.HIGHEST_PROTOCOL),
+        )
+        with self._lock:
+            self._entries[key] = cache_entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """Report the cache statistics.
+
+        Returns:
+            The hit and miss counters and the size of the cache.
+        """
+        with self._lock:
+            return CacheInfo(hits=self.hits, misses=self.misses, maxsize=self.maxsize, currsize=len(self._entries))
+
+    def _remove_dead_entries(self, dead_ref: "ref[Type[BaseModel]]") -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] is dead_ref or key[0]() is None]:
+                del self._entries[key]
+
+
+schema_definitions_cache = SchemaDefinitionsCache()
+"""A process-wide cache, to share the definitions between the builds that pass it as their `cache`."""
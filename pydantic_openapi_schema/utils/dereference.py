@@ -0,0 +1,201 @@
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from pydantic_openapi_schema import v3_1_0
+from pydantic_openapi_schema.utils.ref_index import ReferenceIndex
+
+_END = object()
+
+_OVERRIDE_FIELDS = ("summary", "description")
+"""The fields of a `Reference` that override those of its target."""
+
+_Frame = Tuple[Any, Iterator[Tuple[Any, Any]], Any]
+_Fixup = Tuple[Any, Any, Any, Dict[str, Any]]
+
+
+class Dereferencer:
+    """Memoized inlining of the `Reference`s of an OpenAPI document.
+
+    [dereference][pydantic_openapi_schema.utils.dereference.Dereferencer.dereference] returns a copy of a
+    part of the document in which every `Reference` is replaced with the copy of its target. The copy of each
+    object of the document is created once and shared by all the places that reference it, also across
+    calls, so that the time and memory are linear in the size of the document, however often a schema is
+    referenced.
+
+    A `Reference` to an object whose copy is being created, e.g. `items` of a recursive schema, closes a
+    cycle. It is kept as it is, or replaced with the shared copy if `share_cycles` is set, which creates
+    objects that contain themselves and cannot be serialized.
+
+    The `summary` and `description` of a `Reference` override those of its target, if the target has these
+    fields. The document must not be changed while a `Dereferencer` is used.
+    """
+
+    def __init__(
+        self, open_api: v3_1_0.OpenAPI, index: Optional[ReferenceIndex] = None, share_cycles: bool = False
+    ) -> None:
+        """Initialize `Dereferencer`.
+
+        Args:
+            open_api: The document the `$ref`s point into.
+            index: The `ReferenceIndex` of the document, created if `None`.
+            share_cycles: Whether to replace the `Reference`s that close a cycle with the shared copy of their
+                target, rather than keeping them.
+        """
+        self.open_api = open_api
+        self.index = index if index is not None else ReferenceIndex(open_api)
+        self.share_cycles = share_cycles
+        self._copies: Dict[int, Tuple[Any, Any]] = {}
+        """The objects, dicts and lists of the document and their copies, by the `id` of the original."""
+
+    def dereference(self, node: Any = None) -> Any:
+        """Inline the `Reference`s of a part of the document.
+
+        Args:
+            node: An object, dict or list of the document, e.g. a `Schema` of the components, the whole
+                document by default.
+
+        Raises:
+            KeyError: If a `$ref` cannot be resolved, e.g. because it points to another document.
+            ValueError: If a `Reference` resolves to itself through other `Reference`s.
+
+        Returns:
+            The copy of `node` without `Reference`s, except those that close a cycle.
+        """
+        return _DereferenceWalk(self).run(self.open_api if node is None else node)
+
+
+def dereference(open_api: v3_1_0.OpenAPI, share_cycles: bool = False) -> v3_1_0.OpenAPI:
+    """Inline the `Reference`s of an OpenAPI document.
+
+    See [Dereferencer][pydantic_openapi_schema.utils.dereference.Dereferencer], create one to dereference
+    several parts of a document with shared copies.
+
+    Args:
+        open_api: The document.
+        share_cycles: Whether to replace the `Reference`s that close a cycle with the shared copy of their
+            target, rather than keeping them.
+
+    Returns:
+        The copy of the document without `Reference`s, except those that close a cycle.
+    """
+    return Dereferencer(open_api, share_cycles=share_cycles).dereference()  # type: ignore[no-any-return]
+
+
+class _DereferenceWalk:
+    """A depth-first walk that copies a node, without recursion.
+
+    The copy of an object, dict or list is created when the walk enters it, and its children are copied
+    into it before the walk leaves it, so the objects that are being copied are those on the stack.
+    """
+
+    def __init__(self, dereferencer: Dereferencer) -> None:
+        self.index = dereferencer.index
+        self.share_cycles = dereferencer.share_cycles
+        self.copies = dereferencer._copies
+        self.new_copies: Dict[int, Tuple[Any, Any]] = {}
+        """The copies created by this walk, which are added to `copies` once the walk succeeded, so that a
+        failed walk does not leave incomplete copies behind."""
+        self.stack: List[_Frame] = []
+        self.in_progress: Set[int] = set()
+        self.fixups: List[_Fixup] = []
+        """The `Reference`s with overrides, as parent copy, key, copy of the target and overrides."""
+
+    def run(self, node: Any) -> Any:
+        result = self.copy(node, None, None)
+        stack = self.stack
+        while stack:
+            source, children, copied = stack[-1]
+            child: Any = next(children, _END)
+            if child is _END:
+                stack.pop()
+                self.in_progress.discard(id(source))
+                continue
+            key, value = child
+            _set_value(copied, key, self.copy(value, copied, key))
+        result = self.apply_fixups(result)
+        self.copies.update(self.new_copies)
+        return result
+
+    def apply_fixups(self, result: Any) -> Any:
+        """Replace the copies of the targets of the `Reference`s with
+        overrides with their overridden copies.
+
+        An overridden copy is a shallow copy, so the values assigned to the fields of its target are assigned
+        to it as well, whatever the order of the fixups.
+        """
+        values = [target.copy(update=overrides) for _, _, target, overrides in self.fixups]
+        overridden: Dict[int, List[BaseModel]] = {}
+        for (_, _, target, _), value in zip(self.fixups, values):
+            overridden.setdefault(id(target), []).append(value)
+        for (parent, key, _, _), value in zip(self.fixups, values):
+            if parent is None:
+                result = value
+                continue
+            _set_value(parent, key, value)
+            for parent_copy in overridden.get(id(parent), ()):
+                _set_value(parent_copy, key, value)
+        return result
+
+    def copy(self, value: Any, parent: Any, key: Any) -> Any:
+        """Get the copy of a value, and enter it if it is not copied yet."""
+        if isinstance(value, v3_1_0.Reference):
+            return self.copy_reference(value, parent, key)
+        entry = self.copies.get(id(value)) or self.new_copies.get(id(value))
+        if entry is not None:
+            return entry[1]
+        children: Iterator[Tuple[Any, Any]]
+        if isinstance(value, BaseModel):
+            copied: Any = value.copy()
+            children = (
+                (name, item) for name, item in value.__dict__.items() if isinstance(item, (BaseModel, dict, list))
+            )
+        elif isinstance(value, dict):
+            copied = {}
+            children = ((item_key, value[item_key]) for item_key in value)
+        elif isinstance(value, list):
+            copied = []
+            children = enumerate(value)
+        else:
+            return value
+        self.new_copies[id(value)] = (value, copied)
+        self.in_progress.add(id(value))
+        self.stack.append((value, children, copied))
+        return copied
+
+    def copy_reference(self, reference: v3_1_0.Reference, parent: Any, key: Any) -> Any:
+        target, overrides = self.resolve(reference)
+        if id(target) in self.in_progress:
+            return self.new_copies[id(target)][1] if self.share_cycles else reference
+        copied = self.copy(target, parent, key)
+        if overrides and isinstance(copied, BaseModel):
+            overrides = {name: value for name, value in overrides.items() if name in copied.__fields__}
+            if overrides:
+                self.fixups.append((parent, key, copied, overrides))
+        return copied
+
+    def resolve(self, reference: v3_1_0.Reference) -> Tuple[Any, Dict[str, Any]]:
+        """Follow a `Reference`, and the `Reference`s it points to, to an
+        object, dict or list."""
+        overrides: Dict[str, Any] = {}
+        seen: Set[int] = set()
+        target: Any = reference
+        while isinstance(target, v3_1_0.Reference):
+            if id(target) in seen:
+                raise ValueError(f"circular $ref {reference.ref!r}")
+            seen.add(id(target))
+            for name in _OVERRIDE_FIELDS:
+                value = target.__dict__.get(name)
+                if value is not None:
+                    overrides.setdefault(name, value)
+            target = self.index.resolve(target.ref)
+        return target, overrides
+
+
+def _set_value(parent: Any, key: Any, value: Any) -> None:
+    if isinstance(parent, BaseModel):
+        parent.__dict__[key] = value
+    elif isinstance(parent, dict) or key < len(parent):
+        parent[key] = value
+    else:
+        parent.append(value)
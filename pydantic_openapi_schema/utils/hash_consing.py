@@ -0,0 +1,307 @@
+import sys
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Type
+
+from pydantic import BaseModel
+from pydantic.main import ModelMetaclass
+
+from pydantic_openapi_schema import v3_1_0
+from pydantic_openapi_schema.utils.lazy import LazyModelDict
+from pydantic_openapi_schema.utils.utils import OpenAPI310PydanticSchema
+
+_Key = Optional[Tuple[Any, ...]]
+
+CANONICAL_CLASSES: Tuple[Type[BaseModel], ...] = (
+    v3_1_0.Schema,
+    v3_1_0.Parameter,
+    v3_1_0.Header,
+    v3_1_0.MediaType,
+    v3_1_0.Reference,
+    v3_1_0.Example,
+    v3_1_0.Encoding,
+    v3_1_0.Discriminator,
+    v3_1_0.XML,
+    v3_1_0.ExternalDocumentation,
+)
+"""The classes whose structurally identical objects are shared, including their subclasses.
+
+`Schema`, `Parameter`, `Header` and `MediaType` trees are shared together with the objects they are made of.
+Objects of other classes, and objects holding them, e.g. `OpenAPI310PydanticSchema`s, are never shared.
+"""
+
+_FROZEN_CLASS_ATTRIBUTE = "__frozen_class__"
+"""The attribute of a pydantic class that holds its frozen subclass."""
+
+_BASE_CLASS_ATTRIBUTE = "__frozen_base_class__"
+"""The attribute of a frozen class that holds the class it was created from."""
+
+
+class HashConsStats(NamedTuple):
+    nodes: int
+    """The number of objects of the `CANONICAL_CLASSES` that were visited."""
+
+    saved_nodes: int
+    """The number of objects replaced with a structurally identical object."""
+
+    saved_bytes: int
+    """An estimate of the memory freed once nothing else refers to the replaced objects.
+
+    The objects, their `__dict__`s and the lists and dicts they hold are counted, their strings and numbers
+    are not.
+    """
+
+
+class HashConsTable:
+    """Table of shared objects, by their structure.
+
+    The table keeps its objects alive until
+    [clear][pydantic_openapi_schema.utils.hash_consing.HashConsTable.clear] is called. Pass the same table to
+    several [hash_cons][pydantic_openapi_schema.utils.hash_consing.hash_cons] calls to share objects between
+    documents.
+    """
+
+    def __init__(self) -> None:
+        self._objects: Dict[Tuple[Any, ...], BaseModel] = {}
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def get_canonical(self, key: Tuple[Any, ...], obj: BaseModel) -> BaseModel:
+        """Get the shared object of a structure.
+
+        Args:
+            key: The structure of `obj`.
+            obj: A pydantic object.
+
+        Returns:
+            The first object added with `key`, or `obj` itself.
+        """
+        return self._objects.setdefault(key, obj)
+
+    def clear(self) -> None:
+        """Remove all shared objects."""
+        self._objects = {}
+
+
+def hash_cons(obj: Any, table: Optional[HashConsTable] = None) -> HashConsStats:
+    """Share the structurally identical subtrees of a document, in place.
+
+    The objects are hashed bottom-up: the structure of an object consists of its class, its set fields and
+    its values, in which objects are represented by the shared object they were replaced with. Each object
+    of the [CANONICAL_CLASSES][pydantic_openapi_schema.utils.hash_consing.CANONICAL_CLASSES] that has the
+    same structure as an object seen before is replaced with that object, e.g. all
+    `Schema(type="integer", schema_format="int64")` of a document become one object.
+
+    Shared objects are frozen: assigning their fields raises a `TypeError`. Their lists and dicts must not be
+    modified either, use `copy(deep=True)` to get an object of the original class that can be changed. Entries of
+    [LazyModelDict][pydantic_openapi_schema.utils.lazy.LazyModelDict]s that were not parsed yet are not
+    visited, and `obj` itself is never replaced.
+
+    Args:
+        obj: An OpenAPI document, or any part of it.
+        table: The table of shared objects, by default a new table that only shares objects within `obj`.
+
+    Returns:
+        The statistics of this call.
+    """
+    hash_conser = _HashConser(table if table is not None else HashConsTable())
+    hash_conser.run(obj)
+    return HashConsStats(
+        nodes=hash_conser.nodes, saved_nodes=hash_conser.saved_nodes, saved_bytes=hash_conser.saved_bytes
+    )
+
+
+def get_frozen_class(model_class: Type[BaseModel]) -> Type[BaseModel]:
+    """Get the class of the shared objects of a pydantic class.
+
+    The frozen class is a subclass named `Frozen<name>` that does not allow assignments. It has the same fields
+    and validators, so its objects are represented, serialized and compared like those of `model_class`. Its
+    `copy` method returns an object of `model_class`, and with `deep=True` the objects it holds are copies of
+    their original classes too.
+
+    Args:
+        model_class: Pydantic model class.
+
+    Returns:
+        The frozen subclass of `model_class`, or `model_class` itself if it is frozen.
+    """
+    if _BASE_CLASS_ATTRIBUTE in model_class.__dict__:
+        return model_class
+    frozen_class: Optional[Type[BaseModel]] = model_class.__dict__.get(_FROZEN_CLASS_ATTRIBUTE)
+    if frozen_class is not None:
+        return frozen_class
+    name = f"Frozen{model_class.__name__}"
+    namespace = {
+        _BASE_CLASS_ATTRIBUTE: model_class,
+        "__module__": model_class.__module__,
+        "__qualname__": model_class.__qualname__.replace(model_class.__name__, name),
+        "__reduce__": _reduce_frozen,
+        "__repr_name__": _get_frozen_repr_name,
+        "copy": _copy_frozen,
+        "Config": type("Config", (), {"allow_mutation": False}),
+    }
+    frozen_class = ModelMetaclass(name, (model_class,), namespace)
+    setattr(model_class, _FROZEN_CLASS_ATTRIBUTE, frozen_class)
+    return frozen_class
+
+
+class _HashConser:
+    def __init__(self, table: HashConsTable) -> None:
+        self.table = table
+        self.keys: Dict[int, _Key] = {}
+        """The keys of the visited objects, lists and dicts, by `id`.
+
+        The key of an object is the `id` of its shared object, the key of a list or dict is its structure, and
+        `None` if it cannot be shared.
+        """
+        self.replacements: Dict[int, BaseModel] = {}
+        self.visited: List[Any] = []
+        """The visited objects, which are kept alive so their `id`s are not reused."""
+        self.nodes = 0
+        self.saved_nodes = 0
+        self.saved_bytes = 0
+
+    def run(self, obj: Any) -> None:
+        stack: List[Tuple[Any, bool]] = [(obj, False)]
+        while stack:
+            current, children_done = stack.pop()
+            if id(current) in self.keys:
+                continue
+            if children_done:
+                self.keys[id(current)] = self._finish(current)
+                self.visited.append(current)
+            else:
+                stack.append((current, True))
+                stack.extend((child, False) for child in _iter_children(current) if id(child) not in self.keys)
+
+    def _finish(self, current: Any) -> _Key:
+        """Replace the children of a visited object, list or dict with their
+        shared objects, and get its key."""
+        if isinstance(current, BaseModel):
+            return self._finish_model(current)
+        if isinstance(current, LazyModelDict):
+            for key in current.parsed_keys:
+                self._replace(current, key, current[key])
+            return None
+        if isinstance(current, dict):
+            items = [(key, self._replace(current, key, value)) for key, value in current.items()]
+            return None if any(value_key is None for _, value_key in items) else ("dict", tuple(items))
+        if isinstance(current, list):
+            keys = [self._replace(current, index, item) for index, item in enumerate(current)]
+            return None if any(item_key is None for item_key in keys) else ("list", tuple(keys))
+        return None
+
+    def _finish_model(self, current: BaseModel) -> _Key:
+        values = current.__dict__
+        items = [(name, self._replace(values, name, value)) for name, value in values.items() if value is not None]
+        model_class = type(current).__dict__.get(_BASE_CLASS_ATTRIBUTE, type(current))
+        if not issubclass(model_class, CANONICAL_CLASSES) or issubclass(model_class, OpenAPI310PydanticSchema):
+            return None
+        self.nodes += 1
+        if any(value_key is None for _, value_key in items):
+            return None
+        key = (model_class, frozenset(current.__fields_set__), tuple(items))
+        canonical = self.table.get_canonical(key, current)
+        if canonical is not current:
+            self.replacements[id(current)] = canonical
+            _freeze(canonical)
+            self.saved_nodes += 1
+            self.saved_bytes += _get_own_size(current)
+        return ("object", id(canonical))
+
+    def _replace(self, container: Any, key: Any, value: Any) -> _Key:
+        """Replace a value of a visited list, dict or `__dict__` with its
+        shared object, and get its key."""
+        if not isinstance(value, (BaseModel, dict, list)):
+            return _get_scalar_key(value)
+        replacement = self.replacements.get(id(value)) if isinstance(value, BaseModel) else None
+        if replacement is not None:
+            container[key] = replacement
+        return self.keys.get(id(value))
+
+
+def _iter_children(current: Any) -> Iterable[Any]:
+    if isinstance(current, BaseModel):
+        values: Iterable[Any] = current.__dict__.values()
+    elif isinstance(current, LazyModelDict):
+        values = [current[key] for key in current.parsed_keys]
+    elif isinstance(current, dict):
+        values = current.values()
+    elif isinstance(current, list):
+        values = current
+    else:
+        values = ()
+    return (value for value in values if isinstance(value, (BaseModel, dict, list)))
+
+
+def _get_scalar_key(value: Any) -> _Key:
+    try:
+        hash(value)
+    except TypeError:
+        return None
+    return (value.__class__, value)
+
+
+def _freeze(obj: BaseModel) -> None:
+    """Make an object and all objects it holds frozen."""
+    stack: List[Any] = [obj]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, BaseModel):
+            frozen_class = get_frozen_class(type(current))
+            if type(current) is not frozen_class:
+                object.__setattr__(current, "__class__", frozen_class)
+                stack.extend(_iter_children(current))
+        else:
+            stack.extend(_iter_children(current))
+
+
+def _thaw(obj: BaseModel) -> None:
+    """Give an unshared copy of a frozen object, and all objects it holds,
+    their original classes."""
+    stack: List[Any] = [obj]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, BaseModel):
+            model_class = type(current).__dict__.get(_BASE_CLASS_ATTRIBUTE)
+            if model_class is not None:
+                object.__setattr__(current, "__class__", model_class)
+        stack.extend(_iter_children(current))
+
+
+def _get_own_size(obj: BaseModel) -> int:
+    """Get the size of an object, its `__dict__` and the lists and dicts that
+    only it holds."""
+    size = sys.getsizeof(obj) + sys.getsizeof(obj.__dict__) + sys.getsizeof(obj.__fields_set__)
+    stack = [value for value in obj.__dict__.values() if isinstance(value, (dict, list))]
+    while stack:
+        current = stack.pop()
+        size += sys.getsizeof(current)
+        stack.extend(child for child in _iter_children(current) if isinstance(child, (dict, list)))
+    return size
+
+
+def _new_frozen(model_class: Type[BaseModel]) -> BaseModel:
+    frozen_class = get_frozen_class(model_class)
+    return frozen_class.__new__(frozen_class)
+
+
+def _get_base_class(frozen_class: Type[BaseModel]) -> Type[BaseModel]:
+    base_class: Type[BaseModel] = frozen_class.__dict__[_BASE_CLASS_ATTRIBUTE]
+    return base_class
+
+
+def _reduce_frozen(self: BaseModel) -> Tuple[Any, ...]:
+    return _new_frozen, (_get_base_class(type(self)),), self.__getstate__()
+
+
+def _get_frozen_repr_name(self: BaseModel) -> str:
+    return _get_base_class(type(self)).__name__
+
+
+def _copy_frozen(self: BaseModel, *, deep: bool = False, **kwargs: Any) -> BaseModel:
+    copied = BaseModel.copy(self, deep=deep, **kwargs)
+    if deep:
+        _thaw(copied)
+    else:
+        object.__setattr__(copied, "__class__", _get_base_class(type(self)))
+    return copied
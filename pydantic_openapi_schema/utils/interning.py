@@ -0,0 +1,174 @@
+import sys
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, NamedTuple, Optional, Set, Type
+
+from pydantic import BaseModel
+
+from pydantic_openapi_schema import v3_1_0
+from pydantic_openapi_schema.utils.introspection import get_model_fields
+from pydantic_openapi_schema.utils.lazy import LazyModelDict
+
+INTERNED_FIELDS: Dict[Type[BaseModel], FrozenSet[str]] = {
+    v3_1_0.Reference: frozenset({"ref"}),
+    v3_1_0.PathItem: frozenset({"ref"}),
+    v3_1_0.Schema: frozenset({"type", "schema_format", "required", "contentMediaType", "contentEncoding"}),
+    v3_1_0.Parameter: frozenset({"name", "param_in", "style"}),
+    v3_1_0.Header: frozenset({"style"}),
+    v3_1_0.Encoding: frozenset({"contentType", "style"}),
+    v3_1_0.Discriminator: frozenset({"propertyName"}),
+    v3_1_0.SecurityScheme: frozenset({"type", "name", "security_scheme_in", "scheme", "bearerFormat"}),
+}
+"""The fields whose strings, or lists of strings, are interned, by the class they are declared in.
+
+The keys of the maps of the OpenAPI structure are always interned, e.g. media types, status codes, header and
+property names.
+"""
+
+
+class InternStats(NamedTuple):
+    strings: int
+    """The number of strings looked up."""
+
+    duplicates: int
+    """The number of strings replaced with an equal string that was interned before."""
+
+    saved_bytes: int
+    """The size of the replaced strings, i.e. the memory freed once nothing else refers to them."""
+
+
+class StringInterner:
+    """Table of shared string objects.
+
+    Parsed documents repeat the same strings many times, e.g. `"application/json"`, `"#/components/schemas/Pet"`
+    or `"string"`, and each occurrence is a separate object. Interning replaces the occurrences with one
+    shared object per value. Unlike `sys.intern`, the table can be cleared, and it counts the strings it
+    replaced.
+
+    Strings are kept until [clear][pydantic_openapi_schema.utils.interning.StringInterner.clear] is called.
+    Pass the same interner to several calls to share strings between documents, and clear or drop it once the
+    documents are released. The counters are not updated atomically, use one interner per thread for exact
+    statistics.
+    """
+
+    def __init__(self) -> None:
+        self._strings: Dict[str, str] = {}
+        self._strings_count = 0
+        self._duplicates = 0
+        self._saved_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def intern(self, value: str) -> str:
+        """Get the shared object of a string.
+
+        Args:
+            value: A string.
+
+        Returns:
+            The first interned string equal to `value`, or `value` itself.
+        """
+        interned = self._strings.setdefault(value, value)
+        self._strings_count += 1
+        if interned is not value:
+            self._duplicates += 1
+            self._saved_bytes += sys.getsizeof(value)
+        return interned
+
+    @property
+    def stats(self) -> InternStats:
+        """The statistics of all strings looked up since the interner was
+        created or cleared."""
+        return InternStats(strings=self._strings_count, duplicates=self._duplicates, saved_bytes=self._saved_bytes)
+
+    def clear(self) -> None:
+        """Remove all interned strings and reset the statistics."""
+        self._strings = {}
+        self._strings_count = 0
+        self._duplicates = 0
+        self._saved_bytes = 0
+
+
+def intern_strings(obj: Any, interner: Optional[StringInterner] = None) -> InternStats:
+    """Intern the repeated strings of a document, in place.
+
+    The keys of the maps of the OpenAPI structure and the values of the fields in
+    [INTERNED_FIELDS][pydantic_openapi_schema.utils.interning.INTERNED_FIELDS] are replaced with shared
+    objects. Only the fields whose type holds pydantic classes are followed, so values of fields typed `Any`,
+    e.g. examples, defaults and enum values, are neither visited nor changed. Entries of
+    [LazyModelDict][pydantic_openapi_schema.utils.lazy.LazyModelDict]s that were not parsed yet are not
+    visited either.
+
+    A map whose keys are replaced is rebuilt in place, other threads must not read the document meanwhile.
+    The loaders with an `interner` option, e.g.
+    [lazy_parse_obj][pydantic_openapi_schema.utils.lazy.lazy_parse_obj], intern the objects they create
+    before they return them.
+
+    Args:
+        obj: An OpenAPI document, or any part of it.
+        interner: The table of shared strings, by default a new table that only shares strings within `obj`.
+
+    Returns:
+        The statistics of this call.
+    """
+    interner = interner if interner is not None else StringInterner()
+    stats = interner.stats
+    intern = interner.intern
+    stack: List[Any] = [obj]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, BaseModel):
+            values = current.__dict__
+            interned_fields = get_interned_fields(type(current))
+            model_fields = get_model_fields(type(current))
+            for name, value in values.items():
+                if name in interned_fields:
+                    values[name] = _intern_value(value, intern)
+                elif name in model_fields and isinstance(value, (BaseModel, dict, list)):
+                    stack.append(value)
+        elif isinstance(current, LazyModelDict):
+            stack.extend(current[key] for key in current.parsed_keys)
+        elif isinstance(current, dict):
+            _intern_keys(current, intern)
+            stack.extend(value for value in current.values() if isinstance(value, (BaseModel, dict, list)))
+        elif isinstance(current, list):
+            stack.extend(item for item in current if isinstance(item, (BaseModel, dict, list)))
+    new_stats = interner.stats
+    return InternStats(*(new - old for new, old in zip(new_stats, stats)))
+
+
+@lru_cache(maxsize=256)
+def get_interned_fields(model_class: Type[BaseModel]) -> FrozenSet[str]:
+    """Get the fields of a pydantic class whose strings are interned.
+
+    Args:
+        model_class: Pydantic model class.
+
+    Returns:
+        The names of the fields declared in `INTERNED_FIELDS` for the class or any of its bases.
+    """
+    interned_fields: Set[str] = set()
+    for base, fields in INTERNED_FIELDS.items():
+        if issubclass(model_class, base):
+            interned_fields.update(fields)
+    return frozenset(interned_fields)
+
+
+def _intern_value(value: Any, intern: Callable[[str], str]) -> Any:
+    if isinstance(value, str):
+        return intern(value)
+    if isinstance(value, list):
+        for index, item in enumerate(value):
+            if isinstance(item, str):
+                value[index] = intern(item)
+    return value
+
+
+def _intern_keys(mapping: Dict[Any, Any], intern: Callable[[str], str]) -> None:
+    """Replace the keys of a dict with their shared objects, rebuilding it
+    only if a key changes."""
+    keys = [intern(key) if isinstance(key, str) else key for key in mapping]
+    if any(new_key is not key for new_key, key in zip(keys, mapping)):
+        items = list(zip(keys, mapping.values()))
+        mapping.clear()
+        mapping.update(items)
@@ -0,0 +1,96 @@
+from functools import lru_cache
+from typing import Any, ForwardRef, FrozenSet, Iterator, Set, Tuple, Type
+
+from pydantic import BaseModel
+from pydantic.typing import get_args
+
+from pydantic_openapi_schema import v3_1_0
+
+
+def get_annotation_models(annotation: Any) -> Iterator[Any]:
+    """Yield the pydantic classes found in a type annotation.
+
+    Args:
+        annotation: A type annotation, e.g. `Optional[Dict[str, Union[Reference, Schema]]]`.
+
+    Yields:
+        Every pydantic class that is part of the annotation, and every unresolved `ForwardRef`.
+    """
+    if isinstance(annotation, ForwardRef):
+        yield annotation
+    elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        yield annotation
+    else:
+        for arg in get_args(annotation):
+            yield from get_annotation_models(arg)
+
+
+@lru_cache(maxsize=256)
+def can_contain_schema(model_class: Type[BaseModel]) -> bool:
+    """Check whether instances of a pydantic class can hold a `Schema`
+    object, directly or in any nested object.
+
+    Args:
+        model_class: A pydantic class, usually one of the `v3_1_0` models.
+
+    Returns:
+        `True` if a `Schema` can be reached from an instance of `model_class`.
+    """
+    visited: Set[Type[BaseModel]] = set()
+    pending = [model_class]
+    while pending:
+        current = pending.pop()
+        if issubclass(current, v3_1_0.Schema):
+            return True
+        if current in visited:
+            continue
+        visited.add(current)
+        for field in current.__fields__.values():
+            for model in get_annotation_models(field.outer_type_):
+                if isinstance(model, ForwardRef):
+                    return True
+                pending.append(model)
+    return False
+
+
+@lru_cache(maxsize=256)
+def get_schema_fields(model_class: Type[BaseModel]) -> Tuple[str, ...]:
+    """Get the names of the fields of a pydantic class that can hold a
+    `Schema` object, directly or in any nested object.
+
+    The result is derived from the field annotations, so fields typed `Any` (e.g. `Example.value`) and
+    fields that only hold metadata (e.g. `OpenAPI.info`) are never included.
+
+    Args:
+        model_class: A pydantic class, usually one of the `v3_1_0` models.
+
+    Returns:
+        The field names, in the order of declaration.
+    """
+    return tuple(
+        name
+        for name, field in model_class.__fields__.items()
+        if any(
+            isinstance(model, ForwardRef) or can_contain_schema(model)
+            for model in get_annotation_models(field.outer_type_)
+        )
+    )
+
+
+@lru_cache(maxsize=256)
+def get_model_fields(model_class: Type[BaseModel]) -> FrozenSet[str]:
+    """Get the names of the fields of a pydantic class whose type holds
+    pydantic classes, e.g. `Dict[str, Union[Reference, Schema]]`.
+
+    Fields typed `Any`, e.g. `Schema.default` or `Example.value`, and fields of builtin types, e.g.
+    `Schema.required`, are not included.
+
+    Args:
+        model_class: A pydantic class, usually one of the `v3_1_0` models.
+
+    Returns:
+        The field names.
+    """
+    return frozenset(
+        name for name, field in model_class.__fields__.items() if any(get_annotation_models(field.outer_type_))
+    )
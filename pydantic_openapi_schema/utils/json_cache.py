@@ -0,0 +1,233 @@
+from collections import OrderedDict
+from itertools import chain, compress, repeat
+from operator import attrgetter, is_, itemgetter, ne
+from threading import RLock
+from typing import Any, Collection, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from pydantic_openapi_schema.utils.serializer import (
+    _encode_unsupported,
+    _encode_value,
+    _get_field_keys,
+    _is_supported,
+)
+from pydantic_openapi_schema.v3_1_0.compact import CompactModel
+
+_document_caches: "OrderedDict[int, JSONCache]" = OrderedDict()
+_document_caches_lock = RLock()
+
+MAX_CACHED_DOCUMENTS = 128
+"""The number of documents whose output `cached_json` keeps, the least recently used document is dropped
+first."""
+
+
+class _Entry(NamedTuple):
+    node: Any
+    views: Tuple[Collection[Any], ...]
+    """The live views of the keys and values of the node."""
+    snapshots: Tuple[Tuple[Any, ...], ...]
+    """The contents of the views when the node was converted, which keeps them alive so their `id`s are not
+    reused."""
+    owners: Tuple[int, ...]
+    """The `id` of the node, once for each view."""
+    converted: Any
+
+
+class JSONCache:
+    """Memoized JSON serialization of an OpenAPI document.
+
+    [get_json][pydantic_openapi_schema.utils.json_cache.JSONCache.get_json] returns the same bytes as
+    `to_json(obj, **dumps_kwargs).encode()`. The bytes, and the converted dict of every object, list and dict
+    of the document, are kept until the node changes: a field is assigned, or a key or item is set, added,
+    removed or moved, whichever reference to the node was used. Then only the nodes that changed, and those
+    that hold them, are converted again, the unchanged branches are reused, and the result is encoded with
+    the `json_dumps` of the class of `obj`.
+
+    Changes are found without changing the document: each call compares the keys and values of every node
+    with those of the previous conversion, by identity, in a single pass of the interpreter that costs a
+    small fraction of a conversion. Values that are neither objects, lists nor dicts, e.g. sets, are compared
+    by identity only, so changing them in place is not found. Objects of classes that `to_json` does not
+    support, e.g. with a custom root type, are serialized by pydantic, changes of the values they hold are
+    not found either.
+    """
+
+    def __init__(self, obj: BaseModel, **dumps_kwargs: Any) -> None:
+        """Initialize `JSONCache`.
+
+        Args:
+            obj: The document, usually a `v3_1_0.OpenAPI`.
+            **dumps_kwargs: Keyword arguments of `json_dumps`, e.g. `indent`.
+        """
+        self.root = obj
+        self.dumps_kwargs = dumps_kwargs
+        self._json: Optional[bytes] = None
+        self._entries: Dict[int, _Entry] = {}
+        """The nodes, the live views of their keys and values, and their converted values, by the `id` of the
+        node."""
+        self._parents: Dict[int, Set[int]] = {}
+        """The `id`s of the nodes that hold a node, by the `id` of the node."""
+        self._views: List[Collection[Any]] = []
+        """The views of all converted nodes."""
+        self._values: List[Any] = []
+        """The contents of the snapshots of all converted nodes."""
+        self._snapshots: List[Tuple[Any, ...]] = []
+        """The snapshots of the views."""
+        self._owners: List[int] = []
+        """The `id` of the node of each view."""
+        self._full_size = 0
+        self._lock = RLock()
+
+    def get_json(self) -> bytes:
+        """Serialize the document.
+
+        Returns:
+            The JSON document, encoded in UTF-8.
+        """
+        with self._lock:
+            if self._json is not None and self._is_unchanged():
+                return self._json
+            data = self._update()
+            while not self._is_unchanged():
+                data = self._update()
+            root = self.root
+            config = type(root).__config__
+            self._json = config.json_dumps(data, default=root.__json_encoder__, **self.dumps_kwargs).encode()
+            return self._json
+
+    def clear(self) -> None:
+        """Remove all cached values."""
+        with self._lock:
+            self._json = None
+            self._entries = {}
+            self._parents = {}
+            self._views = []
+            self._values = []
+            self._snapshots = []
+            self._owners = []
+
+    def _is_unchanged(self) -> bool:
+        """Check that the keys and values of all nodes are those of their
+        snapshots."""
+        values = self._values
+        return sum(map(len, self._views)) == len(values) and all(map(is_, chain.from_iterable(self._views), values))
+
+    def _invalidate_changed(self) -> None:
+        """Remove the cached values of the nodes that changed, and of all
+        nodes that hold them."""
+        pending = list(compress(self._owners, map(ne, map(tuple, self._views), self._snapshots)))
+        if not pending:
+            # The values that changed are equal to those they replaced, but the nodes among them must be
+            # converted to be watched.
+            ids = map(tuple, map(map, repeat(id), self._views))
+            snapshot_ids = map(tuple, map(map, repeat(id), self._snapshots))
+            pending = list(compress(self._owners, map(ne, ids, snapshot_ids)))
+        while pending:
+            node_id = pending.pop()
+            if self._entries.pop(node_id, None) is not None:
+                pending.extend(self._parents.get(node_id, ()))
+        self._json = None
+
+    def _update(self) -> Any:
+        """Convert the nodes that changed again, and take the snapshots of the
+        document."""
+        self._invalidate_changed()
+        if len(self._entries) > 2 * self._full_size:
+            self.clear()
+        full = not self._entries
+        data = self._convert(self.root, 0)
+        if full:
+            self._full_size = len(self._entries)
+        entries = self._entries.values()
+        self._views = list(chain.from_iterable(map(attrgetter("views"), entries)))
+        self._snapshots = list(chain.from_iterable(map(attrgetter("snapshots"), entries)))
+        self._values = list(chain.from_iterable(self._snapshots))
+        self._owners = list(chain.from_iterable(map(attrgetter("owners"), entries)))
+        return data
+
+    def _convert(self, value: Any, parent_id: int) -> Any:
+        """Convert a value held by a node, reusing the cached value of the
+        objects, lists and dicts that did not change.
+
+        Args:
+            value: The value.
+            parent_id: The `id` of the node that holds the value.
+
+        Returns:
+            The value converted like by `to_dict`.
+        """
+        if not isinstance(value, (BaseModel, dict, list)):
+            return _encode_value(value)
+        node_id = id(value)
+        parents = self._parents.get(node_id)
+        if parents is None:
+            parents = self._parents[node_id] = set()
+        parents.add(parent_id)
+        entry = self._entries.get(node_id)
+        if entry is None:
+            converted = self._convert_node(value)
+            views = _get_views(value)
+            snapshots = tuple(map(tuple, views))
+            entry = self._entries[node_id] = _Entry(value, views, snapshots, (node_id,) * len(views), converted)
+        return entry.converted
+
+    def _convert_node(self, node: Any) -> Any:
+        node_id = id(node)
+        if isinstance(node, BaseModel):
+            return self._convert_model(node)
+        if isinstance(node, dict):
+            return {key: self._convert(value, node_id) for key, value in node.items()}
+        return [self._convert(item, node_id) for item in node]
+
+    def _convert_model(self, obj: BaseModel) -> Any:
+        model_class = type(obj)
+        if not _is_supported(model_class):
+            return _encode_unsupported(obj)
+        field_keys = _get_field_keys(model_class)
+        extra_index = len(field_keys)
+        items: List[Tuple[int, str, Any]] = []
+        for name, value in obj.__dict__.items():
+            if value is not None:
+                index, key = field_keys.get(name, (extra_index, name))
+                items.append((index, key, self._convert(value, id(obj))))
+        if issubclass(model_class, CompactModel):
+            items.sort(key=itemgetter(0))
+        return {key: value for _, key, value in items}
+
+
+def cached_json(obj: BaseModel) -> bytes:
+    """Serialize a document like `to_json(obj).encode()`, reusing the output
+    of the previous call for the parts of the document that did not change.
+
+    The [JSONCache][pydantic_openapi_schema.utils.json_cache.JSONCache] of the document is created on the
+    first call. The caches of the last `MAX_CACHED_DOCUMENTS` documents are kept, and keep their documents
+    alive. Use a `JSONCache` directly to control its lifetime.
+
+    Args:
+        obj: The document, usually a `v3_1_0.OpenAPI`.
+
+    Returns:
+        The JSON document, encoded in UTF-8.
+    """
+    with _document_caches_lock:
+        cache = _document_caches.get(id(obj))
+        if cache is None or cache.root is not obj:
+            cache = _document_caches[id(obj)] = JSONCache(obj)
+            while len(_document_caches) > MAX_CACHED_DOCUMENTS:
+                _document_caches.popitem(last=False)
+        else:
+            _document_caches.move_to_end(id(obj))
+    return cache.get_json()
+
+
+def _get_views(node: Any) -> Tuple[Collection[Any], ...]:
+    """Get the live views of the keys and values of an object, list or
+    dict.
+
+    The keys of an object are its field names, which only change together with the number of its values.
+    """
+    if isinstance(node, BaseModel):
+        return (node.__dict__.values(),)
+    if isinstance(node, dict):
+        return dict.keys(node), dict.values(node)
+    return (node,)
@@ -0,0 +1,342 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    ItemsView,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    ValuesView,
+    cast,
+)
+
+from pydantic import BaseModel, ValidationError
+from pydantic.fields import SHAPE_DICT, SHAPE_MAPPING, SHAPE_SINGLETON, ModelField
+from pydantic.parse import Protocol, load_file, load_str_bytes
+from pydantic.types import StrBytes
+
+if TYPE_CHECKING:
+    from pydantic_openapi_schema.utils.interning import StringInterner
+
+Model = TypeVar("Model", bound=BaseModel)
+_Parser = Callable[[str, Any], Any]
+_LazyPlan = Tuple[List[Tuple[str, Tuple[str, ...], _Parser]], List[Tuple[Tuple[str, ...], Type[BaseModel]]]]
+
+_MAPPING_SHAPES = {SHAPE_DICT, SHAPE_MAPPING}
+
+
+class LazyModelDict(Dict[str, Any]):
+    """A dict of pydantic objects whose values are parsed on first access.
+
+    The dict holds the raw values of a map of a document, e.g. `OpenAPI.paths`. A value is parsed when it is
+    first read, e.g. by `[]`, `get`, `values` or `items`, and the parsed object replaces the raw value. Keys,
+    `len` and `in` do not parse any values. Comparison, `repr`, serialization and copies see the parsed
+    values, so the dict behaves like the dict of an eagerly parsed document. `copy.deepcopy` and `pickle`
+    create a plain dict with all values parsed.
+
+    A value that does not validate raises `ValidationError` every time it is read, and stays raw.
+    """
+
+    def __init__(self, raw: Dict[str, Any], parse: _Parser) -> None:
+        """Initialize `LazyModelDict`.
+
+        Args:
+            raw: The raw values, usually parsed JSON. The dict is copied, the values are not.
+            parse: A function that parses the raw value of a key.
+        """
+        super().__init__(raw)
+        self._parse = parse
+        self._raw_keys: Set[str] = set(raw)
+
+    @property
+    def parsed_keys(self) -> Set[str]:
+        """The keys whose values have been parsed or set."""
+        return {key for key in self if key not in self._raw_keys}
+
+    def __getitem__(self, key: str) -> Any:
+        value = super().__getitem__(key)
+        if key in self._raw_keys:
+            value = self._parse(key, value)
+            super().__setitem__(key, value)
+            self._raw_keys.discard(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        super().__setitem__(key, value)
+        self._raw_keys.discard(key)
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._raw_keys.discard(key)
+
+    def __iter__(self) -> Iterator[str]:
+        # Overriding `__iter__` makes `dict(...)` and `{**...}` read the values with `__getitem__`.
+        return super().__iter__()
+
+    def __eq__(self, other: object) -> bool:
+        self._parse_all()
+        return super().__eq__(other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    def __repr__(self) -> str:
+        self._parse_all()
+        return super().__repr__()
+
+    def __reduce__(self) -> Tuple[Type[Dict[str, Any]], Tuple[Dict[str, Any]]]:
+        return dict, (dict(self.items()),)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def values(self) -> ValuesView[Any]:  # type: ignore[override]
+        self._parse_all()
+        return super().values()
+
+    def items(self) -> ItemsView[str, Any]:  # type: ignore[override]
+        self._parse_all()
+        return super().items()
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if key not in self:
+            return super().pop(key, *default)
+        value = self[key]
+        del self[key]
+        return value
+
+    def popitem(self) -> Tuple[str, Any]:
+        key, value = super().popitem()
+        if key in self._raw_keys:
+            try:
+                value = self._parse(key, value)
+            except ValidationError:
+                super().__setitem__(key, value)
+                raise
+            self._raw_keys.discard(key)
+        return key, value
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self) -> None:
+        super().clear()
+        self._raw_keys.clear()
+
+    def copy(self) -> "LazyModelDict":
+        """Copy the dict without parsing its values.
+
+        Returns:
+            A new `LazyModelDict` with the same raw and parsed values.
+        """
+        copied = LazyModelDict({}, self._parse)
+        for key in self:
+            dict.__setitem__(copied, key, super().__getitem__(key))
+        copied._raw_keys = set(self._raw_keys)
+        return copied
+
+    def _parse_all(self) -> None:
+        for key in list(self._raw_keys):
+            self[key]
+
+
+def lazy_parse_obj(model_class: Type[Model], obj: Any, interner: Optional["StringInterner"] = None) -> Model:
+    """Load an OpenAPI document, or any part of it, whose maps are parsed on
+    first access.
+
+    The maps of pydantic objects of `model_class` and of its nested pydantic objects, e.g. `OpenAPI.paths`,
+    `OpenAPI.webhooks` and the maps of `OpenAPI.components`, become
+    [LazyModelDict][pydantic_openapi_schema.utils.lazy.LazyModelDict]s of the raw values. An entry is
+    validated exactly like by `model_class.parse_obj` when it is first read. All other fields are validated
+    immediately.
+
+    Args:
+        model_class: Pydantic model class, e.g. `v3_1_0.OpenAPI`.
+        obj: The data of the document, usually parsed JSON.
+        interner: If set, the repeated strings of the document, and of every entry when it is parsed, are
+            interned, see [intern_strings][pydantic_openapi_schema.utils.interning.intern_strings].
+
+    Returns:
+        An instance of `model_class`.
+    """
+    instance = _lazy_parse_obj(model_class, obj, interner)
+    _intern_strings(instance, interner)
+    return instance
+
+
+def lazy_parse_raw(
+    model_class: Type[Model],
+    b: StrBytes,
+    *,
+    content_type: Optional[str] = None,
+    encoding: str = "utf8",
+    proto: Optional[Protocol] = None,
+    interner: Optional["StringInterner"] = None,
+) -> Model:
+    """Load an OpenAPI document from a JSON string, parsing its maps on first
+    access.
+
+    The counterpart of `model_class.parse_raw`, see [lazy_parse_obj][pydantic_openapi_schema.utils.lazy.lazy_parse_obj].
+
+    Args:
+        model_class: Pydantic model class, e.g. `v3_1_0.OpenAPI`.
+        b: The JSON document.
+        content_type: The content type of `b`, only JSON is supported.
+        encoding: The encoding of `b`, if it is bytes.
+        proto: The protocol of `b`, only JSON is supported.
+        interner: If set, the repeated strings of the document are interned.
+
+    Returns:
+        An instance of `model_class`.
+    """
+    obj = load_str_bytes(
+        b,
+        proto=cast("Protocol", proto),
+        content_type=cast("str", content_type),
+        encoding=encoding,
+        json_loads=model_class.__config__.json_loads,
+    )
+    return lazy_parse_obj(model_class, obj, interner=interner)
+
+
+def lazy_parse_file(
+    model_class: Type[Model],
+    path: Union[str, Path],
+    *,
+    content_type: Optional[str] = None,
+    encoding: str = "utf8",
+    proto: Optional[Protocol] = None,
+    interner: Optional["StringInterner"] = None,
+) -> Model:
+    """Load an OpenAPI document from a JSON file, parsing its maps on first
+    access.
+
+    The counterpart of `model_class.parse_file`, see [lazy_parse_obj][pydantic_openapi_schema.utils.lazy.lazy_parse_obj].
+
+    Args:
+        model_class: Pydantic model class, e.g. `v3_1_0.OpenAPI`.
+        path: The path of the JSON file.
+        content_type: The content type of the file, only JSON is supported.
+        encoding: The encoding of the file.
+        proto: The protocol of the file, only JSON is supported.
+        interner: If set, the repeated strings of the document are interned.
+
+    Returns:
+        An instance of `model_class`.
+    """
+    obj = load_file(
+        path,
+        proto=cast("Protocol", proto),
+        content_type=cast("str", content_type),
+        encoding=encoding,
+        json_loads=model_class.__config__.json_loads,
+    )
+    return lazy_parse_obj(model_class, obj, interner=interner)
+
+
+def _lazy_parse_obj(model_class: Type[Model], obj: Any, interner: Optional["StringInterner"]) -> Model:
+    if not isinstance(obj, dict):
+        return model_class.parse_obj(obj)
+    lazy_maps, nested_models = _get_lazy_plan(model_class)
+    data = dict(obj)
+    lazy_values: Dict[str, LazyModelDict] = {}
+    for name, keys, parse in lazy_maps:
+        key = _find_key(data, keys)
+        if key is not None and isinstance(data[key], dict):
+            lazy_values[name] = LazyModelDict(data[key], _create_interning_parser(parse, interner))
+            data[key] = {}
+    for keys, nested_class in nested_models:
+        key = _find_key(data, keys)
+        if key is not None and isinstance(data[key], dict):
+            data[key] = _lazy_parse_obj(nested_class, data[key], interner)
+    instance = model_class.parse_obj(data)
+    instance.__dict__.update(lazy_values)
+    return instance
+
+
+def _create_interning_parser(parse: _Parser, interner: Optional["StringInterner"]) -> _Parser:
+    """Wrap the parser of a map to intern the strings of every parsed
+    entry."""
+    if interner is None:
+        return parse
+    return lambda key, value: _intern_strings(parse(key, value), interner)
+
+
+def _intern_strings(obj: Any, interner: Optional["StringInterner"]) -> Any:
+    if interner is not None:
+        # Imported here because the interning module depends on `LazyModelDict`.
+        from pydantic_openapi_schema.utils.interning import (
+            intern_strings,  # pylint: disable=import-outside-toplevel
+        )
+
+        intern_strings(obj, interner)
+    return obj
+
+
+@lru_cache(maxsize=256)
+def _get_lazy_plan(model_class: Type[BaseModel]) -> _LazyPlan:
+    """Find the fields of a pydantic class that are loaded lazily.
+
+    Args:
+        model_class: Pydantic model class.
+
+    Returns:
+        The maps of pydantic objects, with the keys of the field and the parser of its values, and the fields
+            of pydantic classes that have such maps, with the keys of the field and the class.
+    """
+    lazy_maps: List[Tuple[str, Tuple[str, ...], _Parser]] = []
+    nested_models: List[Tuple[Tuple[str, ...], Type[BaseModel]]] = []
+    for name, field in model_class.__fields__.items():
+        keys: Tuple[str, ...] = (
+            (field.alias, name) if model_class.__config__.allow_population_by_field_name else (field.alias,)
+        )
+        if field.shape in _MAPPING_SHAPES and field.sub_fields and _has_models(field.sub_fields[0]):
+            lazy_maps.append((name, keys, _create_parser(model_class, field)))
+        elif field.shape == SHAPE_SINGLETON and isinstance(field.type_, type) and issubclass(field.type_, BaseModel):
+            if any(_get_lazy_plan(field.type_)):
+                nested_models.append((keys, field.type_))
+    return lazy_maps, nested_models
+
+
+def _has_models(field: ModelField) -> bool:
+    types = [sub_field.type_ for sub_field in field.sub_fields] if field.sub_fields else [field.type_]
+    return any(isinstance(type_, type) and issubclass(type_, BaseModel) for type_ in types)
+
+
+def _create_parser(model_class: Type[BaseModel], field: ModelField) -> _Parser:
+    """Create the function that parses the raw values of a map.
+
+    Args:
+        model_class: The pydantic class the map belongs to.
+        field: The field of the map.
+
+    Returns:
+        A function that validates a value like `model_class.parse_obj` validates the values of the map.
+    """
+
+    def parse(key: str, value: Any) -> Any:
+        parsed, errors = field.validate({key: value}, {}, loc=field.alias, cls=model_class)
+        if errors:
+            raise ValidationError([errors], model_class)
+        return cast("Dict[str, Any]", parsed)[key]
+
+    return parse
+
+
+def _find_key(data: Dict[str, Any], keys: Tuple[str, ...]) -> Optional[str]:
+    return next((key for key in keys if key in data), None)
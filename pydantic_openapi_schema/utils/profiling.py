@@ -0,0 +1,164 @@
+import sys
+import time
+from types import TracebackType
+from typing import Callable, List, NamedTuple, Optional, Type, Union
+
+
+class PhaseStats(NamedTuple):
+    name: str
+    """The name of the phase, e.g. "extract"."""
+
+    seconds: float
+    """The wall time of the phase."""
+
+    nodes: int
+    """The number of nodes of the document visited in the phase."""
+
+    schema_classes: int
+    """The number of pydantic classes processed in the phase."""
+
+    allocated_blocks: int
+    """The change of the number of memory blocks allocated by the interpreter during the phase."""
+
+
+class Phase:
+    """A running phase of a build, see
+    [BuildProfiler.phase][pydantic_openapi_schema.utils.profiling.BuildProfiler.phase]."""
+
+    def __init__(self, profiler: "BuildProfiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.nodes = 0
+        self.schema_classes = 0
+        self._start = 0.0
+        self._allocated_blocks = 0
+
+    def __enter__(self) -> "Phase":
+        self._allocated_blocks = _get_allocated_blocks()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        seconds = time.perf_counter() - self._start
+        allocated_blocks = _get_allocated_blocks() - self._allocated_blocks
+        if exc_type is None:
+            self.profiler.record(
+                PhaseStats(
+                    name=self.name,
+                    seconds=seconds,
+                    nodes=self.nodes,
+                    schema_classes=self.schema_classes,
+                    allocated_blocks=allocated_blocks,
+                )
+            )
+
+    def count(self, nodes: int = 0, schema_classes: int = 0) -> None:
+        """Add to the counters of the phase.
+
+        Args:
+            nodes: The number of visited nodes.
+            schema_classes: The number of processed pydantic classes.
+        """
+        self.nodes += nodes
+        self.schema_classes += schema_classes
+
+
+class _DisabledPhase:
+    def __enter__(self) -> "_DisabledPhase":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        return None
+
+    def count(self, nodes: int = 0, schema_classes: int = 0) -> None:
+        return None
+
+
+_DISABLED_PHASE = _DisabledPhase()
+
+
+class BuildProfiler:
+    """Collects the statistics of the phases of a build.
+
+    Pass an instance as the `profiler` of
+    [construct_open_api_with_schema_class][pydantic_openapi_schema.utils.utils.construct_open_api_with_schema_class]
+    or [OpenAPIBuilder][pydantic_openapi_schema.utils.builder.OpenAPIBuilder]. The phases of a build are:
+
+    - `copy`: the deep copy of the document, skipped with `copy_on_write`.
+    - `extract`: the replacement of the pydantic classes with references.
+    - `resolve_names`: the assignment of the definition names.
+    - `create_classes`: the creation of the classes for the definition names.
+    - `generate`: the generation of the JSON schema definitions.
+    - `parse`: the creation of the `Schema` objects.
+
+    The profiler accumulates the phases of all builds until it is cleared. A profiler is not thread-safe.
+    """
+
+    def __init__(self, callback: Optional[Callable[[PhaseStats], None]] = None) -> None:
+        """Initialize `BuildProfiler`.
+
+        Args:
+            callback: A function called with the statistics of every finished phase, e.g. to export them.
+        """
+        self.callback = callback
+        self.phases: List[PhaseStats] = []
+
+    def phase(self, name: str) -> Phase:
+        """Measure a phase.
+
+        Args:
+            name: The name of the phase.
+
+        Returns:
+            A context manager, the phase is recorded when it exits without an exception.
+        """
+        return Phase(self, name)
+
+    def record(self, stats: PhaseStats) -> None:
+        """Record the statistics of a finished phase.
+
+        Args:
+            stats: The statistics of the phase.
+        """
+        self.phases.append(stats)
+        if self.callback is not None:
+            self.callback(stats)
+
+    @property
+    def seconds(self) -> float:
+        """The total wall time of all recorded phases."""
+        return sum(stats.seconds for stats in self.phases)
+
+    def clear(self) -> None:
+        """Remove all recorded phases."""
+        self.phases = []
+
+
+def profile_phase(profiler: Optional[BuildProfiler], name: str) -> Union[Phase, _DisabledPhase]:
+    """Measure a phase, if profiling is enabled.
+
+    Args:
+        profiler: The profiler of the build, if any.
+        name: The name of the phase.
+
+    Returns:
+        A context manager, which does nothing if `profiler` is `None`.
+    """
+    if profiler is None:
+        return _DISABLED_PHASE
+    return profiler.phase(name)
+
+
+def _get_allocated_blocks() -> int:
+    get_allocated_blocks: Optional[Callable[[], int]] = getattr(sys, "getallocatedblocks", None)
+    return get_allocated_blocks() if get_allocated_blocks is not None else 0
@@ -0,0 +1,270 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Type
+from urllib.parse import unquote
+
+from pydantic import BaseModel
+
+from pydantic_openapi_schema import v3_1_0
+from pydantic_openapi_schema.utils.serializer import _get_field_keys
+from pydantic_openapi_schema.v3_1_0.reference import REF_KEY
+
+_MISSING = object()
+
+
+class ReferenceIndex:
+    """Index of the `$ref`s of an OpenAPI document.
+
+    The document is walked once: the location of every `Reference` and `PathItem` with a `$ref` is recorded,
+    and every internal `$ref`, i.e. a URI fragment like `#/components/schemas/Pet`, is resolved to the object,
+    dict or list it points to. [resolve][pydantic_openapi_schema.utils.ref_index.ReferenceIndex.resolve] and
+    [get_referrers][pydantic_openapi_schema.utils.ref_index.ReferenceIndex.get_referrers] are then dict
+    lookups.
+
+    Locations are JSON pointers into the serialized document, with aliases as keys, e.g.
+    `/paths/~1pets/get/responses/200/content/application~1json/schema`. `$ref`s to other documents, and
+    fragments that do not point to anything, are kept in
+    [unresolved][pydantic_openapi_schema.utils.ref_index.ReferenceIndex.unresolved].
+
+    Components added with
+    [add_component][pydantic_openapi_schema.utils.ref_index.ReferenceIndex.add_component] update the index
+    without walking the rest of the document. Other changes of the document are not detected, create a new
+    index after them.
+    """
+
+    def __init__(self, open_api: v3_1_0.OpenAPI) -> None:
+        """Initialize `ReferenceIndex`.
+
+        Args:
+            open_api: The document. The maps of a lazily parsed document are parsed.
+        """
+        self.open_api = open_api
+        self._refs: Dict[str, str] = {}
+        """The `$ref` of every referring object, by location."""
+        self._locations: Dict[str, List[str]] = {}
+        """The locations of the referring objects, by `$ref`."""
+        self._targets: Dict[str, Any] = {}
+        """The resolved targets, by `$ref`."""
+        self._target_refs: Dict[int, Tuple[Any, Set[str]]] = {}
+        """The resolved targets and the `$ref`s that point to them, by the `id` of the target."""
+        self._unresolved: Set[str] = set()
+        """The `$ref`s that are used in the document, but could not be resolved."""
+        self._add_references(open_api, "")
+
+    def __contains__(self, ref: object) -> bool:
+        return ref in self._targets
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._targets)
+
+    def resolve(self, ref: str) -> Any:
+        """Get the target of a `$ref`.
+
+        Args:
+            ref: The `$ref`, e.g. `#/components/schemas/Pet`.
+
+        Raises:
+            KeyError: If the `$ref` is not used in the document, or its target does not exist.
+
+        Returns:
+            The object, dict or list the `$ref` points to.
+        """
+        try:
+            return self._targets[ref]
+        except KeyError:
+            raise KeyError(ref) from None
+
+    def get(self, ref: str, default: Any = None) -> Any:
+        """Get the target of a `$ref`, or `default` if it cannot be resolved.
+
+        Args:
+            ref: The `$ref`, e.g. `#/components/schemas/Pet`.
+            default: The value returned for unknown `$ref`s.
+
+        Returns:
+            The object, dict or list the `$ref` points to, or `default`.
+        """
+        return self._targets.get(ref, default)
+
+    def get_referrers(self, target: Any) -> List[str]:
+        """Get the locations of the objects that reference a target.
+
+        Args:
+            target: A `$ref`, or an object, dict or list of the document.
+
+        Returns:
+            The JSON pointers of the referring objects, in the order they were indexed.
+        """
+        if isinstance(target, str):
+            return list(self._locations.get(target, ()))
+        _, refs = self._target_refs.get(id(target), (None, ()))
+        return [location for ref in refs for location in self._locations[ref]]
+
+    def get_ref(self, location: str) -> Optional[str]:
+        """Get the `$ref` of the object at a location.
+
+        Args:
+            location: A JSON pointer, e.g. `/paths/~1pets/get/responses/200`.
+
+        Returns:
+            The `$ref` of the object, or `None` if there is no referring object at `location`.
+        """
+        return self._refs.get(location)
+
+    @property
+    def unresolved(self) -> Dict[str, List[str]]:
+        """The `$ref`s whose target is not in the document, with the locations
+        that use them."""
+        return {ref: list(self._locations[ref]) for ref in self._unresolved}
+
+    def add_component(self, section: str, name: str, component: Any) -> None:
+        """Add a component to the document and to the index.
+
+        The `$ref`s in the component are indexed, and the `$ref`s that point into it are resolved. A component
+        that replaces another one is removed from the index first, which takes time proportional to the number
+        of `$ref`s in the document.
+
+        Args:
+            section: The map of `Components`, by name or alias, e.g. "schemas" or "requestBodies".
+            name: The name of the component.
+            component: The component, e.g. a `Schema`.
+        """
+        if self.open_api.components is None:
+            self.open_api.components = v3_1_0.Components()
+        components = self.open_api.components
+        field_name = _get_field_names(type(components)).get(section, section)
+        components_map = getattr(components, field_name)
+        if components_map is None:
+            components_map = {}
+            setattr(components, field_name, components_map)
+        pointer = f"/components/{_escape(_get_field_keys(type(components))[field_name][1])}/{_escape(name)}"
+        replaced = name in components_map
+        components_map[name] = component
+        if replaced:
+            self._remove_references(pointer)
+        self._add_references(component, pointer)
+        for ref in [ref for ref in self._unresolved if ref.startswith("#") and _is_under(_get_pointer(ref), pointer)]:
+            self._resolve(ref)
+
+    def _add_references(self, node: Any, pointer: str) -> None:
+        """Index the referring objects in a node, and resolve their `$ref`s."""
+        new_refs = []
+        for location, ref in _iter_references(node, pointer):
+            self._refs[location] = ref
+            locations = self._locations.get(ref)
+            if locations is None:
+                locations = self._locations[ref] = []
+                new_refs.append(ref)
+            locations.append(location)
+        for ref in new_refs:
+            self._resolve(ref)
+
+    def _remove_references(self, pointer: str) -> None:
+        """Remove the referring objects under a location, and the targets
+        that may have changed."""
+        for location in [location for location in self._refs if _is_under(location, pointer)]:
+            ref = self._refs.pop(location)
+            locations = self._locations[ref]
+            locations.remove(location)
+            if not locations:
+                del self._locations[ref]
+                self._unresolved.discard(ref)
+                self._remove_target(ref)
+        for ref in [ref for ref in self._targets if _is_under(_get_pointer(ref), pointer)]:
+            self._remove_target(ref)
+            self._resolve(ref)
+
+    def _resolve(self, ref: str) -> None:
+        target = _resolve_pointer(self.open_api, _get_pointer(ref)) if ref.startswith("#") else _MISSING
+        if target is _MISSING:
+            self._unresolved.add(ref)
+            return
+        self._unresolved.discard(ref)
+        self._targets[ref] = target
+        entry = self._target_refs.get(id(target))
+        if entry is None:
+            entry = self._target_refs[id(target)] = (target, set())
+        entry[1].add(ref)
+
+    def _remove_target(self, ref: str) -> None:
+        target = self._targets.pop(ref, _MISSING)
+        if target is _MISSING:
+            return
+        _, refs = self._target_refs[id(target)]
+        refs.discard(ref)
+        if not refs:
+            del self._target_refs[id(target)]
+
+
+def _iter_references(node: Any, pointer: str) -> Iterator[Tuple[str, str]]:
+    """Iterate over the locations and `$ref`s of the referring objects in a
+    node, without recursion."""
+    pending = [(node, pointer)]
+    while pending:
+        node, pointer = pending.pop()
+        if isinstance(node, BaseModel):
+            ref_name = _get_ref_name(type(node))
+            ref = None if ref_name is None else node.__dict__.get(ref_name)
+            if isinstance(ref, str):
+                yield pointer, ref
+            field_keys = _get_field_keys(type(node))
+            children: List[Tuple[Any, Any]] = [
+                (field_keys[name][1] if name in field_keys else name, value)
+                for name, value in node.__dict__.items()
+                if value is not None and name != ref_name
+            ]
+        elif isinstance(node, dict):
+            children = [(key, node[key]) for key in node]
+        elif isinstance(node, (list, tuple)):
+            children = list(enumerate(node))
+        else:
+            continue
+        for key, value in reversed(children):
+            if isinstance(value, (BaseModel, dict, list, tuple)):
+                pending.append((value, f"{pointer}/{_escape(str(key))}"))
+
+
+def _resolve_pointer(root: Any, pointer: str) -> Any:
+    """Get the node at a JSON pointer, or `_MISSING`."""
+    node = root
+    for token in pointer.split("/")[1:]:
+        key = token.replace("~1", "/").replace("~0", "~")
+        if isinstance(node, BaseModel):
+            node = node.__dict__.get(_get_field_names(type(node)).get(key, key))
+        elif isinstance(node, dict):
+            node = node[key] if key in node else None
+        elif isinstance(node, (list, tuple)) and key.isdigit() and int(key) < len(node):
+            node = node[int(key)]
+        else:
+            return _MISSING
+        if node is None:
+            return _MISSING
+    return node
+
+
+def _get_pointer(ref: str) -> str:
+    """Get the JSON pointer of the fragment of a `$ref`."""
+    return unquote(ref[1:])
+
+
+def _escape(key: str) -> str:
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def _is_under(location: str, pointer: str) -> bool:
+    return location == pointer or location.startswith(pointer + "/")
+
+
+@lru_cache(maxsize=256)
+def _get_field_names(model_class: Type[BaseModel]) -> Dict[str, str]:
+    """Get the names of the fields of a pydantic class by alias."""
+    return {field.alias: name for name, field in model_class.__fields__.items()}
+
+
+@lru_cache(maxsize=256)
+def _get_ref_name(model_class: Type[BaseModel]) -> Optional[str]:
+    """Get the name of the `$ref` field of a pydantic class, if it has
+    one."""
+    return _get_field_names(model_class).get(REF_KEY)
@@ -0,0 +1,134 @@
+from collections import Counter
+from threading import Lock
+from typing import Dict, Iterable, Set, Type, cast
+from weakref import WeakKeyDictionary, WeakSet
+
+from pydantic import BaseModel, create_model
+from pydantic.schema import (
+    get_flat_models_from_models,
+    get_long_model_name,
+    normalize_name,
+)
+
+SCHEMA_NAME_ATTRIBUTE = "__schema_name__"
+
+_SCHEMA_CLASSES_ATTRIBUTE = "__schema_classes__"
+"""The attribute of a pydantic class that holds its subclasses by registry and name."""
+
+_lock = Lock()
+
+
+def get_preferred_schema_name(model: Type[BaseModel]) -> str:
+    """Get the name a pydantic class asks for in "#/components/schemas".
+
+    Args:
+        model: Pydantic model class.
+
+    Returns:
+        The `__schema_name__` attribute of the class, if set, otherwise its `__name__`.
+    """
+    return cast("str", getattr(model, SCHEMA_NAME_ATTRIBUTE, model.__name__))
+
+
+def resolve_schema_names(models: Iterable[Type[BaseModel]]) -> Dict[Type[BaseModel], str]:
+    """Assign unique definition names to the pydantic classes of a document.
+
+    A class gets its preferred name, see [get_preferred_schema_name][pydantic_openapi_schema.utils.registry.get_preferred_schema_name],
+    unless that name is also preferred by another class of the document, or used by a model nested in one
+    of the classes. In that case the class gets the long name pydantic uses for conflicting models,
+    `<module>__<qualname>`, with a numeric suffix if even that name is taken. Like pydantic, characters that
+    are not valid in a definition name are replaced with `_`. The result only depends on the set of classes,
+    not on the order in which they are given.
+
+    Args:
+        models: Pydantic model classes.
+
+    Returns:
+        A map of the classes to their definition names.
+    """
+    top_level_models = set(models)
+    sorted_models = sorted(
+        top_level_models, key=lambda model: (get_preferred_schema_name(model), model.__module__, model.__qualname__)
+    )
+    preferred_names = Counter(normalize_name(get_preferred_schema_name(model)) for model in sorted_models)
+    nested_names = {
+        model.__name__ for model in get_flat_models_from_models(sorted_models) if model not in top_level_models
+    }
+
+    schema_names: Dict[Type[BaseModel], str] = {}
+    used_names: Set[str] = set()
+    for model in sorted_models:
+        name = normalize_name(get_preferred_schema_name(model))
+        if preferred_names[name] > 1 or name in nested_names:
+            name = base_name = normalize_name(get_long_model_name(model))
+            suffix = 1
+            while name in used_names or name in nested_names or name in preferred_names:
+                suffix += 1
+                name = f"{base_name}_{suffix}"
+        used_names.add(name)
+        schema_names[model] = name
+    return schema_names
+
+
+class SchemaNameRegistry:
+    """Registry of the classes used to generate the JSON schemas of pydantic
+    classes.
+
+    A class whose definition name differs from its `__name__` is represented by a subclass with that name.
+    The registry creates that subclass once per class and name, so repeated builds use the same classes.
+
+    The subclasses are stored on the class they are created for, and the registry only references the
+    classes weakly, so that a class and its subclasses are garbage collected together. Entries are kept
+    until then, or until [clear][pydantic_openapi_schema.utils.registry.SchemaNameRegistry.clear] is called.
+    """
+
+    def __init__(self) -> None:
+        self._models: "WeakSet[Type[BaseModel]]" = WeakSet()
+        """The classes with subclasses created by the registry."""
+
+    def __len__(self) -> int:
+        with _lock:
+            return sum(len(_get_schema_classes(model).get(self, ())) for model in self._models)
+
+    def get_schema_class(self, model: Type[BaseModel], name: str) -> Type[BaseModel]:
+        """Get the class used to generate the JSON schema of `model`.
+
+        Args:
+            model: Pydantic model class.
+            name: The definition name of the class.
+
+        Returns:
+            `model` itself if its `__name__` is `name`, otherwise a subclass named `name`.
+        """
+        if model.__name__ == name:
+            return model
+        with _lock:
+            schema_classes = _get_schema_classes(model).setdefault(self, {})
+            schema_class = schema_classes.get(name)
+            if schema_class is None:
+                schema_class = schema_classes[name] = cast("Type[BaseModel]", create_model(name, __base__=model))
+                self._models.add(model)
+        return schema_class
+
+    def clear(self) -> None:
+        """Remove all registered classes."""
+        with _lock:
+            for model in self._models:
+                _get_schema_classes(model).pop(self, None)
+            self._models.clear()
+
+
+def _get_schema_classes(
+    model: Type[BaseModel],
+) -> "WeakKeyDictionary[SchemaNameRegistry, Dict[str, Type[BaseModel]]]":
+    """Get the subclasses of a pydantic class by registry and name, the
+    subclasses of the class itself rather than inherited ones."""
+    schema_classes = model.__dict__.get(_SCHEMA_CLASSES_ATTRIBUTE)
+    if schema_classes is None:
+        schema_classes = WeakKeyDictionary()
+        setattr(model, _SCHEMA_CLASSES_ATTRIBUTE, schema_classes)
+    return cast("WeakKeyDictionary[SchemaNameRegistry, Dict[str, Type[BaseModel]]]", schema_classes)
+
+
+schema_name_registry = SchemaNameRegistry()
+"""The process-wide registry used by default when generating component schemas."""
@@ -0,0 +1,238 @@
+from collections import deque
+from functools import lru_cache
+from types import GeneratorType
+from typing import Any, Callable, Dict, ForwardRef, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+from pydantic.fields import ModelField
+from pydantic.typing import get_args, is_namedtuple
+from pydantic.utils import ROOT_KEY
+
+from pydantic_openapi_schema import json_backend
+from pydantic_openapi_schema.json_backend import JSONBackend
+from pydantic_openapi_schema.utils.trusted import _LIST_SHAPES, _MAPPING_SHAPES
+from pydantic_openapi_schema.v3_1_0.compact import CompactModel
+
+_Encoder = Callable[[Any], Any]
+_FieldEncoders = Dict[str, Tuple[int, str, Optional[_Encoder]]]
+
+_SEQUENCE_TYPES = (tuple, set, frozenset, GeneratorType, deque)
+
+_ENCODER_CACHE_SIZE = 256
+"""The number of classes whose encoders are kept."""
+
+_model_encoders: Dict[Type[BaseModel], _Encoder] = {}
+"""The encoders of the classes that were serialized, for lookups by the exact class of a value.
+
+The dict is replaced by an empty one once it holds `_ENCODER_CACHE_SIZE` classes, so the encoders of classes that
+are no longer used are released without locking the lookups.
+"""
+
+
+def to_dict(obj: BaseModel) -> Dict[str, Any]:
+    """Convert an OpenAPI document, or any part of it, to a dict like
+    `obj.dict(by_alias=True, exclude_none=True)`.
+
+    Args:
+        obj: A pydantic object, usually a `v3_1_0` model.
+
+    Returns:
+        The values that are not `None`, by alias, with nested objects converted to dicts.
+    """
+    model_class = type(obj)
+    if not _is_supported(model_class):
+        return obj.dict(by_alias=True, exclude_none=True)
+    return _get_encoder(model_class)(obj)  # type: ignore[no-any-return]
+
+
+def to_json(obj: BaseModel, **dumps_kwargs: Any) -> str:
+    """Serialize an OpenAPI document, or any part of it, like
+    `obj.json(by_alias=True, exclude_none=True, **dumps_kwargs)`.
+
+    Pydantic checks the include and exclude options and looks up the aliases of every field of every object
+    it serializes. The encoder of each class is instead created once, with the aliases, the fields that
+    can hold pydantic objects and the skipping of `None` values resolved in advance. The output is identical
+    to that of `json()`, including the key order, and is encoded by the `json_dumps` and `__json_encoder__`
+    of the class of `obj`.
+
+    Args:
+        obj: A pydantic object, usually a `v3_1_0.OpenAPI`.
+        **dumps_kwargs: Keyword arguments of `json_dumps`, e.g. `indent`.
+
+    Returns:
+        The JSON document.
+    """
+    model_class = type(obj)
+    if not _is_supported(model_class):
+        return obj.json(by_alias=True, exclude_none=True, **dumps_kwargs)
+    data = _get_encoder(model_class)(obj)
+    return model_class.__config__.json_dumps(data, default=model_class.__json_encoder__, **dumps_kwargs)
+
+
+def to_json_bytes(obj: BaseModel, *, indent: bool = False, backend: Optional[JSONBackend] = None) -> bytes:
+    """Serialize an OpenAPI document, or any part of it, with a JSON backend.
+
+    The values are converted like by `to_dict` and encoded without escaping non-ASCII characters, either
+    compact or indented by 2 spaces. The output is identical for every backend, orjson is only faster.
+
+    Args:
+        obj: A pydantic object, usually a `v3_1_0.OpenAPI`.
+        indent: Whether to indent nested values by 2 spaces.
+        backend: The JSON backend, the process-wide backend of `json_backend` by default.
+
+    Returns:
+        The JSON document, encoded in UTF-8.
+    """
+    if backend is None:
+        backend = json_backend.json_backend
+    return backend.dumps(to_dict(obj), default=type(obj).__json_encoder__, indent=indent)
+
+
+@lru_cache(maxsize=_ENCODER_CACHE_SIZE)
+def get_model_encoder(model_class: Type[BaseModel]) -> Callable[[BaseModel], Dict[str, Any]]:
+    """Create the function that converts the instances of a pydantic class
+    to dicts like `dict(by_alias=True, exclude_none=True)`.
+
+    Args:
+        model_class: Pydantic model class without a custom root type, `include` or `exclude` fields and
+            `use_enum_values`.
+
+    Returns:
+        The encoder of `model_class`, which reads the `__dict__` of an instance.
+    """
+    field_encoders: _FieldEncoders = {
+        name: (index, field.alias, _create_field_encoder(field))
+        for index, (name, field) in enumerate(model_class.__fields__.items())
+    }
+    if issubclass(model_class, CompactModel):
+        return _create_compact_encoder(field_encoders)
+
+    def encode_model(obj: BaseModel) -> Dict[str, Any]:
+        data = {}
+        for name, value in obj.__dict__.items():
+            if value is None:
+                continue
+            field_encoder = field_encoders.get(name)
+            if field_encoder is None:
+                data[name] = _encode_value(value)
+                continue
+            _, alias, encode = field_encoder
+            data[alias] = value if encode is None else encode(value)
+        return data
+
+    return encode_model
+
+
+def _create_compact_encoder(field_encoders: _FieldEncoders) -> Callable[[BaseModel], Dict[str, Any]]:
+    """Create the encoder of a `CompactModel` class, whose values are
+    output in the order of the fields rather than that of the
+    `__dict__`."""
+    extra_index = len(field_encoders)
+
+    def encode_compact(obj: BaseModel) -> Dict[str, Any]:
+        items: List[Tuple[int, str, Any]] = []
+        last_index = -1
+        ordered = True
+        for name, value in obj.__dict__.items():
+            if value is None:
+                continue
+            field_encoder = field_encoders.get(name)
+            if field_encoder is None:
+                index, key, value = extra_index, name, _encode_value(value)
+            else:
+                index, key, encode = field_encoder
+                if encode is not None:
+                    value = encode(value)
+            ordered = ordered and index >= last_index
+            last_index = index
+            items.append((index, key, value))
+        if not ordered:
+            items.sort(key=lambda item: item[0])
+        return {key: value for _, key, value in items}
+
+    return encode_compact
+
+
+def _create_field_encoder(field: ModelField) -> Optional[_Encoder]:
+    """Get the function that converts the values of a field, or `None` if
+    the values are output as they are."""
+    if _is_plain(field.outer_type_):
+        return None
+    if field.shape in _LIST_SHAPES:
+        return _encode_list
+    if field.shape in _MAPPING_SHAPES:
+        return _encode_mapping
+    return _encode_value
+
+
+def _is_plain(annotation: Any) -> bool:
+    """Check whether a type annotation can only hold values that are
+    serialized as they are, i.e. no pydantic objects and no `Any`."""
+    if annotation is Any or annotation is object or isinstance(annotation, (ForwardRef, TypeVar)):
+        return False
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return False
+    return all(_is_plain(arg) for arg in get_args(annotation))
+
+
+def _is_supported(model_class: Type[BaseModel]) -> bool:
+    return not (
+        model_class.__custom_root_type__
+        or model_class.__exclude_fields__ is not None
+        or model_class.__include_fields__ is not None
+        or getattr(model_class.Config, "use_enum_values", False)
+    )
+
+
+@lru_cache(maxsize=_ENCODER_CACHE_SIZE)
+def _get_field_keys(model_class: Type[BaseModel]) -> Dict[str, Tuple[int, str]]:
+    """Get the position and the alias of every field of a pydantic class."""
+    return {name: (index, field.alias) for index, (name, field) in enumerate(model_class.__fields__.items())}
+
+
+def _get_encoder(model_class: Type[BaseModel]) -> _Encoder:
+    global _model_encoders  # pylint: disable=global-statement
+    encoder = _model_encoders.get(model_class)
+    if encoder is None:
+        encoder = get_model_encoder(model_class) if _is_supported(model_class) else _encode_unsupported
+        if len(_model_encoders) >= _ENCODER_CACHE_SIZE:
+            _model_encoders = {}
+        _model_encoders[model_class] = encoder
+    return encoder
+
+
+def _encode_unsupported(obj: BaseModel) -> Any:
+    data = obj.dict(by_alias=True, exclude_none=True)
+    return data[ROOT_KEY] if ROOT_KEY in data else data
+
+
+def _encode_value(value: Any) -> Any:
+    """Convert a value like `BaseModel._get_value`."""
+    if isinstance(value, BaseModel):
+        return _get_encoder(type(value))(value)
+    if isinstance(value, dict):
+        return {key: _encode_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_encode_value(item) for item in value]
+    if isinstance(value, _SEQUENCE_TYPES):
+        sequence_class: Any = value.__class__
+        items = (_encode_value(item) for item in value)
+        return sequence_class(*items) if is_namedtuple(sequence_class) else sequence_class(items)
+    return value
+
+
+def _encode_list(value: Any) -> Any:
+    if not isinstance(value, list):
+        return _encode_value(value)
+    encoders = _model_encoders
+    return [encoders[item.__class__](item) if item.__class__ in encoders else _encode_value(item) for item in value]
+
+
+def _encode_mapping(value: Any) -> Any:
+    if not isinstance(value, dict):
+        return _encode_value(value)
+    encoders = _model_encoders
+    return {
+        key: encoders[item.__class__](item) if item.__class__ in encoders else _encode_value(item)
+        for key, item in value.items()
+    }
@@ -0,0 +1,262 @@
+import json
+import mmap
+import re
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Callable, Dict, Optional, Tuple, Type, Union
+
+from pydantic_openapi_schema import v3_1_0
+from pydantic_openapi_schema.utils.interning import StringInterner
+from pydantic_openapi_schema.utils.lazy import (
+    LazyModelDict,
+    _create_interning_parser,
+    _get_lazy_plan,
+    _Parser,
+)
+
+_Span = Tuple[int, int]
+_Layout = Dict[str, Any]
+
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+_NESTED_TOKEN = re.compile(rb'(?P<string>"[^"\\]*(?:\\.[^"\\]*)*")|(?P<open>[{\[])|(?P<close>[}\]])')
+_SCALAR = re.compile(rb"[^,}\] \t\n\r]+")
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+
+
+class SpecIndex:
+    """Byte-offset index of the `paths`, `webhooks` and `components` of a
+    memory-mapped JSON OpenAPI file.
+
+    Opening the index maps the file into memory and records where each entry of `paths`, `webhooks` and of
+    the `components` maps starts and ends, without decoding any values. An entry is decoded and validated
+    like by `model_class.parse_file` when it is first read, and the parsed object is kept. Memory use grows
+    with the entries that are read, not with the size of the file.
+
+    The file must not be modified while the index is open. Close the index, or use it as a context manager,
+    to unmap the file.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        model_class: Type[v3_1_0.OpenAPI] = v3_1_0.OpenAPI,
+        interner: Optional[StringInterner] = None,
+    ) -> None:
+        """Initialize `SpecIndex`.
+
+        Args:
+            path: The path of the JSON file, encoded in UTF-8.
+            model_class: The OpenAPI model class the entries are validated with.
+            interner: If set, the repeated strings of every entry are interned when it is parsed, see
+                [intern_strings][pydantic_openapi_schema.utils.interning.intern_strings].
+
+        Raises:
+            ValueError: If the file does not contain a JSON object.
+        """
+        self.model_class = model_class
+        self.interner = interner
+        with open(path, "rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._build()
+        except Exception:
+            self._buffer.close()
+            raise
+
+    def _build(self) -> None:
+        lazy_maps, nested_models = _get_lazy_plan(self.model_class)
+        layout: _Layout = {key: {} for _, keys, _ in lazy_maps for key in keys}
+        nested_maps = {
+            keys: _get_lazy_plan(nested_class)[0] for keys, nested_class in nested_models if keys[0] == "components"
+        }
+        for keys, maps in nested_maps.items():
+            layout.update(dict.fromkeys(keys, {key: {} for _, map_keys, _ in maps for key in map_keys}))
+        entries, _ = _scan_object(self._buffer, _skip_whitespace(self._buffer, 0), layout)
+        self.maps: Dict[str, LazyModelDict] = {
+            keys[0]: self._create_map(entries, keys, parse) for _, keys, parse in lazy_maps
+        }
+        """The indexed maps of the document by alias, e.g. "paths"."""
+        self.components: Dict[str, LazyModelDict] = {}
+        """The indexed maps of "#/components" by alias, e.g. "schemas"."""
+        for keys, maps in nested_maps.items():
+            nested_entries = _get_entry(entries, keys) or {}
+            for _, map_keys, parse in maps:
+                self.components[map_keys[0]] = self._create_map(nested_entries, map_keys, parse)
+
+    @property
+    def paths(self) -> LazyModelDict:
+        """The `PathItem`s of the document by path."""
+        return self.maps["paths"]
+
+    @property
+    def webhooks(self) -> LazyModelDict:
+        """The webhooks of the document by name."""
+        return self.maps["webhooks"]
+
+    def get_path_item(self, path: str) -> v3_1_0.PathItem:
+        """Get a `PathItem` of the document.
+
+        Args:
+            path: The path, e.g. "/pet".
+
+        Raises:
+            KeyError: If the document has no such path.
+
+        Returns:
+            The validated `PathItem`.
+        """
+        return self.paths[path]  # type: ignore[no-any-return]
+
+    def get_schema(self, name: str) -> v3_1_0.Schema:
+        """Get a schema of "#/components/schemas".
+
+        Args:
+            name: The name of the schema, e.g. "Pet".
+
+        Raises:
+            KeyError: If the document has no such schema.
+
+        Returns:
+            The validated `Schema`.
+        """
+        return self.get_component("schemas", name)  # type: ignore[no-any-return]
+
+    def get_component(self, kind: str, name: str) -> Any:
+        """Get an entry of a map of "#/components".
+
+        Args:
+            kind: The alias of the map, e.g. "responses".
+            name: The name of the entry.
+
+        Raises:
+            KeyError: If the document has no such entry.
+
+        Returns:
+            The validated entry, e.g. a `Response` or a `Reference`.
+        """
+        return self.components[kind][name]
+
+    def close(self) -> None:
+        """Unmap the file, entries that were not read cannot be read
+        afterwards."""
+        self._buffer.close()
+
+    def __enter__(self) -> "SpecIndex":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def _create_map(self, entries: Dict[str, Any], keys: Tuple[str, ...], parse: _Parser) -> LazyModelDict:
+        return LazyModelDict(
+            _get_entry(entries, keys) or {}, self._create_decoder(_create_interning_parser(parse, self.interner))
+        )
+
+    def _create_decoder(self, parse: _Parser) -> Callable[[str, _Span], Any]:
+        json_loads = self.model_class.__config__.json_loads
+        buffer = self._buffer
+
+        def decode(key: str, span: _Span) -> Any:
+            start, end = span
+            return parse(key, json_loads(buffer[start:end].decode()))
+
+        return decode
+
+
+def _get_entry(entries: Dict[str, Any], keys: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+    return next((entries[key] for key in keys if isinstance(entries.get(key), dict)), None)
+
+
+def _peek(buffer: mmap.mmap, position: int) -> bytes:
+    end = position + 1
+    return buffer[position:end]
+
+
+def _skip_whitespace(buffer: mmap.mmap, position: int) -> int:
+    return _WHITESPACE.match(buffer, position).end()  # type: ignore[union-attr]
+
+
+def _expect(buffer: mmap.mmap, position: int, chars: bytes) -> bytes:
+    char = _peek(buffer, position)
+    if not char or char not in chars:
+        raise ValueError(f"expected one of {chars.decode()!r} at offset {position}")
+    return char
+
+
+def _scan_object(buffer: mmap.mmap, position: int, layout: _Layout) -> Tuple[Dict[str, Any], int]:
+    """Index the entries of a JSON object without decoding the values.
+
+    Args:
+        buffer: The JSON document.
+        position: The offset of the `{` of the object.
+        layout: The keys whose values are indexed too if they are objects, with the layout of these objects.
+
+    Raises:
+        ValueError: If the object is not valid JSON.
+
+    Returns:
+        A map of the keys to the start and end offsets of their values, or to the index of the value for the
+            keys of `layout`, and the end offset of the object.
+    """
+    _expect(buffer, position, b"{")
+    entries: Dict[str, Any] = {}
+    position = _skip_whitespace(buffer, position + 1)
+    if _peek(buffer, position) == b"}":
+        return entries, position + 1
+    while True:
+        match = _STRING.match(buffer, position)
+        if match is None:
+            raise ValueError(f"expected a key at offset {position}")
+        raw_key = match.group()
+        key = json.loads(raw_key) if b"\\" in raw_key else raw_key[1:-1].decode()
+        position = _skip_whitespace(buffer, match.end())
+        _expect(buffer, position, b":")
+        start = _skip_whitespace(buffer, position + 1)
+        if key in layout and _peek(buffer, start) == b"{":
+            entries[key], position = _scan_object(buffer, start, layout[key])
+        else:
+            position = _skip_value(buffer, start)
+            entries[key] = (start, position)
+        position = _skip_whitespace(buffer, position)
+        if _expect(buffer, position, b",}") == b"}":
+            return entries, position + 1
+        position = _skip_whitespace(buffer, position + 1)
+
+
+def _skip_value(buffer: mmap.mmap, position: int) -> int:
+    """Find the end of a JSON value without decoding it.
+
+    Args:
+        buffer: The JSON document.
+        position: The offset of the first character of the value.
+
+    Raises:
+        ValueError: If the value is not terminated.
+
+    Returns:
+        The end offset of the value.
+    """
+    char = _peek(buffer, position)
+    if char == b'"':
+        match = _STRING.match(buffer, position)
+    elif char in (b"{", b"["):
+        depth = 0
+        for match in _NESTED_TOKEN.finditer(buffer, position):
+            kind = match.lastgroup
+            if kind == "open":
+                depth += 1
+            elif kind == "close":
+                depth -= 1
+                if depth == 0:
+                    return match.end()
+        match = None
+    else:
+        match = _SCALAR.match(buffer, position)
+    if match is None:
+        raise ValueError(f"unterminated JSON value at offset {position}")
+    return match.end()
@@ -0,0 +1,309 @@
+import json
+import re
+from pathlib import Path
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
+
+from pydantic import BaseModel
+
+from pydantic_openapi_schema import v3_1_0
+from pydantic_openapi_schema.utils.interning import StringInterner, intern_strings
+from pydantic_openapi_schema.utils.lazy import _get_lazy_plan, _Parser
+from pydantic_openapi_schema.utils.spec_index import _SCALAR, _STRING, _WHITESPACE
+
+_Location = Tuple[str, ...]
+_Layout = Dict[str, Any]
+
+_NESTED_TOKEN = re.compile(rb'(?P<string>"[^"\\]*(?:\\.[^"\\]*)*")|(?P<partial>")|(?P<open>[{\[])|(?P<close>[}\]])')
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+"""The number of bytes read from the file at a time."""
+
+
+class StreamEntry(NamedTuple):
+    location: _Location
+    """The aliases of the map the entry belongs to, e.g. `("paths",)` or `("components", "schemas")`."""
+
+    key: str
+    """The key of the entry, e.g. the path or the name of the schema."""
+
+    value: Any
+    """The validated entry, e.g. a `PathItem` or a `Schema`."""
+
+
+def iter_entries(
+    source: Union[str, Path, BinaryIO],
+    model_class: Type[v3_1_0.OpenAPI] = v3_1_0.OpenAPI,
+    locations: Optional[Iterable[_Location]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    interner: Optional[StringInterner] = None,
+) -> Iterator[StreamEntry]:
+    """Read the entries of the `paths`, `webhooks` and `components` maps of a
+    JSON document one at a time.
+
+    The document is read in chunks of `chunk_size` bytes. Only the entry that is being parsed is held in
+    memory, all other values are skipped without decoding them. Each entry is validated like by
+    `model_class.parse_file`, and the entries are yielded in the order of the document.
+
+    Args:
+        source: The path of the JSON file, encoded in UTF-8, or a binary file object to read from.
+        model_class: The OpenAPI model class the entries are validated with.
+        locations: The maps to read, e.g. `[("components", "schemas")]`, all maps by default.
+        chunk_size: The number of bytes read at a time.
+        interner: If set, the repeated strings of every entry are interned, see
+            [intern_strings][pydantic_openapi_schema.utils.interning.intern_strings].
+
+    Raises:
+        ValueError: If the document is not a valid JSON object.
+
+    Yields:
+        The entries of the maps.
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as file:
+            yield from iter_entries(file, model_class, locations, chunk_size, interner)
+        return
+    layout = _create_layout(model_class, None if locations is None else set(locations))
+    for entry in _scan_object(_ChunkReader(source, chunk_size), layout, (), model_class):
+        if interner is not None:
+            intern_strings(entry.value, interner)
+        yield entry
+
+
+def iter_path_items(
+    source: Union[str, Path, BinaryIO],
+    model_class: Type[v3_1_0.OpenAPI] = v3_1_0.OpenAPI,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    interner: Optional[StringInterner] = None,
+) -> Iterator[Tuple[str, v3_1_0.PathItem]]:
+    """Read the `PathItem`s of a JSON document one at a time, see
+    [iter_entries][pydantic_openapi_schema.utils.streaming.iter_entries].
+
+    Args:
+        source: The path of the JSON file, or a binary file object to read from.
+        model_class: The OpenAPI model class the entries are validated with.
+        chunk_size: The number of bytes read at a time.
+        interner: If set, the repeated strings of every entry are interned.
+
+    Yields:
+        The paths and their `PathItem`s.
+    """
+    for entry in iter_entries(source, model_class, locations=[("paths",)], chunk_size=chunk_size, interner=interner):
+        yield entry.key, entry.value
+
+
+def iter_schemas(
+    source: Union[str, Path, BinaryIO],
+    model_class: Type[v3_1_0.OpenAPI] = v3_1_0.OpenAPI,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    interner: Optional[StringInterner] = None,
+) -> Iterator[Tuple[str, v3_1_0.Schema]]:
+    """Read the schemas of "#/components/schemas" of a JSON document one at
+    a time, see [iter_entries][pydantic_openapi_schema.utils.streaming.iter_entries].
+
+    Args:
+        source: The path of the JSON file, or a binary file object to read from.
+        model_class: The OpenAPI model class the entries are validated with.
+        chunk_size: The number of bytes read at a time.
+        interner: If set, the repeated strings of every entry are interned.
+
+    Yields:
+        The names of the schemas and the `Schema`s.
+    """
+    for entry in iter_entries(
+        source, model_class, locations=[("components", "schemas")], chunk_size=chunk_size, interner=interner
+    ):
+        yield entry.key, entry.value
+
+
+class _ChunkReader:
+    """A window of a binary file that is extended on demand.
+
+    `position` is the offset of the next unread byte in `buffer`. Bytes before `position`, or before `mark`
+    if it is set, are dropped when the next chunk is read.
+    """
+
+    def __init__(self, file: BinaryIO, chunk_size: int) -> None:
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = b""
+        self.position = 0
+        self.mark: Optional[int] = None
+        self.eof = False
+
+    def read(self) -> bool:
+        """Read the next chunk.
+
+        Returns:
+            `False` if the end of the file was reached.
+        """
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        keep = self.position if self.mark is None else self.mark
+        self.buffer = self.buffer[keep:] + chunk
+        self.position -= keep
+        if self.mark is not None:
+            self.mark -= keep
+        return True
+
+    def peek(self) -> bytes:
+        """Skip whitespace and return the next byte, or `b""` at the end of
+        the file."""
+        while True:
+            self.position = _WHITESPACE.match(self.buffer, self.position).end()  # type: ignore[union-attr]
+            if self.position < len(self.buffer) or not self.read():
+                start, end = self.position, self.position + 1
+                return self.buffer[start:end]
+
+    def expect(self, chars: bytes) -> bytes:
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"expected one of {chars.decode()!r}, got {char!r}")
+        self.position += 1
+        return char
+
+    def match(self, pattern: "re.Pattern[bytes]") -> Optional["re.Match[bytes]"]:
+        """Match a pattern at the current position, reading more chunks until
+        the match does not reach the end of the buffer."""
+        while True:
+            match = pattern.match(self.buffer, self.position)
+            if (match is not None and match.end() < len(self.buffer)) or not self.read():
+                return match
+
+    def read_key(self) -> str:
+        self.peek()
+        match = self.match(_STRING)
+        if match is None:
+            raise ValueError("expected an object key")
+        self.position = match.end()
+        raw_key = match.group()
+        return json.loads(raw_key) if b"\\" in raw_key else raw_key[1:-1].decode()
+
+    def skip_value(self) -> None:
+        char = self.peek()
+        if char in (b"{", b"["):
+            self._skip_container()
+            return
+        match = self.match(_STRING if char == b'"' else _SCALAR)
+        if match is None:
+            raise ValueError("expected a JSON value")
+        self.position = match.end()
+
+    def _skip_container(self) -> None:
+        depth = 0
+        while True:
+            end = len(self.buffer)
+            for match in _NESTED_TOKEN.finditer(self.buffer, self.position):
+                kind = match.lastgroup
+                if kind == "partial":
+                    end = match.start()
+                    break
+                if kind == "open":
+                    depth += 1
+                elif kind == "close":
+                    depth -= 1
+                    if depth == 0:
+                        self.position = match.end()
+                        return
+            self.position = end
+            if not self.read():
+                raise ValueError("unterminated JSON value")
+
+    def read_value(self) -> bytes:
+        """Skip a value and return its bytes."""
+        self.peek()
+        self.mark = self.position
+        try:
+            self.skip_value()
+            start, end = self.mark, self.position
+            return self.buffer[start:end]
+        finally:
+            self.mark = None
+
+
+def _create_layout(model_class: Type[BaseModel], locations: Optional[Set[_Location]]) -> _Layout:
+    """Map the keys of the document to the maps that are read.
+
+    Args:
+        model_class: The OpenAPI model class.
+        locations: The aliases of the maps to read, all maps if `None`.
+
+    Returns:
+        A map of keys to the parser of the values of a map, or to the layout of a nested object.
+    """
+    lazy_maps, nested_models = _get_lazy_plan(model_class)
+    layout: _Layout = {}
+    for _, keys, parse in lazy_maps:
+        if locations is None or keys[:1] in locations:
+            layout.update(dict.fromkeys(keys, parse))
+    for keys, nested_class in nested_models:
+        nested_locations = None if locations is None else {loc[1:] for loc in locations if loc[0] in keys}
+        nested_layout = _create_layout(nested_class, nested_locations)
+        if nested_layout:
+            layout.update(dict.fromkeys(keys, nested_layout))
+    return layout
+
+
+def _scan_object(
+    reader: _ChunkReader, layout: _Layout, location: _Location, model_class: Type[v3_1_0.OpenAPI]
+) -> Iterator[StreamEntry]:
+    """Read the entries of the maps of a JSON object.
+
+    Args:
+        reader: The reader, positioned at the `{` of the object.
+        layout: The keys of the object to descend into, see `_create_layout`.
+        location: The aliases of the object in the document.
+        model_class: The OpenAPI model class, its `json_loads` decodes the entries.
+
+    Yields:
+        The entries of the maps of the object.
+    """
+    reader.expect(b"{")
+    if reader.peek() == b"}":
+        reader.position += 1
+        return
+    while True:
+        key = reader.read_key()
+        reader.expect(b":")
+        nested = layout.get(key)
+        if nested is not None and reader.peek() == b"{":
+            if isinstance(nested, dict):
+                yield from _scan_object(reader, nested, location + (key,), model_class)
+            else:
+                yield from _scan_map(reader, nested, location + (key,), model_class)
+        else:
+            reader.skip_value()
+        if reader.expect(b",}") == b"}":
+            return
+
+
+def _scan_map(
+    reader: _ChunkReader, parse: _Parser, location: _Location, model_class: Type[v3_1_0.OpenAPI]
+) -> Iterator[StreamEntry]:
+    json_loads = model_class.__config__.json_loads
+    reader.expect(b"{")
+    if reader.peek() == b"}":
+        reader.position += 1
+        return
+    while True:
+        key = reader.read_key()
+        reader.expect(b":")
+        value = reader.read_value()
+        yield StreamEntry(location, key, parse(key, json_loads(value.decode())))
+        if reader.expect(b",}") == b"}":
+            return
@@ -0,0 +1,352 @@
+import sys
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    ForwardRef,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
+
+from pydantic import BaseModel, Extra
+from pydantic.fields import (
+    SHAPE_DEFAULTDICT,
+    SHAPE_DICT,
+    SHAPE_LIST,
+    SHAPE_MAPPING,
+    SHAPE_SEQUENCE,
+    SHAPE_SINGLETON,
+    ModelField,
+)
+from pydantic.parse import Protocol, load_file, load_str_bytes
+from pydantic.types import StrBytes
+from pydantic.typing import evaluate_forwardref
+
+from pydantic_openapi_schema.utils.interning import StringInterner, intern_strings
+from pydantic_openapi_schema.v3_1_0.compact import get_compact_fields, sort_values
+from pydantic_openapi_schema.v3_1_0.reference import REF_KEY
+
+Model = TypeVar("Model", bound=BaseModel)
+_Converter = Optional[Callable[[Any], Any]]
+_FieldPlan = Tuple[Dict[str, Tuple[str, _Converter]], Dict[str, Any], Tuple[str, ...], FrozenSet[str], bool, bool]
+
+_LIST_SHAPES = {SHAPE_LIST, SHAPE_SEQUENCE}
+_MAPPING_SHAPES = {SHAPE_DICT, SHAPE_MAPPING, SHAPE_DEFAULTDICT}
+_IMMUTABLE_DEFAULTS = (type(None), str, int, float, bool, Enum)
+
+
+def construct_model(model_class: Type[Model], obj: Dict[str, Any]) -> Model:
+    """Create an instance of a pydantic class from trusted data, without
+    validation.
+
+    Nested values are converted according to the field types: dicts become instances of the nested pydantic
+    classes, ints become floats for `float` fields and values of `Enum` fields become members. A `Union` of
+    pydantic classes is resolved in one step, a dict with a `$ref` key becomes the first member that has a
+    `$ref` field (e.g. `Reference`), any other dict the first member whose required fields are present.
+    Unknown keys are dropped unless the class allows extra fields.
+
+    Only use this for data that is known to be valid, e.g. the JSON schemas generated by pydantic. For valid
+    data the result is equal to `model_class.parse_obj(obj)`, invalid data is not detected.
+
+    Args:
+        model_class: Pydantic model class.
+        obj: The field values, by alias or, if the class allows it, by field name.
+
+    Returns:
+        An instance of `model_class`.
+    """
+    fields, defaults, mutable_defaults, compact_fields, allow_extra, has_private_attributes = _get_field_plan(
+        model_class
+    )
+    values = defaults.copy()
+    for name in mutable_defaults:
+        values[name] = model_class.__fields__[name].get_default()
+    fields_set = set()
+    for key, value in obj.items():
+        field = fields.get(key)
+        if field is None:
+            if allow_extra:
+                values[key] = value
+                fields_set.add(key)
+            continue
+        name, converter = field
+        fields_set.add(name)
+        if value is None:
+            if name not in compact_fields:
+                values[name] = value
+            continue
+        values[name] = value if converter is None else converter(value)
+    if compact_fields:
+        sort_values(model_class, values)
+    instance = model_class.__new__(model_class)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__fields_set__", fields_set)
+    if has_private_attributes:
+        instance._init_private_attributes()
+    return instance
+
+
+def trusted_parse_obj(model_class: Type[Model], obj: Any, interner: Optional[StringInterner] = None) -> Model:
+    """Load a trusted OpenAPI document, or any part of it, without
+    validation.
+
+    This is the non-validating counterpart of `model_class.parse_obj`, see
+    [construct_model][pydantic_openapi_schema.utils.trusted.construct_model] for how values are converted.
+
+    Args:
+        model_class: Pydantic model class, e.g. `v3_1_0.OpenAPI`.
+        obj: The data of the document, usually parsed JSON.
+        interner: If set, the repeated strings of the document are interned, see
+            [intern_strings][pydantic_openapi_schema.utils.interning.intern_strings].
+
+    Raises:
+        TypeError: If `obj` is not a dict.
+
+    Returns:
+        An instance of `model_class`.
+    """
+    if not isinstance(obj, dict):
+        raise TypeError(f"{model_class.__name__} expected dict not {obj.__class__.__name__}")
+    instance = construct_model(model_class, obj)
+    if interner is not None:
+        intern_strings(instance, interner)
+    return instance
+
+
+def trusted_parse_raw(
+    model_class: Type[Model],
+    b: StrBytes,
+    *,
+    content_type: Optional[str] = None,
+    encoding: str = "utf8",
+    proto: Optional[Protocol] = None,
+    interner: Optional[StringInterner] = None,
+) -> Model:
+    """Load a trusted OpenAPI document from a JSON string without
+    validation.
+
+    The counterpart of `model_class.parse_raw`, the JSON is decoded with the `json_loads` of the class config.
+
+    Args:
+        model_class: Pydantic model class, e.g. `v3_1_0.OpenAPI`.
+        b: The JSON document.
+        content_type: The content type of `b`, only JSON is supported.
+        encoding: The encoding of `b`, if it is bytes.
+        proto: The protocol of `b`, only JSON is supported.
+        interner: If set, the repeated strings of the document are interned.
+
+    Returns:
+        An instance of `model_class`.
+    """
+    obj = load_str_bytes(
+        b,
+        proto=cast("Protocol", proto),
+        content_type=cast("str", content_type),
+        encoding=encoding,
+        json_loads=model_class.__config__.json_loads,
+    )
+    return trusted_parse_obj(model_class, obj, interner=interner)
+
+
+def trusted_parse_file(
+    model_class: Type[Model],
+    path: Union[str, Path],
+    *,
+    content_type: Optional[str] = None,
+    encoding: str = "utf8",
+    proto: Optional[Protocol] = None,
+    interner: Optional[StringInterner] = None,
+) -> Model:
+    """Load a trusted OpenAPI document from a JSON file without
+    validation.
+
+    The counterpart of `model_class.parse_file`.
+
+    Args:
+        model_class: Pydantic model class, e.g. `v3_1_0.OpenAPI`.
+        path: The path of the JSON file.
+        content_type: The content type of the file, only JSON is supported.
+        encoding: The encoding of the file.
+        proto: The protocol of the file, only JSON is supported.
+        interner: If set, the repeated strings of the document are interned.
+
+    Returns:
+        An instance of `model_class`.
+    """
+    obj = load_file(
+        path,
+        proto=cast("Protocol", proto),
+        content_type=cast("str", content_type),
+        encoding=encoding,
+        json_loads=model_class.__config__.json_loads,
+    )
+    return trusted_parse_obj(model_class, obj, interner=interner)
+
+
+@lru_cache(maxsize=256)
+def _get_field_plan(model_class: Type[BaseModel]) -> _FieldPlan:
+    fields: Dict[str, Tuple[str, _Converter]] = {}
+    defaults: Dict[str, Any] = {}
+    mutable_defaults: List[str] = []
+    compact_fields = get_compact_fields(model_class)
+    for name, field in model_class.__fields__.items():
+        converter = _create_converter(model_class, field)
+        fields[field.alias] = (name, converter)
+        if model_class.__config__.allow_population_by_field_name:
+            fields.setdefault(name, (name, converter))
+        if name in compact_fields:
+            continue
+        if field.default_factory is None and isinstance(field.default, _IMMUTABLE_DEFAULTS):
+            defaults[name] = field.default
+        else:
+            defaults[name] = None
+            mutable_defaults.append(name)
+    return (
+        fields,
+        defaults,
+        tuple(mutable_defaults),
+        compact_fields,
+        model_class.__config__.extra == Extra.allow,
+        bool(model_class.__private_attributes__),
+    )
+
+
+def _resolve_type(model_class: Type[BaseModel], type_: Any) -> Any:
+    """Resolve a forward reference that pydantic left unresolved.
+
+    The name is looked up in the module of the class, then in its package, e.g. `PathItem` in the `Callback`
+    type of `Operation.callbacks` is found in `pydantic_openapi_schema.v3_1_0`.
+
+    Args:
+        model_class: The pydantic class the field belongs to.
+        type_: The type of the field.
+
+    Returns:
+        The resolved type, or `Any` if it cannot be resolved.
+    """
+    if not isinstance(type_, ForwardRef):
+        return type_
+    module_name = model_class.__module__
+    for namespace_name in (module_name, module_name.rpartition(".")[0]):
+        module = sys.modules.get(namespace_name)
+        if module is None:
+            continue
+        try:
+            return evaluate_forwardref(type_, vars(module), None)
+        except NameError:
+            continue
+    return Any
+
+
+def _create_converter(model_class: Type[BaseModel], field: ModelField) -> _Converter:
+    """Create the function that converts a trusted value of a field.
+
+    Args:
+        model_class: The pydantic class the field belongs to, used to resolve forward references.
+        field: The field, or one of its sub-fields.
+
+    Returns:
+        The converter, or `None` if values are used as they are.
+    """
+    if field.shape in _LIST_SHAPES and field.sub_fields:
+        item_converter = _create_converter(model_class, field.sub_fields[0])
+        if item_converter is None:
+            return list
+        return lambda value: [None if item is None else item_converter(item) for item in value]
+    if field.shape in _MAPPING_SHAPES and field.sub_fields:
+        value_converter = _create_converter(model_class, field.sub_fields[0])
+        if value_converter is None:
+            return dict
+        return lambda value: {key: None if item is None else value_converter(item) for key, item in value.items()}
+    if field.shape != SHAPE_SINGLETON:
+        return None
+    if field.sub_fields:
+        return _create_union_converter(model_class, field.sub_fields)
+    type_ = _resolve_type(model_class, field.type_)
+    if not isinstance(type_, type):
+        return None
+    if issubclass(type_, BaseModel):
+        return lambda value: construct_model(type_, value) if isinstance(value, dict) else value
+    if issubclass(type_, float):
+        return lambda value: float(value) if isinstance(value, int) and not isinstance(value, bool) else value
+    if issubclass(type_, Enum):
+        return type_
+    return None
+
+
+def _create_union_converter(model_class: Type[BaseModel], sub_fields: List[ModelField]) -> _Converter:
+    """Create the function that converts a trusted value of a `Union`
+    field.
+
+    Args:
+        model_class: The pydantic class the field belongs to, used to resolve forward references.
+        sub_fields: The sub-fields of the members of the `Union`.
+
+    Returns:
+        The converter, or `None` if values are used as they are.
+    """
+    models: List[Type[BaseModel]] = []
+    converters: Dict[type, _Converter] = {}
+    for sub_field in sub_fields:
+        type_ = _resolve_type(model_class, sub_field.type_)
+        if sub_field.shape == SHAPE_SINGLETON and isinstance(type_, type) and issubclass(type_, BaseModel):
+            models.append(type_)
+        elif sub_field.shape in _MAPPING_SHAPES:
+            converters.setdefault(dict, _create_converter(model_class, sub_field))
+        elif sub_field.shape in _LIST_SHAPES:
+            converters.setdefault(list, _create_converter(model_class, sub_field))
+        else:
+            converters.setdefault(object, _create_converter(model_class, sub_field))
+    select_model = _create_model_selector(models, fallback=dict not in converters)
+
+    def convert(value: Any) -> Any:
+        if isinstance(value, dict):
+            model = select_model(value)
+            if model is not None:
+                return construct_model(model, value)
+            converter = converters.get(dict)
+        elif isinstance(value, list):
+            converter = converters.get(list)
+        else:
+            converter = converters.get(object)
+        return value if converter is None else converter(value)
+
+    return convert
+
+
+def _create_model_selector(
+    models: List[Type[BaseModel]], fallback: bool
+) -> Callable[[Dict[str, Any]], Optional[Type[BaseModel]]]:
+    """Create the function that picks the member of a `Union` of pydantic
+    classes for a dict.
+
+    Args:
+        models: The pydantic classes of the `Union`, in order.
+        fallback: If `True`, the first class is picked if no other class matches.
+
+    Returns:
+        A function that returns the first class with a `$ref` field if the dict has a `$ref` key, otherwise the
+            first class whose required fields are all present, or `None`.
+    """
+    ref_model = next((model for model in models if any(f.alias == REF_KEY for f in model.__fields__.values())), None)
+    required_keys = [(model, frozenset(f.alias for f in model.__fields__.values() if f.required)) for model in models]
+    fallback_model = models[0] if fallback and models else None
+
+    def select_model(value: Dict[str, Any]) -> Optional[Type[BaseModel]]:
+        if ref_model is not None and REF_KEY in value:
+            return ref_model
+        for model, required in required_keys:
+            if value.keys() >= required:
+                return model
+        return fallback_model
+
+    return select_model
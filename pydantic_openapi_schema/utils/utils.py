@@ -1,17 +1,53 @@
-from typing import TYPE_CHECKING, Any, Set, Type, TypeVar, cast
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
 
-from pydantic import BaseModel, create_model
-from pydantic.schema import schema
+from pydantic import BaseModel
+from pydantic.schema import (
+    get_flat_models_from_model,
+    get_flat_models_from_models,
+    get_model_name_map,
+    model_process_schema,
+)
 
 from pydantic_openapi_schema import v3_1_0
+from pydantic_openapi_schema.utils.cache import (
+    SchemaDefinitions,
+    SchemaDefinitionsCache,
+)
+from pydantic_openapi_schema.utils.interning import StringInterner, intern_strings
+from pydantic_openapi_schema.utils.introspection import get_schema_fields
+from pydantic_openapi_schema.utils.profiling import BuildProfiler, profile_phase
+from pydantic_openapi_schema.utils.registry import (
+    SCHEMA_NAME_ATTRIBUTE,
+    SchemaNameRegistry,
+    get_preferred_schema_name,
+    resolve_schema_names,
+    schema_name_registry,
+)
+from pydantic_openapi_schema.utils.trusted import construct_model
 
 if TYPE_CHECKING:
-    from typing import Dict
+    from pydantic.schema import TypeModelOrEnum
 
 REF_PREFIX = "#/components/schemas/"
-SCHEMA_NAME_ATTRIBUTE = "__schema_name__"
 
 T = TypeVar("T", bound=v3_1_0.OpenAPI)
+W = TypeVar("W")
+References = Dict[Type[BaseModel], List[v3_1_0.Reference]]
 
 
 class OpenAPI310PydanticSchema(v3_1_0.Schema):
@@ -23,44 +59,114 @@ class OpenAPI310PydanticSchema(v3_1_0.Schema):
 
 def construct_open_api_with_schema_class(
     open_api_schema: T,
+    copy_on_write: bool = False,
+    cache: Optional[SchemaDefinitionsCache] = None,
+    registry: SchemaNameRegistry = schema_name_registry,
+    executor: Optional[Executor] = None,
+    trusted: bool = False,
+    profiler: Optional[BuildProfiler] = None,
+    interner: Optional[StringInterner] = None,
 ) -> T:
     """Construct a new OpenAPI object, with the use of pydantic classes to
     produce JSON schemas.
 
     Args:
         open_api_schema: An instance of the OpenAPI model.
+        copy_on_write: If `True`, only the objects on the path from the root to each replaced
+            `OpenAPI310PydanticSchema` are copied, all other objects are shared with `open_api_schema`.
+            Otherwise, the new object is a deep copy.
+        cache: The cache of generated JSON schema definitions, e.g. `schema_definitions_cache`, if any.
+        registry: The registry of the classes used to generate the JSON schemas.
+        executor: A `concurrent.futures` executor used to generate the JSON schemas of classes that share
+            no nested models in parallel. The result is identical to the serial generation.
+        trusted: If `True`, the `Schema` objects are created from the generated definitions without
+            validation, see [construct_model][pydantic_openapi_schema.utils.trusted.construct_model].
+        profiler: A profiler that records the statistics of the phases of the build. Profiling is
+            disabled if `None`.
+        interner: If set, the $references and the repeated strings of the generated `Schema` objects are
+            interned, see [intern_strings][pydantic_openapi_schema.utils.interning.intern_strings]. The
+            interner counts the memory saved.
 
     Returns:
         new OpenAPI object with "#/components/schemas" values updated. If there is no update in
             "#/components/schemas" values, the original `open_api` will be returned.
     """
-    copied_schema = open_api_schema.copy(deep=True)
-    schema_classes = list(extract_pydantic_types_to_openapi_components(obj=copied_schema, ref_class=v3_1_0.Reference))
+    copied_schema, references = replace_pydantic_types_with_references(
+        open_api_schema, copy_on_write=copy_on_write, profiler=profiler
+    )
 
-    if not schema_classes:
+    if not references:
         return open_api_schema
 
-    if not copied_schema.components:
-        copied_schema.components = v3_1_0.Components(schemas={})
-    if copied_schema.components.schemas is None:  # pragma: no cover
-        copied_schema.components.schemas = cast("Dict[str, Any]", {})
-
-    schema_classes = [
-        cls if not hasattr(cls, "__schema_name__") else create_model(getattr(cls, SCHEMA_NAME_ATTRIBUTE), __base__=cls)
-        for cls in schema_classes
-    ]
-    schema_classes.sort(key=lambda x: x.__name__)
-    schema_definitions = schema(schema_classes, ref_prefix=REF_PREFIX)["definitions"]
-    copied_schema.components.schemas.update(
-        {key: v3_1_0.Schema.parse_obj(schema_dict) for key, schema_dict in schema_definitions.items()}
+    with profile_phase(profiler, "resolve_names") as phase:
+        schema_names = resolve_schema_names(references)
+        update_references(references, schema_names, interner=interner)
+        phase.count(schema_classes=len(schema_names))
+    component_schemas = get_component_schemas(copied_schema)
+    schema_definitions = generate_schema_definitions(
+        schema_names, cache=cache, registry=registry, executor=executor, profiler=profiler
     )
+    with profile_phase(profiler, "parse") as phase:
+        component_schemas.update(parse_schema_definitions(schema_definitions, trusted=trusted, interner=interner))
+        phase.count(nodes=len(schema_definitions))
     return copied_schema
 
 
+def replace_pydantic_types_with_references(
+    open_api_schema: T, copy_on_write: bool = False, profiler: Optional[BuildProfiler] = None
+) -> Tuple[T, References]:
+    """Create a copy of the OpenAPI document in which all Pydantic Models are
+    replaced with $references to the schema's components section.
+
+    Args:
+        open_api_schema: An instance of the OpenAPI model.
+        copy_on_write: If `True`, share all subtrees without Pydantic Models with `open_api_schema`,
+            otherwise deep copy the document.
+        profiler: A profiler that records the statistics of the "copy" and "extract" phases, if any.
+
+    Returns:
+        A tuple of the copied document and a map of the pydantic schema classes to the $references created
+            for them.
+    """
+    references: References = {}
+    if copy_on_write:
+        with profile_phase(profiler, "extract") as phase:
+            copied_schema, nodes = _copy_on_write(open_api_schema, ref_class=v3_1_0.Reference, references=references)
+            phase.count(nodes=nodes, schema_classes=len(references))
+        return cast("T", copied_schema), references
+    with profile_phase(profiler, "copy"):
+        copied_schema = open_api_schema.copy(deep=True)
+    with profile_phase(profiler, "extract") as phase:
+        nodes = _extract_references(copied_schema, ref_class=v3_1_0.Reference, references=references)
+        phase.count(nodes=nodes, schema_classes=len(references))
+    return copied_schema, references
+
+
+def get_component_schemas(open_api_schema: v3_1_0.OpenAPI) -> Dict[str, v3_1_0.Schema]:
+    """Make sure the document has its own "#/components/schemas" map.
+
+    The components object and its schemas map are replaced by (shallow) copies, so that updating
+    the returned map never changes objects shared with another document.
+
+    Args:
+        open_api_schema: An instance of the OpenAPI model.
+
+    Returns:
+        The "#/components/schemas" map of `open_api_schema`.
+    """
+    components = open_api_schema.components or v3_1_0.Components()
+    schemas = dict(components.schemas or {})
+    open_api_schema.components = components.copy(update={"schemas": schemas})
+    return schemas
+
+
 def extract_pydantic_types_to_openapi_components(obj: Any, ref_class: Type[v3_1_0.Reference]) -> Set[Type[BaseModel]]:
-    """Recursively traverses the OpenAPI document, replacing any found Pydantic
-    Models with $references to the schema's components section and returning
-    the pydantic models themselves.
+    """Traverses the OpenAPI document, replacing any found Pydantic Models
+    with $references to the schema's components section and returning the
+    pydantic models themselves.
+
+    Only fields whose annotation allows them to hold a `Schema` are visited, see
+    [get_schema_fields][pydantic_openapi_schema.utils.introspection.get_schema_fields].
 
     Args:
         obj:
@@ -69,31 +175,28 @@ def extract_pydantic_types_to_openapi_components(obj: Any, ref_class: Type[v3_1_
     Returns:
         set of pydantic schema classes
     """
-    pydantic_schemas: Set[Type[BaseModel]] = set()
-    if isinstance(obj, BaseModel):
-        fields = obj.__fields_set__
-        for field in fields:
-            child_obj = getattr(obj, field)
-            if isinstance(child_obj, OpenAPI310PydanticSchema):
-                setattr(obj, field, ref_class(ref=create_ref_prefix(child_obj.schema_class)))
-                pydantic_schemas.add(child_obj.schema_class)
-            else:
-                pydantic_schemas.update(extract_pydantic_types_to_openapi_components(child_obj, ref_class=ref_class))
-    elif isinstance(obj, list):
-        for index, elem in enumerate(obj):
-            if isinstance(elem, OpenAPI310PydanticSchema):
-                obj[index] = ref_class(ref=create_ref_prefix(elem.schema_class))
-                pydantic_schemas.add(elem.schema_class)
-            else:
-                pydantic_schemas.update(extract_pydantic_types_to_openapi_components(elem, ref_class=ref_class))
-    elif isinstance(obj, dict):
-        for key, value in obj.items():
-            if isinstance(value, OpenAPI310PydanticSchema):
-                obj[key] = ref_class(ref=create_ref_prefix(value.schema_class))
-                pydantic_schemas.add(value.schema_class)
-            else:
-                pydantic_schemas.update(extract_pydantic_types_to_openapi_components(value, ref_class=ref_class))
-    return pydantic_schemas
+    references: References = {}
+    _extract_references(obj, ref_class=ref_class, references=references)
+    return set(references)
+
+
+def update_references(
+    references: References, schema_names: Dict[Type[BaseModel], str], interner: Optional[StringInterner] = None
+) -> None:
+    """Point the $references of pydantic classes to their definition names.
+
+    Args:
+        references: A map of pydantic schema classes to $references.
+        schema_names: A map of pydantic schema classes to definition names.
+        interner: If set, the $reference strings are interned.
+    """
+    for model, model_references in references.items():
+        ref = REF_PREFIX + schema_names[model]
+        if interner is not None:
+            ref = interner.intern(ref)
+        for reference in model_references:
+            if reference.ref != ref:
+                reference.ref = ref
 
 
 def create_ref_prefix(model: Type[BaseModel]) -> str:
@@ -105,4 +208,448 @@ def create_ref_prefix(model: Type[BaseModel]) -> str:
     Returns:
         A prefixed name.
     """
-    return REF_PREFIX + getattr(model, SCHEMA_NAME_ATTRIBUTE, model.__name__)
+    return REF_PREFIX + get_preferred_schema_name(model)
+
+
+def sort_schema_classes(schema_classes: Iterable[Type[BaseModel]]) -> List[Type[BaseModel]]:
+    """Sort schema classes into the order in which their definitions are
+    added to the components.
+
+    Args:
+        schema_classes: Pydantic model classes.
+
+    Returns:
+        A list of the classes, sorted by name.
+    """
+    return sorted(schema_classes, key=lambda x: x.__name__)
+
+
+def create_model_name_map(schema_classes: Iterable[Type[BaseModel]]) -> "Dict[TypeModelOrEnum, str]":
+    """Create the map of definition names for the given classes and all the
+    models and enums nested in them.
+
+    Args:
+        schema_classes: Pydantic model classes.
+
+    Returns:
+        A map of model (or enum) classes to unique definition names.
+    """
+    return get_model_name_map(get_flat_models_from_models(list(schema_classes)))
+
+
+def generate_schema_definitions(
+    schema_names: Dict[Type[BaseModel], str],
+    cache: Optional[SchemaDefinitionsCache] = None,
+    registry: SchemaNameRegistry = schema_name_registry,
+    executor: Optional[Executor] = None,
+    profiler: Optional[BuildProfiler] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Generate the JSON schema definitions of pydantic classes.
+
+    Args:
+        schema_names: A map of pydantic classes to definition names, see
+            [resolve_schema_names][pydantic_openapi_schema.utils.registry.resolve_schema_names].
+        cache: The cache of generated JSON schema definitions, if any.
+        registry: The registry of the classes used to generate the JSON schemas.
+        executor: The executor used to generate the definitions of independent classes in parallel, if any.
+        profiler: A profiler that records the statistics of the "create_classes" and "generate" phases, if any.
+
+    Returns:
+        A map of definition names to JSON schema dicts, in the order `pydantic.schema.schema` produces them.
+    """
+    with profile_phase(profiler, "create_classes") as phase:
+        schema_classes = {registry.get_schema_class(model, name): model for model, name in schema_names.items()}
+        phase.count(schema_classes=len(schema_classes))
+    with profile_phase(profiler, "generate") as phase:
+        model_name_map = create_model_name_map(schema_classes)
+        definition_names = set(model_name_map.values())
+        schema_definitions: Dict[str, Dict[str, Any]] = {}
+        entries = get_schema_definitions_map(
+            {schema_class: schema_classes[schema_class] for schema_class in sort_schema_classes(schema_classes)},
+            model_name_map=model_name_map,
+            definition_names=definition_names,
+            cache=cache,
+            executor=executor,
+        )
+        for entry in entries.values():
+            schema_definitions.update(entry.definitions)
+        phase.count(nodes=len(schema_definitions), schema_classes=len(schema_classes))
+    return schema_definitions
+
+
+def parse_schema_definitions(
+    schema_definitions: Dict[str, Dict[str, Any]], trusted: bool = False, interner: Optional[StringInterner] = None
+) -> Dict[str, v3_1_0.Schema]:
+    """Create the component schemas of JSON schema definitions.
+
+    Args:
+        schema_definitions: A map of definition names to JSON schema dicts.
+        trusted: If `True`, the definitions are not validated, they must have been generated by pydantic.
+        interner: If set, the repeated strings of the `Schema` objects are interned.
+
+    Returns:
+        A map of definition names to `Schema` objects.
+    """
+    if trusted:
+        schemas = {key: construct_model(v3_1_0.Schema, schema_dict) for key, schema_dict in schema_definitions.items()}
+    else:
+        schemas = {key: v3_1_0.Schema.parse_obj(schema_dict) for key, schema_dict in schema_definitions.items()}
+    if interner is not None:
+        intern_strings(schemas, interner)
+    return schemas
+
+
+def get_schema_definitions_map(
+    schema_classes: Dict[Type[BaseModel], Type[BaseModel]],
+    model_name_map: "Dict[TypeModelOrEnum, str]",
+    definition_names: Set[str],
+    cache: Optional[SchemaDefinitionsCache] = None,
+    executor: Optional[Executor] = None,
+) -> Dict[Type[BaseModel], SchemaDefinitions]:
+    """Get the JSON schema definitions of several pydantic classes from the
+    cache, or generate them.
+
+    With an `executor`, the classes missing from the cache are split into groups that share no nested
+    models, and the definitions of every group are generated in a separate task. A
+    `ProcessPoolExecutor` requires all classes to be importable by the worker processes, i.e. defined
+    at module level. The result does not depend on the executor.
+
+    Args:
+        schema_classes: A map of the classes used to generate the JSON schemas to their pydantic classes.
+        model_name_map: A map of model classes to definition names.
+        definition_names: All definition names of `model_name_map`.
+        cache: The cache of generated JSON schema definitions, if any.
+        executor: The executor used to generate the definitions of independent classes in parallel, if any.
+
+    Returns:
+        A map of the classes used to generate the JSON schemas to their definitions, in the order of
+            `schema_classes`.
+    """
+    if executor is None:
+        return {
+            schema_class: get_schema_definitions(
+                model,
+                schema_class,
+                model_name_map=model_name_map,
+                definition_names=definition_names,
+                cache=cache,
+            )
+            for schema_class, model in schema_classes.items()
+        }
+
+    entries: Dict[Type[BaseModel], SchemaDefinitions] = {}
+    missing_classes: List[Type[BaseModel]] = []
+    for schema_class, model in schema_classes.items():
+        entry = None
+        if cache is not None:
+            entry = cache.get(
+                model,
+                REF_PREFIX,
+                getattr(model, SCHEMA_NAME_ATTRIBUTE, None),
+                name=model_name_map[schema_class],
+                definition_names=definition_names,
+            )
+        if entry is None:
+            missing_classes.append(schema_class)
+        else:
+            entries[schema_class] = entry
+
+    futures = []
+    for group, flat_models in _group_schema_classes(missing_classes):
+        nested_names = [
+            (flat_model, model_name_map[flat_model])
+            for flat_model in flat_models
+            if flat_model not in schema_classes or schema_classes[flat_model] is flat_model
+        ]
+        if isinstance(executor, ProcessPoolExecutor):
+            models = [(schema_classes[schema_class], model_name_map[schema_class]) for schema_class in group]
+            future = executor.submit(_create_process_group_schema_definitions, models, nested_names)
+        else:
+            group_classes = [(schema_class, model_name_map[schema_class]) for schema_class in group]
+            future = executor.submit(_create_group_schema_definitions, group_classes, nested_names)
+        futures.append((group, future))
+    for group, future in futures:
+        for schema_class, definitions in zip(group, future.result()):
+            model = schema_classes[schema_class]
+            entry = _create_schema_definitions_entry(model_name_map[schema_class], definitions)
+            if cache is not None:
+                cache.set(model, REF_PREFIX, getattr(model, SCHEMA_NAME_ATTRIBUTE, None), entry)
+            entries[schema_class] = entry
+    return {schema_class: entries[schema_class] for schema_class in schema_classes}
+
+
+def get_schema_definitions(
+    model: Type[BaseModel],
+    schema_class: Type[BaseModel],
+    model_name_map: "Dict[TypeModelOrEnum, str]",
+    definition_names: Set[str],
+    cache: Optional[SchemaDefinitionsCache] = None,
+) -> SchemaDefinitions:
+    """Get the JSON schema definitions of a single pydantic class from the
+    cache, or generate them.
+
+    Args:
+        model: Pydantic model class.
+        schema_class: The class used to generate the JSON schema of `model`.
+        model_name_map: A map of model classes to definition names.
+        definition_names: All definition names of `model_name_map`.
+        cache: The cache of generated JSON schema definitions, if any.
+
+    Returns:
+        The definitions of the class and its nested models.
+    """
+    name = model_name_map[schema_class]
+    schema_name = getattr(model, SCHEMA_NAME_ATTRIBUTE, None)
+    if cache is not None:
+        entry = cache.get(model, REF_PREFIX, schema_name, name=name, definition_names=definition_names)
+        if entry is not None:
+            return entry
+    definitions = create_schema_definitions(schema_class, model_name_map=model_name_map)
+    entry = _create_schema_definitions_entry(name, definitions)
+    if cache is not None:
+        cache.set(model, REF_PREFIX, schema_name, entry)
+    return entry
+
+
+def create_schema_definitions(
+    schema_class: Type[BaseModel], model_name_map: "Dict[TypeModelOrEnum, str]"
+) -> Dict[str, Dict[str, Any]]:
+    """Generate the JSON schema definitions of a single pydantic class.
+
+    This produces the same definitions `pydantic.schema.schema` produces for the class, given the same
+    `model_name_map`.
+
+    Args:
+        schema_class: Pydantic model class.
+        model_name_map: A map of model classes to definition names.
+
+    Returns:
+        A map of definition names to JSON schema dicts, with the definitions of the nested models first.
+    """
+    model_schema, definitions, _ = model_process_schema(
+        schema_class, model_name_map=model_name_map, ref_prefix=REF_PREFIX
+    )
+    definitions[model_name_map[schema_class]] = model_schema
+    return definitions
+
+
+def _create_schema_definitions_entry(name: str, definitions: Dict[str, Dict[str, Any]]) -> SchemaDefinitions:
+    return SchemaDefinitions(
+        name=name, nested_names=frozenset(key for key in definitions if key != name), definitions=definitions
+    )
+
+
+def _group_schema_classes(
+    schema_classes: List[Type[BaseModel]],
+) -> "List[Tuple[List[Type[BaseModel]], Set[TypeModelOrEnum]]]":
+    """Split pydantic classes into groups that share no nested models.
+
+    Args:
+        schema_classes: Pydantic model classes.
+
+    Returns:
+        A list of (classes, flat models) pairs, the classes of every group keep the order of `schema_classes`
+            and the groups are ordered by their first class.
+    """
+    groups: "Dict[int, Tuple[List[Type[BaseModel]], Set[TypeModelOrEnum]]]" = {}
+    group_indexes: "Dict[TypeModelOrEnum, int]" = {}
+    for index, schema_class in enumerate(schema_classes):
+        classes = [schema_class]
+        flat_models = get_flat_models_from_model(schema_class)
+        for group_index in sorted({group_indexes[model] for model in flat_models if model in group_indexes}):
+            group_classes, group_models = groups.pop(group_index)
+            classes = group_classes + classes
+            flat_models |= group_models
+        for model in flat_models:
+            group_indexes[model] = index
+        groups[index] = (classes, flat_models)
+    positions = {schema_class: position for position, schema_class in enumerate(schema_classes)}
+    return sorted(
+        ((sorted(classes, key=positions.__getitem__), flat_models) for classes, flat_models in groups.values()),
+        key=lambda group: positions[group[0][0]],
+    )
+
+
+def _create_group_schema_definitions(
+    schema_classes: List[Tuple[Type[BaseModel], str]], nested_names: "List[Tuple[TypeModelOrEnum, str]]"
+) -> List[Dict[str, Dict[str, Any]]]:
+    """Generate the JSON schema definitions of a group of pydantic classes.
+
+    This runs in the tasks submitted to the executor, with the classes created by the registry of the build.
+
+    Args:
+        schema_classes: The classes used to generate the JSON schemas and their definition names.
+        nested_names: The definition names of the models nested in the classes.
+
+    Returns:
+        The definitions of every class, in the order of `schema_classes`.
+    """
+    model_name_map: "Dict[TypeModelOrEnum, str]" = dict(nested_names)
+    model_name_map.update(schema_classes)
+    return [
+        create_schema_definitions(schema_class, model_name_map=model_name_map) for schema_class, _ in schema_classes
+    ]
+
+
+def _create_process_group_schema_definitions(
+    models: List[Tuple[Type[BaseModel], str]], nested_names: "List[Tuple[TypeModelOrEnum, str]]"
+) -> List[Dict[str, Dict[str, Any]]]:
+    """Generate the JSON schema definitions of a group of pydantic classes
+    in a worker process.
+
+    The classes created by the registry of the build cannot be pickled, so the arguments are the pydantic
+    classes, and the worker gets their subclasses from its own process-wide registry. Each worker creates a
+    subclass once, and reuses it in later tasks.
+
+    Args:
+        models: The pydantic classes and their definition names.
+        nested_names: The definition names of the models nested in the classes.
+
+    Returns:
+        The definitions of every class, in the order of `models`.
+    """
+    schema_classes = [(schema_name_registry.get_schema_class(model, name), name) for model, name in models]
+    return _create_group_schema_definitions(schema_classes, nested_names)
+
+
+def _iter_schema_children(obj: Any) -> Iterable[Tuple[Any, Any]]:
+    """Iterate over the children of `obj` that can hold a `Schema`.
+
+    Args:
+        obj: Any value of the OpenAPI document.
+
+    Returns:
+        An iterable of (key, child) pairs, the key being a field name, list index or dict key.
+    """
+    if isinstance(obj, BaseModel):
+        fields_set = obj.__fields_set__
+        return ((field, getattr(obj, field)) for field in get_schema_fields(type(obj)) if field in fields_set)
+    if isinstance(obj, list):
+        return enumerate(obj)
+    if isinstance(obj, dict):
+        return obj.items()
+    return ()
+
+
+def _set_child(obj: Any, key: Any, value: Any) -> None:
+    if isinstance(obj, BaseModel):
+        setattr(obj, key, value)
+    else:
+        obj[key] = value
+
+
+def _copy_with_updates(obj: Any, updates: Dict[Any, Any]) -> Any:
+    if not updates:
+        return obj
+    if isinstance(obj, BaseModel):
+        return obj.copy(update=updates)
+    copied_obj = obj.copy()
+    for key, value in updates.items():
+        copied_obj[key] = value
+    return copied_obj
+
+
+def _create_reference(
+    pydantic_schema: OpenAPI310PydanticSchema, ref_class: Type[v3_1_0.Reference], references: References
+) -> v3_1_0.Reference:
+    reference = ref_class(ref=create_ref_prefix(pydantic_schema.schema_class))
+    references.setdefault(pydantic_schema.schema_class, []).append(reference)
+    return reference
+
+
+def _run_walk(walk: Generator[None, None, W]) -> W:
+    """Run a walk of the document to completion.
+
+    Args:
+        walk: A generator created by one of the `_walk_*` functions.
+
+    Returns:
+        The return value of the walk.
+    """
+    while True:
+        try:
+            next(walk)
+        except StopIteration as stop:
+            return cast("W", stop.value)
+
+
+def _extract_references(obj: Any, ref_class: Type[v3_1_0.Reference], references: References) -> int:
+    return _run_walk(_walk_extract_references(obj, ref_class=ref_class, references=references))
+
+
+def _copy_on_write(obj: Any, ref_class: Type[v3_1_0.Reference], references: References) -> Tuple[Any, int]:
+    return _run_walk(_walk_copy_on_write(obj, ref_class=ref_class, references=references))
+
+
+def _walk_extract_references(
+    obj: Any, ref_class: Type[v3_1_0.Reference], references: References, budget: int = 0
+) -> Generator[None, None, int]:
+    """Replace all Pydantic Models in `obj` with $references, in place.
+
+    Args:
+        obj: Any value of the OpenAPI document.
+        ref_class: The class used for the $references.
+        references: The map to which the pydantic schema classes and their $references are added.
+        budget: If positive, the generator yields after every `budget` visited containers, so that the walk
+            can be interleaved with other work.
+
+    Returns:
+        The number of visited containers.
+    """
+    stack = [obj]
+    nodes = 0
+    while stack:
+        current = stack.pop()
+        nodes += 1
+        if budget and nodes % budget == 0:
+            yield
+        for key, child_obj in _iter_schema_children(current):
+            if isinstance(child_obj, OpenAPI310PydanticSchema):
+                _set_child(current, key, _create_reference(child_obj, ref_class=ref_class, references=references))
+            elif isinstance(child_obj, (BaseModel, list, dict)):
+                stack.append(child_obj)
+    return nodes
+
+
+def _walk_copy_on_write(
+    obj: Any, ref_class: Type[v3_1_0.Reference], references: References, budget: int = 0
+) -> Generator[None, None, Tuple[Any, int]]:
+    """Return `obj` with all Pydantic Models replaced with $references,
+    copying only the containers that change.
+
+    The document is traversed depth first with an explicit stack of frames, each holding a container,
+    its key in the parent container, an iterator over its children and the replaced children.
+
+    Args:
+        obj: Any value of the OpenAPI document.
+        ref_class: The class used for the $references.
+        references: The map to which the pydantic schema classes and their $references are added.
+        budget: If positive, the generator yields after every `budget` visited containers, so that the walk
+            can be interleaved with other work.
+
+    Returns:
+        A tuple of `obj` itself if it contains no Pydantic Models, otherwise a shallow copy of it, and the
+            number of visited containers.
+    """
+    frames: List[Tuple[Any, Any, Iterator[Tuple[Any, Any]], Dict[Any, Any]]] = [
+        (obj, None, iter(_iter_schema_children(obj)), {})
+    ]
+    nodes = 1
+    while True:
+        current, key, children, updates = frames[-1]
+        for child_key, child_obj in children:
+            if isinstance(child_obj, OpenAPI310PydanticSchema):
+                updates[child_key] = _create_reference(child_obj, ref_class=ref_class, references=references)
+            elif isinstance(child_obj, (BaseModel, list, dict)):
+                frames.append((child_obj, child_key, iter(_iter_schema_children(child_obj)), {}))
+                nodes += 1
+                if budget and nodes % budget == 0:
+                    yield
+                break
+        else:
+            frames.pop()
+            copied_obj = _copy_with_updates(current, updates)
+            if not frames:
+                return copied_obj, nodes
+            if copied_obj is not current:
+                frames[-1][3][key] = copied_obj
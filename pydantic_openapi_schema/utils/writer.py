@@ -0,0 +1,405 @@
+import asyncio
+import math
+import re
+from json.encoder import encode_basestring_ascii
+from operator import itemgetter
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    BinaryIO,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from pydantic import BaseModel
+
+from pydantic_openapi_schema.utils.serializer import (
+    _SEQUENCE_TYPES,
+    _encode_unsupported,
+    _get_field_keys,
+    _is_supported,
+)
+from pydantic_openapi_schema.v3_1_0.compact import CompactModel
+
+_SCALAR = 0
+_MAPPING = 1
+_SEQUENCE = 2
+
+_END = object()
+
+_PLAIN_YAML = re.compile(r"[A-Za-z_/][A-Za-z0-9_./ -]*(?<! )\Z")
+_RESERVED_YAML = frozenset(("true", "false", "yes", "no", "on", "off", "y", "n", "null"))
+_YAML_ESCAPE = re.compile('[\x00-\x1f"\\\\\x7f-\x9f\u2028\u2029\ud800-\udfff\ufffe\uffff]')
+_YAML_ESCAPES = {
+    "\n": "\\n",
+    "\t": "\\t",
+    "\r": "\\r",
+    '"': '\\"',
+    "\\": "\\\\",
+    "\u2028": "\\L",
+    "\u2029": "\\P",
+}
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+"""The number of characters written at a time."""
+
+
+class _Frame:
+    """An object, dict or list whose items are being written."""
+
+    __slots__ = ("items", "is_mapping", "level", "first")
+
+    def __init__(self, items: Iterable[Any], is_mapping: bool, level: int) -> None:
+        self.items = iter(items)
+        self.is_mapping = is_mapping
+        self.level = level
+        self.first = True
+
+
+class _ChunkWriter:
+    """Walker of a document that writes it in chunks, without recursion.
+
+    Objects are written like by `to_dict`, i.e. with the values that are not `None`, by alias, in the order
+    of `json(by_alias=True, exclude_none=True)`. Other values are converted with the `__json_encoder__` of the
+    class of the document. Subclasses write the tokens of a format.
+    """
+
+    def __init__(self, obj: BaseModel, chunk_size: int) -> None:
+        self.root = obj
+        self.default = type(obj).__json_encoder__
+        self.chunk_size = chunk_size
+        self.parts: List[str] = []
+        self.size = 0
+        self.stack: List[_Frame] = []
+
+    def iter_chunks(self) -> Iterator[bytes]:
+        self.write_root()
+        stack = self.stack
+        while stack:
+            frame = stack[-1]
+            item = next(frame.items, _END)
+            if item is _END:
+                stack.pop()
+                self.write_end(frame)
+            else:
+                self.write_item(frame, item)
+                frame.first = False
+            if self.size >= self.chunk_size:
+                yield self.flush()
+        self.write_end(None)
+        if self.parts:
+            yield self.flush()
+
+    def write(self, text: str) -> None:
+        self.parts.append(text)
+        self.size += len(text)
+
+    def flush(self) -> bytes:
+        chunk = "".join(self.parts).encode("utf-8")
+        self.parts = []
+        self.size = 0
+        return chunk
+
+    def resolve(self, value: Any) -> Tuple[int, Any]:
+        """Get the kind of a value, and the items of objects, dicts and
+        lists or the value of scalars."""
+        while True:
+            if isinstance(value, BaseModel):
+                if _is_supported(type(value)):
+                    return _MAPPING, _get_model_items(value)
+                value = _encode_unsupported(value)
+            elif isinstance(value, dict):
+                return _MAPPING, value.items()
+            elif isinstance(value, (list, tuple)):
+                return _SEQUENCE, value
+            elif isinstance(value, _SEQUENCE_TYPES):
+                return _SEQUENCE, list(value)
+            elif value is None or isinstance(value, (str, int, float)):
+                return _SCALAR, value
+            else:
+                value = self.default(value)
+
+    def write_root(self) -> None:
+        raise NotImplementedError
+
+    def write_item(self, frame: _Frame, item: Any) -> None:
+        raise NotImplementedError
+
+    def write_end(self, frame: Optional[_Frame]) -> None:
+        raise NotImplementedError
+
+
+class _JSONWriter(_ChunkWriter):
+    """Writer of JSON, formatted like by `json.dumps` with the default
+    separators and `ensure_ascii`."""
+
+    def __init__(self, obj: BaseModel, chunk_size: int, indent: Optional[int]) -> None:
+        super().__init__(obj, chunk_size)
+        self.indent = None if indent is None else " " * indent
+
+    def write_root(self) -> None:
+        self.write_value(self.root, 0)
+
+    def write_item(self, frame: _Frame, item: Any) -> None:
+        if self.indent is not None:
+            self.write(("\n" if frame.first else ",\n") + self.indent * frame.level)
+        elif not frame.first:
+            self.write(", ")
+        if frame.is_mapping:
+            key, item = item
+            self.write(encode_basestring_ascii(_to_key(key)) + ": ")
+        self.write_value(item, frame.level)
+
+    def write_value(self, value: Any, level: int) -> None:
+        kind, value = self.resolve(value)
+        if kind == _SCALAR:
+            self.write(_to_json_scalar(value))
+        elif not value:
+            self.write("{}" if kind == _MAPPING else "[]")
+        else:
+            self.write("{" if kind == _MAPPING else "[")
+            self.stack.append(_Frame(value, kind == _MAPPING, level + 1))
+
+    def write_end(self, frame: Optional[_Frame]) -> None:
+        if frame is None:
+            return
+        if self.indent is not None:
+            self.write("\n" + self.indent * (frame.level - 1))
+        self.write("}" if frame.is_mapping else "]")
+
+
+class _YAMLWriter(_ChunkWriter):
+    """Writer of YAML in block style, indented by 2 spaces."""
+
+    def write_root(self) -> None:
+        kind, value = self.resolve(self.root)
+        if kind == _SCALAR:
+            self.write(_to_yaml_scalar(value))
+        elif not value:
+            self.write("{}" if kind == _MAPPING else "[]")
+        else:
+            self.stack.append(_Frame(value, kind == _MAPPING, 0))
+
+    def write_item(self, frame: _Frame, item: Any) -> None:
+        if not frame.first:
+            self.write("\n" + " " * frame.level)
+        if frame.is_mapping:
+            key, item = item
+            self.write(_to_yaml_string(_to_key(key)) + ":")
+        else:
+            self.write("-")
+        kind, value = self.resolve(item)
+        if kind == _SCALAR:
+            self.write(" " + _to_yaml_scalar(value))
+        elif not value:
+            self.write(" {}" if kind == _MAPPING else " []")
+        elif frame.is_mapping:
+            self.write("\n" + " " * (frame.level + 2))
+            self.stack.append(_Frame(value, kind == _MAPPING, frame.level + 2))
+        else:
+            self.write(" ")
+            self.stack.append(_Frame(value, kind == _MAPPING, frame.level + 2))
+
+    def write_end(self, frame: Optional[_Frame]) -> None:
+        if frame is None:
+            self.write("\n")
+
+
+def iter_json(obj: BaseModel, indent: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Serialize an OpenAPI document to JSON in chunks.
+
+    The output is the same as `obj.json(by_alias=True, exclude_none=True, indent=indent).encode()`, but the
+    document is walked while the chunks are consumed, so that no copy of the whole document is built. The
+    document must not be changed until the last chunk is read.
+
+    Args:
+        obj: A pydantic object, usually a `v3_1_0.OpenAPI`.
+        indent: The number of spaces nested values are indented by, or `None` to write one line.
+        chunk_size: The approximate number of characters per chunk.
+
+    Returns:
+        An iterator over the chunks of the JSON document, encoded in UTF-8.
+    """
+    return _JSONWriter(obj, chunk_size, indent).iter_chunks()
+
+
+def iter_yaml(obj: BaseModel, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Serialize an OpenAPI document to YAML in chunks.
+
+    The document is written in block style with the keys and values of
+    [iter_json][pydantic_openapi_schema.utils.writer.iter_json], in the same order. Strings that could be read
+    as another type are quoted.
+
+    Args:
+        obj: A pydantic object, usually a `v3_1_0.OpenAPI`.
+        chunk_size: The approximate number of characters per chunk.
+
+    Returns:
+        An iterator over the chunks of the YAML document, encoded in UTF-8.
+    """
+    return _YAMLWriter(obj, chunk_size).iter_chunks()
+
+
+def write_json(
+    obj: BaseModel,
+    target: Union[str, Path, BinaryIO],
+    indent: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Write an OpenAPI document to a file as JSON, in chunks.
+
+    Args:
+        obj: A pydantic object, usually a `v3_1_0.OpenAPI`.
+        target: The path of the file, or a binary file object to write to.
+        indent: The number of spaces nested values are indented by, or `None` to write one line.
+        chunk_size: The approximate number of characters written at a time.
+
+    Returns:
+        The number of bytes written.
+    """
+    return _write_chunks(iter_json(obj, indent=indent, chunk_size=chunk_size), target)
+
+
+def write_yaml(obj: BaseModel, target: Union[str, Path, BinaryIO], chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Write an OpenAPI document to a file as YAML, in chunks.
+
+    Args:
+        obj: A pydantic object, usually a `v3_1_0.OpenAPI`.
+        target: The path of the file, or a binary file object to write to.
+        chunk_size: The approximate number of characters written at a time.
+
+    Returns:
+        The number of bytes written.
+    """
+    return _write_chunks(iter_yaml(obj, chunk_size=chunk_size), target)
+
+
+async def aiter_json(
+    obj: BaseModel, indent: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """Serialize an OpenAPI document to JSON in chunks, for the body of a
+    streaming HTTP response.
+
+    Control is given back to the event loop after every chunk.
+
+    Args:
+        obj: A pydantic object, usually a `v3_1_0.OpenAPI`.
+        indent: The number of spaces nested values are indented by, or `None` to write one line.
+        chunk_size: The approximate number of characters per chunk.
+
+    Yields:
+        The chunks of [iter_json][pydantic_openapi_schema.utils.writer.iter_json].
+    """
+    for chunk in iter_json(obj, indent=indent, chunk_size=chunk_size):
+        yield chunk
+        await asyncio.sleep(0)
+
+
+async def aiter_yaml(obj: BaseModel, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Serialize an OpenAPI document to YAML in chunks, for the body of a
+    streaming HTTP response.
+
+    Control is given back to the event loop after every chunk.
+
+    Args:
+        obj: A pydantic object, usually a `v3_1_0.OpenAPI`.
+        chunk_size: The approximate number of characters per chunk.
+
+    Yields:
+        The chunks of [iter_yaml][pydantic_openapi_schema.utils.writer.iter_yaml].
+    """
+    for chunk in iter_yaml(obj, chunk_size=chunk_size):
+        yield chunk
+        await asyncio.sleep(0)
+
+
+def _write_chunks(chunks: Iterator[bytes], target: Union[str, Path, BinaryIO]) -> int:
+    if isinstance(target, (str, Path)):
+        with open(target, "wb") as file:
+            return _write_chunks(chunks, file)
+    size = 0
+    for chunk in chunks:
+        target.write(chunk)
+        size += len(chunk)
+    return size
+
+
+def _get_model_items(obj: BaseModel) -> List[Tuple[str, Any]]:
+    """Get the keys and values of an object like `to_dict`, without
+    converting the values."""
+    field_keys = _get_field_keys(type(obj))
+    extra_index = len(field_keys)
+    items: List[Tuple[int, str, Any]] = []
+    for name, value in obj.__dict__.items():
+        if value is not None:
+            index, key = field_keys.get(name, (extra_index, name))
+            items.append((index, key, value))
+    if isinstance(obj, CompactModel):
+        items.sort(key=itemgetter(0))
+    return [(key, value) for _, key, value in items]
+
+
+def _to_key(key: Any) -> str:
+    """Convert a dict key like `json.dumps`."""
+    if isinstance(key, str):
+        return key
+    if isinstance(key, float):
+        return _to_json_scalar(key)
+    if key is True or key is False or key is None:
+        return _to_json_scalar(key)
+    if isinstance(key, int):
+        return int.__repr__(key)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def _to_json_scalar(value: Any) -> str:
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, int):
+        return int.__repr__(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "Infinity" if value > 0 else "-Infinity"
+    return float.__repr__(value)
+
+
+def _to_yaml_scalar(value: Any) -> str:
+    if isinstance(value, str):
+        return _to_yaml_string(value)
+    if isinstance(value, float):
+        if math.isnan(value):
+            return ".nan"
+        if math.isinf(value):
+            return ".inf" if value > 0 else "-.inf"
+        text = float.__repr__(value)
+        return text if "." in text else text.replace("e", ".0e")
+    return _to_json_scalar(value)
+
+
+def _to_yaml_string(value: str) -> str:
+    """Write a string as a plain scalar if it cannot be read as another
+    type, otherwise as a double-quoted scalar."""
+    if _PLAIN_YAML.match(value) and value.lower() not in _RESERVED_YAML:
+        return value
+    return '"' + _YAML_ESCAPE.sub(_escape_yaml, value) + '"'
+
+
+def _escape_yaml(match: "re.Match[str]") -> str:
+    char = match.group()
+    escape = _YAML_ESCAPES.get(char)
+    if escape is not None:
+        return escape
+    code = ord(char)
+    return f"\\x{code:02x}" if code < 0x100 else f"\\u{code:04x}"
@@ -24,7 +24,7 @@ from .operation import Operation
 from .parameter import Parameter
 from .path_item import PathItem
 from .paths import Paths
-from .reference import Reference
+from .reference import Reference, dispatch_references
 from .request_body import RequestBody
 from .response import Response
 from .responses import Responses
@@ -39,6 +39,12 @@ from .xml import XML
 # resolve forward references
 Encoding.update_forward_refs(Header=Header)
 Schema.update_forward_refs()
+Operation.update_forward_refs(PathItem=PathItem, Reference=Reference)
+Components.update_forward_refs(PathItem=PathItem, Reference=Reference)
+
+# validate the `Union[Reference, X]` fields in one step
+for _model in (Components, Encoding, Header, MediaType, OpenAPI, Operation, Parameter, PathItem, Response, Schema):
+    dispatch_references(_model)
 
 __all__ = [
     "Callback",
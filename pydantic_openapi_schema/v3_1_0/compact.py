@@ -0,0 +1,153 @@
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Set, Type, TypeVar
+
+from pydantic import BaseModel, root_validator
+
+if TYPE_CHECKING:
+    from pydantic.typing import ReprArgs, TupleGenerator
+
+Model = TypeVar("Model", bound="CompactModel")
+
+
+class CompactModel(BaseModel):
+    """Base class of models with many optional fields, of which few are set.
+
+    The `__dict__` of a pydantic object holds a value for every field, e.g. the 52 fields of `Schema`, even
+    though most of them are `None`. A `CompactModel` only stores the values that are not `None` of the fields
+    that default to `None`. The other fields are read from their default, and are added back whenever
+    pydantic reads all values, so attribute access, `dict()`, `json()`, `repr()`, comparison and copies behave
+    like those of a `BaseModel`.
+
+    The values are dropped by a root validator, so the root validators of subclasses only get the stored
+    values. The stored values are kept in the order of the fields, so that serialization with `exclude_none`
+    or `exclude_defaults` reads them directly. Other serialization, `repr()` and comparison first add the
+    `None` values to a copy of the stored values, which makes them somewhat slower than for a `BaseModel`.
+    """
+
+    @root_validator(skip_on_failure=True, allow_reuse=True)
+    def _drop_none_values(cls: Type[BaseModel], values: Dict[str, Any]) -> Dict[str, Any]:
+        return _get_compact_values(cls, values)
+
+    def _copy_and_set_values(self: "Model", values: Dict[str, Any], fields_set: Set[str], *, deep: bool) -> "Model":
+        instance = super()._copy_and_set_values(values, fields_set, deep=deep)
+        object.__setattr__(instance, "__dict__", _get_compact_values(type(instance), instance.__dict__))
+        return instance
+
+    def _iter(
+        self,
+        to_dict: bool = False,
+        by_alias: bool = False,
+        include: Any = None,
+        exclude: Any = None,
+        exclude_unset: bool = False,
+        exclude_defaults: bool = False,
+        exclude_none: bool = False,
+    ) -> "TupleGenerator":
+        instance = self if exclude_none or exclude_defaults else self._expand()
+        return super(CompactModel, instance)._iter(
+            to_dict=to_dict,
+            by_alias=by_alias,
+            include=include,
+            exclude=exclude,
+            exclude_unset=exclude_unset,
+            exclude_defaults=exclude_defaults,
+            exclude_none=exclude_none,
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        stored = name in self.__dict__
+        super().__setattr__(name, value)
+        if not stored:
+            sort_values(type(self), self.__dict__)
+
+    def __iter__(self) -> "TupleGenerator":
+        yield from _get_expanded_values(self).items()
+
+    def __repr_args__(self) -> "ReprArgs":
+        return [
+            (name, value)
+            for name, value in _get_expanded_values(self).items()
+            if name not in self.__fields__ or self.__fields__[name].field_info.repr
+        ]
+
+    if not TYPE_CHECKING:
+
+        def __getattr__(self, name: str) -> Any:
+            if name in get_compact_fields(type(self)):
+                return None
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def _expand(self) -> "CompactModel":
+        """Create a shallow copy that stores the values of all fields, like a
+        `BaseModel`."""
+        expanded = self.__class__.__new__(self.__class__)
+        object.__setattr__(expanded, "__dict__", _get_expanded_values(self))
+        object.__setattr__(expanded, "__fields_set__", self.__fields_set__)
+        return expanded
+
+
+@lru_cache(maxsize=256)
+def get_compact_fields(model_class: Type[BaseModel]) -> FrozenSet[str]:
+    """Get the fields whose `None` values are not stored.
+
+    Args:
+        model_class: Pydantic model class.
+
+    Returns:
+        The names of the fields that default to `None`, if `model_class` is a `CompactModel`, otherwise an
+            empty set.
+    """
+    if not issubclass(model_class, CompactModel):
+        return frozenset()
+    return frozenset(
+        name
+        for name, field in model_class.__fields__.items()
+        if not field.required and field.default is None and field.default_factory is None
+    )
+
+
+def sort_values(model_class: Type[BaseModel], values: Dict[str, Any]) -> None:
+    """Sort the stored values of a `CompactModel` in place, in the order of
+    the fields, followed by the extra values.
+
+    Args:
+        model_class: Pydantic model class.
+        values: The stored values, e.g. the `__dict__` of an object.
+    """
+    positions = _get_field_positions(model_class)
+    extra_position = len(positions)
+    last_position = -1
+    for name in values:
+        position = positions.get(name, extra_position)
+        if position < last_position:
+            break
+        last_position = position
+    else:
+        return
+    items = sorted(values.items(), key=lambda item: positions.get(item[0], extra_position))
+    values.clear()
+    values.update(items)
+
+
+def _get_compact_values(model_class: Type[BaseModel], values: Dict[str, Any]) -> Dict[str, Any]:
+    compact_fields = get_compact_fields(model_class)
+    compact_values = {name: value for name, value in values.items() if value is not None or name not in compact_fields}
+    return compact_values if len(compact_values) < len(values) else values
+
+
+def _get_expanded_values(instance: CompactModel) -> Dict[str, Any]:
+    """Get the values of all fields of an object, in the order of the fields,
+    followed by the extra values."""
+    values = _get_field_template(type(instance)).copy()
+    values.update(instance.__dict__)
+    return values
+
+
+@lru_cache(maxsize=256)
+def _get_field_template(model_class: Type[BaseModel]) -> Dict[str, Any]:
+    return dict.fromkeys(model_class.__fields__)
+
+
+@lru_cache(maxsize=256)
+def _get_field_positions(model_class: Type[BaseModel]) -> Dict[str, int]:
+    return {name: position for position, name in enumerate(model_class.__fields__)}
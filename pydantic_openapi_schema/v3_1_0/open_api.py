@@ -2,6 +2,8 @@ from typing import Dict, List, Optional, Union
 
 from pydantic import BaseModel, Extra
 
+from pydantic_openapi_schema import json_backend
+
 from .components import Components
 from .external_documentation import ExternalDocumentation
 from .info import Info
@@ -89,3 +91,4 @@ class OpenAPI(BaseModel):
 
     class Config:
         extra = Extra.ignore
+        json_loads = json_backend.loads
@@ -1,6 +1,10 @@
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Tuple, Type, cast
 
-from pydantic import BaseModel, Extra, Field
+from pydantic import BaseConfig, BaseModel, Extra, Field, ValidationError
+from pydantic.fields import SHAPE_SINGLETON, ModelField
+
+REF_KEY = "$ref"
 
 
 class Reference(BaseModel):
@@ -35,3 +39,184 @@ class Reference(BaseModel):
         schema_extra = {
             "examples": [{"$ref": "#/components/schemas/Pet"}, {"$ref": "Pet.json"}, {"$ref": "definitions.json#/Pet"}]
         }
+
+
+class ReferenceUnionField(NamedTuple):
+    keys: Tuple[str, ...]
+    """The keys of the field in the input data: its alias and, if allowed, its name."""
+
+    shape: int
+    """The pydantic shape of the field, the `Union` is the field itself, or its item or value type."""
+
+    ref_model: Type[BaseModel]
+    """The member of the `Union` used for values with a `$ref` key."""
+
+    ref_keys: FrozenSet[str]
+    """The keys of the `$ref` field of `ref_model`."""
+
+    model: Optional[Type[BaseModel]]
+    """The member of the `Union` used for values without a `$ref` key, if any."""
+
+    ref_index: int
+    """The position of `ref_model` in the members of the `Union`."""
+
+    model_index: Optional[int]
+    """The position of `model` in the members of the `Union`, if any."""
+
+    def require_ref(
+        self, cls: Any, value: Any, values: Dict[str, Any], field: ModelField, config: Type[BaseConfig]
+    ) -> Any:
+        """Validator of `ref_model` in the `Union`, that rejects the dicts
+        without a `$ref` key.
+
+        It is called by pydantic before the validators of the member, with their arguments.
+
+        Args:
+            cls: The pydantic class being validated.
+            value: A value of the `Union`.
+            values: The values of the previous fields.
+            field: The pydantic field of the member.
+            config: The config of the pydantic class.
+
+        Raises:
+            ValidationError: Without errors, if `value` belongs to `model`, so that pydantic moves on to the
+                next member without reporting this one.
+
+        Returns:
+            The value.
+        """
+        if isinstance(value, dict) and self.ref_keys.isdisjoint(value):
+            raise ValidationError([], self.ref_model)
+        return value
+
+    def reject_ref(
+        self, cls: Any, value: Any, values: Dict[str, Any], field: ModelField, config: Type[BaseConfig]
+    ) -> Any:
+        """Validator of `model` in the `Union`, that rejects the dicts with a
+        `$ref` key.
+
+        It is called by pydantic before the validators of the member, with their arguments.
+
+        Args:
+            cls: The pydantic class being validated.
+            value: A value of the `Union`.
+            values: The values of the previous fields.
+            field: The pydantic field of the member.
+            config: The config of the pydantic class.
+
+        Raises:
+            ValidationError: Without errors, if `value` belongs to `ref_model`.
+
+        Returns:
+            The value.
+        """
+        if isinstance(value, dict) and not self.ref_keys.isdisjoint(value):
+            raise ValidationError([], self.ref_model)
+        return value
+
+
+@lru_cache(maxsize=256)
+def get_reference_union_fields(model_class: Type[BaseModel]) -> Tuple[ReferenceUnionField, ...]:
+    """Find the fields of a pydantic class that are (lists or dicts of)
+    unions with a member that has a `$ref` field, e.g. `Union[Reference,
+    Schema]`.
+
+    Args:
+        model_class: A pydantic class, usually one of the `v3_1_0` models.
+
+    Returns:
+        The fields, in the order of declaration.
+    """
+    union_fields = []
+    for name, field in model_class.__fields__.items():
+        union_field: Optional[ModelField] = field
+        if field.shape != SHAPE_SINGLETON:
+            union_field = field.sub_fields[0] if field.sub_fields else None
+        if union_field is None or union_field.shape != SHAPE_SINGLETON or not union_field.sub_fields:
+            continue
+        members: Dict[Type[BaseModel], int] = {
+            sub_field.type_: index
+            for index, sub_field in enumerate(union_field.sub_fields)
+            if sub_field.shape == SHAPE_SINGLETON
+            and isinstance(sub_field.type_, type)
+            and issubclass(sub_field.type_, BaseModel)
+        }
+        ref_fields = {member: _get_ref_field(member) for member in members}
+        ref_members = [(member, ref_field) for member, ref_field in ref_fields.items() if ref_field is not None]
+        if not ref_members:
+            continue
+        ref_model, ref_field = ref_members[0]
+        model = next((member for member in members if not _requires_ref(ref_fields[member])), None)
+        keys = (field.alias, name) if model_class.__config__.allow_population_by_field_name else (field.alias,)
+        union_fields.append(
+            ReferenceUnionField(
+                keys=tuple(dict.fromkeys(keys)),
+                shape=field.shape,
+                ref_model=ref_model,
+                ref_keys=frozenset(
+                    (ref_field.alias, ref_field.name)
+                    if ref_model.__config__.allow_population_by_field_name
+                    else (ref_field.alias,)
+                ),
+                model=model,
+                ref_index=members[ref_model],
+                model_index=None if model is None else members[model],
+            )
+        )
+    return tuple(union_fields)
+
+
+def dispatch_references(model_class: Type[BaseModel]) -> None:
+    """Make the `Union[Reference, X]` fields of a pydantic class validate a
+    dict as one member only.
+
+    pydantic tries the members of a `Union` in order, so `Union[Reference, Schema]` validates every schema as
+    a `Reference` first, and `Union[Schema, Reference]` turns a `$ref` into an empty `Schema`. Instead, a
+    check is added in front of the validators of both members: dicts with a `$ref` key are only validated as
+    `ref_model`, other dicts only as `model`. The check fails the other member at once, before any nested
+    object is validated, with an empty error, so that the errors of the field are those of its member. The
+    member itself is still validated by pydantic, so the validation of nested objects does not add frames to
+    the stack, and values that are not dicts are validated as before.
+
+    The forward references of the class must be resolved first. Subclasses inherit the checks, unless they
+    declare the fields again.
+
+    Args:
+        model_class: A pydantic class, usually one of the `v3_1_0` models.
+    """
+    fields_by_alias = {field.alias: field for field in model_class.__fields__.values()}
+    for reference_union_field in get_reference_union_fields(model_class):
+        if (
+            reference_union_field.model_index is None
+            or reference_union_field.model_index == reference_union_field.ref_index
+        ):
+            continue
+        field = fields_by_alias[reference_union_field.keys[0]]
+        union_field = field if field.shape == SHAPE_SINGLETON else cast(List[ModelField], field.sub_fields)[0]
+        members = cast(List[ModelField], union_field.sub_fields)
+        checks = (
+            (members[reference_union_field.ref_index], reference_union_field.require_ref),
+            (members[reference_union_field.model_index], reference_union_field.reject_ref),
+        )
+        for member, check in checks:
+            if not _has_check(member, check):
+                member.validators.insert(0, check)
+
+
+def _has_check(member: ModelField, check: Any) -> bool:
+    """Check whether a check of `dispatch_references` is installed on a
+    member, comparing the union fields by value as they are created again
+    once they are evicted from the cache."""
+    return any(
+        getattr(validator, "__func__", None) is check.__func__
+        and getattr(validator, "__self__", None) == check.__self__
+        for validator in member.validators
+    )
+
+
+def _get_ref_field(model_class: Type[BaseModel]) -> Optional[ModelField]:
+    return next((field for field in model_class.__fields__.values() if field.alias == REF_KEY), None)
+
+
+def _requires_ref(ref_field: Optional[ModelField]) -> bool:
+    return ref_field is not None and bool(ref_field.required)
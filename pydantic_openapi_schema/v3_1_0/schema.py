@@ -1,14 +1,15 @@
 from typing import Any, Dict, List, Optional, Union
 
-from pydantic import BaseModel, Extra, Field
+from pydantic import Extra, Field
 
+from .compact import CompactModel
 from .discriminator import Discriminator
 from .external_documentation import ExternalDocumentation
 from .reference import Reference
 from .xml import XML
 
 
-class Schema(BaseModel):
+class Schema(CompactModel):
     """The Schema Object allows the definition of input and output data types.
     These types can be objects, but also primitives and arrays. This object is
     a superset of the [JSON Schema Specification Draft
@@ -0,0 +1,57 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from pydantic_openapi_schema.utils import (
+    AsyncOpenAPIBuilder,
+    BuildProfiler,
+    OpenAPIBuilder,
+    construct_open_api_with_schema_class,
+)
+from pydantic_openapi_schema.v3_1_0 import OpenAPI
+from tests.v3_1_0.utils import (
+    Customer,
+    Owner,
+    SimplePingRequest,
+    SimplePingResponse,
+    create_open_api,
+)
+
+
+@pytest.mark.parametrize("copy_on_write", [True, False])
+def test_async_build_matches_sync_build(copy_on_write: bool) -> None:
+    open_api = create_open_api(SimplePingRequest, SimplePingResponse, Owner)
+    builder = AsyncOpenAPIBuilder(OpenAPIBuilder(copy_on_write=copy_on_write, cache=None), yield_every=2)
+
+    result = asyncio.run(builder.build(open_api))
+
+    assert result == construct_open_api_with_schema_class(open_api, cache=None)
+    assert builder.builder.schema_classes == {SimplePingRequest, SimplePingResponse, Owner}
+
+
+def test_concurrent_builds_are_coalesced() -> None:
+    profiler = BuildProfiler()
+    builder = AsyncOpenAPIBuilder(OpenAPIBuilder(cache=None, profiler=profiler), yield_every=1)
+    open_api = create_open_api(SimplePingRequest, Owner, Customer)
+    ticks: List[int] = []
+
+    async def tick() -> None:
+        while True:
+            ticks.append(len(ticks))
+            await asyncio.sleep(0)
+
+    async def main() -> List[OpenAPI]:
+        ticker = asyncio.ensure_future(tick())
+        cancelled = asyncio.ensure_future(builder.build(open_api))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        results = await asyncio.gather(*(builder.build(open_api) for _ in range(5)))
+        ticker.cancel()
+        return list(results)
+
+    results = asyncio.run(main())
+
+    assert all(result is results[0] for result in results)
+    assert [stats.name for stats in profiler.phases].count("generate") == 1
+    assert len(ticks) > 1
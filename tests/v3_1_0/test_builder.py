@@ -0,0 +1,99 @@
+from typing import List, Type
+
+from pydantic import BaseModel, Field
+
+from pydantic_openapi_schema.utils import (
+    OpenAPIBuilder,
+    construct_open_api_with_schema_class,
+)
+from pydantic_openapi_schema.utils.utils import OpenAPI310PydanticSchema
+from pydantic_openapi_schema.v3_1_0 import (
+    Info,
+    MediaType,
+    OpenAPI,
+    Operation,
+    PathItem,
+    RequestBody,
+    Response,
+)
+from tests.v3_1_0.utils import PingRequest as RenamedPingRequest
+
+
+class Pet(BaseModel):
+    """A pet."""
+
+    name: str = Field(description="name of the pet")
+
+
+class Owner(BaseModel):
+    """A pet owner."""
+
+    name: str
+    pets: List[Pet]
+
+
+def create_open_api(**paths: Type[BaseModel]) -> OpenAPI:
+    return OpenAPI(
+        info=Info(title="My own API", version="v0.0.1"),
+        paths={
+            f"/{path}": PathItem(
+                post=Operation(
+                    requestBody=RequestBody(
+                        content={
+                            "application/json": MediaType(
+                                media_type_schema=OpenAPI310PydanticSchema(schema_class=model)
+                            )
+                        }
+                    ),
+                    responses={"200": Response(description="pong")},
+                )
+            )
+            for path, model in paths.items()
+        },
+    )
+
+
+def test_builder_matches_construct_open_api_with_schema_class() -> None:
+    open_api = create_open_api(pet=Pet, owner=Owner, ping=RenamedPingRequest)
+    assert OpenAPIBuilder().build(open_api) == construct_open_api_with_schema_class(open_api)
+
+
+def test_builder_reuses_schemas_of_unchanged_classes() -> None:
+    builder = OpenAPIBuilder()
+    first = builder.build(create_open_api(pet=Pet, ping=RenamedPingRequest))
+    second = builder.build(create_open_api(pet=Pet, ping=RenamedPingRequest, owner=Owner))
+
+    assert first.components and first.components.schemas
+    assert second.components and second.components.schemas
+    assert list(second.components.schemas) == ["Pet", "Owner", "RenamedPingRequest"]
+    assert second.components.schemas["Pet"] is first.components.schemas["Pet"]
+    assert second.components.schemas["RenamedPingRequest"] is first.components.schemas["RenamedPingRequest"]
+    assert builder.schema_classes == {Pet, Owner, RenamedPingRequest}
+    assert second == construct_open_api_with_schema_class(
+        create_open_api(pet=Pet, ping=RenamedPingRequest, owner=Owner)
+    )
+
+
+def test_builder_regenerates_replaced_classes() -> None:
+    builder = OpenAPIBuilder()
+    first = builder.build(create_open_api(pet=Pet))
+
+    class Pet2(Pet):
+        age: int
+
+    Pet2.__name__ = "Pet"
+    second = builder.build(create_open_api(pet=Pet2))
+
+    assert first.components and first.components.schemas
+    assert second.components and second.components.schemas
+    assert second.components.schemas["Pet"] is not first.components.schemas["Pet"]
+    assert second.components.schemas["Pet"].properties and "age" in second.components.schemas["Pet"].properties
+    assert builder.schema_classes == {Pet2}
+
+
+def test_builder_drops_classes_that_are_no_longer_referenced() -> None:
+    builder = OpenAPIBuilder()
+    builder.build(create_open_api(pet=Pet, owner=Owner))
+    open_api = create_open_api()
+    assert builder.build(open_api) is open_api
+    assert not builder.schema_classes
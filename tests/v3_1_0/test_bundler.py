@@ -0,0 +1,220 @@
+import gc
+import json
+import threading
+import time
+import weakref
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+import pytest
+from pydantic import create_model
+
+from pydantic_openapi_schema.utils.bundler import (
+    Bundler,
+    ParsedFileCache,
+    bundle,
+    fetch_file,
+    fetch_url,
+)
+from pydantic_openapi_schema.utils.ref_index import ReferenceIndex
+from pydantic_openapi_schema.v3_1_0 import OpenAPI, Reference
+
+PET = {
+    "type": "object",
+    "properties": {
+        "category": {"$ref": "../definitions.json#/Category"},
+        "tag": {"$ref": "#/definitions/Tag"},
+        "owner": {"$ref": "../openapi.json#/components/schemas/Owner"},
+    },
+    "definitions": {"Tag": {"type": "string"}},
+}
+
+DEFINITIONS = {
+    "Category": {"type": "object", "properties": {"parent": {"$ref": "#/Category"}}},
+    "Error": {"type": "object", "properties": {"message": {"type": "string"}}},
+    "Problem": {"$ref": "#/Error"},
+    "Loop": {"$ref": "#/Loop"},
+}
+
+RESPONSES_YAML = """
+NotFound:
+  description: Not found
+  content:
+    application/json:
+      schema:
+        $ref: definitions.json#/Problem
+"""
+
+
+def create_open_api(pet_ref: str = "schemas/Pet.json") -> Dict[str, Any]:
+    return {
+        "openapi": "3.1.0",
+        "info": {"title": "Bundle", "version": "1.0.0"},
+        "paths": {
+            "/pets": {
+                "get": {
+                    "responses": {
+                        "200": {
+                            "description": "OK",
+                            "content": {"application/json": {"schema": {"$ref": pet_ref}}},
+                        },
+                        "404": {"$ref": "responses.yaml#/NotFound"},
+                        "default": {"$ref": "#/components/responses/Error"},
+                    }
+                }
+            },
+            "/stores": {"$ref": "paths/stores.json"},
+        },
+        "components": {
+            "schemas": {"Owner": {"type": "string"}},
+            "responses": {
+                "Error": {
+                    "description": "Error",
+                    "content": {"application/json": {"schema": {"$ref": "definitions.json#/Error"}}},
+                }
+            },
+        },
+    }
+
+
+def write_files(directory: Path, files: Dict[str, Any]) -> None:
+    for name, content in files.items():
+        path = directory / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content if isinstance(content, str) else json.dumps(content))
+
+
+@pytest.fixture()
+def spec_dir(tmp_path: Path) -> Path:
+    stores = {"get": {"responses": {"200": {"description": "OK"}}}}
+    write_files(
+        tmp_path,
+        {
+            "openapi.json": create_open_api(),
+            "schemas/Pet.json": PET,
+            "definitions.json": DEFINITIONS,
+            "responses.yaml": RESPONSES_YAML,
+            "paths/stores.json": stores,
+        },
+    )
+    return tmp_path
+
+
+@pytest.fixture()
+def server_url(spec_dir: Path) -> Iterator[str]:
+    handler = partial(SimpleHTTPRequestHandler, directory=str(spec_dir))
+    handler.log_message = lambda *args: None  # type: ignore[attr-defined]
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)  # type: ignore[arg-type]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def assert_bundled(open_api: Any) -> None:
+    components = open_api.components
+    assert set(components.schemas) == {"Owner", "Pet", "Category", "Tag", "Error"}
+    assert set(components.responses) == {"Error", "NotFound"}
+    assert set(components.pathItems) == {"stores"}
+    response = open_api.paths["/pets"].get.responses["200"]
+    assert response.content["application/json"].media_type_schema == Reference(ref="#/components/schemas/Pet")
+    pet = components.schemas["Pet"]
+    assert pet.properties["category"].ref == "#/components/schemas/Category"
+    assert pet.properties["tag"].ref == "#/components/schemas/Tag"
+    assert pet.properties["owner"].ref == "#/components/schemas/Owner"
+    category = components.schemas["Category"]
+    assert category.properties["parent"].ref == "#/components/schemas/Category"
+    not_found = components.responses["NotFound"]
+    assert not_found.content["application/json"].media_type_schema.ref == "#/components/schemas/Error"
+    assert open_api.paths["/pets"].get.responses["404"].ref == "#/components/responses/NotFound"
+    assert open_api.paths["/stores"].ref == "#/components/pathItems/stores"
+    assert components.pathItems["stores"].get.responses["200"].description == "OK"
+    assert ReferenceIndex(open_api).unresolved == {}
+
+
+def test_bundle_files(spec_dir: Path) -> None:
+    assert_bundled(bundle(spec_dir / "openapi.json"))
+
+
+def test_bundle_http(server_url: str) -> None:
+    assert_bundled(Bundler(fetcher=fetch_url).bundle(server_url + "openapi.json"))
+    with pytest.raises(ValueError, match="only local files"):
+        bundle(server_url + "openapi.json")
+
+
+def test_bundle_cache(spec_dir: Path) -> None:
+    write_files(spec_dir, {"copy/Pet.json": PET, "copy.json": create_open_api("copy/Pet.json")})
+    fetched = []
+    cache = ParsedFileCache()
+
+    def fetch(uri: str) -> bytes:
+        fetched.append(uri)
+        return fetch_file(uri)
+
+    bundler = Bundler(fetcher=fetch, cache=cache)
+    assert_bundled(bundler.bundle(spec_dir / "openapi.json"))
+    assert len(fetched) == len(set(fetched)) == 5
+    assert (cache.hits, cache.misses) == (0, 5)
+    bundler.bundle(spec_dir / "openapi.json")
+    assert (cache.hits, cache.misses) == (5, 5)
+    open_api = bundler.bundle(spec_dir / "copy.json")
+    assert (cache.hits, cache.misses) == (10, 6)
+    assert open_api.components is not None and open_api.components.schemas is not None
+    assert set(open_api.components.schemas) == {"Owner", "Owner2", "Pet", "Category", "Tag", "Error"}
+    assert open_api.components.schemas["Pet"].properties["owner"].ref == "#/components/schemas/Owner2"  # type: ignore
+
+
+def test_bundle_concurrent(tmp_path: Path) -> None:
+    count = 16
+    open_api = {
+        "openapi": "3.1.0",
+        "info": {"title": "Bundle", "version": "1.0.0"},
+        "paths": {f"/{index}": {"$ref": f"paths/{index}.json"} for index in range(count)},
+    }
+    files = {f"paths/{index}.json": {"summary": str(index)} for index in range(count)}
+    write_files(tmp_path, {"openapi.json": open_api, **files})
+    lock = threading.Lock()
+    active = []
+    concurrency = [0]
+
+    def fetch(uri: str) -> bytes:
+        with lock:
+            active.append(uri)
+            concurrency[0] = max(concurrency[0], len(active))
+        time.sleep(0.02)
+        with lock:
+            active.remove(uri)
+        return fetch_file(uri)
+
+    bundled = Bundler(fetcher=fetch, max_workers=4).bundle(str(tmp_path / "openapi.json"))
+    assert concurrency[0] == 4
+    assert bundled.components is not None and bundled.components.pathItems is not None
+    assert [(name, path_item.summary) for name, path_item in bundled.components.pathItems.items()] == [
+        (str(index), str(index)) for index in range(count)
+    ]
+    assert bundled.paths["/3"].ref == "#/components/pathItems/3"
+
+
+def test_bundle_errors(spec_dir: Path) -> None:
+    for ref, error, match in [
+        ("definitions.json#/Missing", KeyError, "Missing"),
+        ("definitions.json#/Loop", ValueError, "circular"),
+        ("missing.json", FileNotFoundError, "missing.json"),
+    ]:
+        write_files(spec_dir, {"openapi.json": create_open_api(ref)})
+        with pytest.raises(error, match=match):
+            bundle(spec_dir / "openapi.json")
+
+
+def test_bundle_does_not_keep_released_classes(tmp_path: Path) -> None:
+    write_files(tmp_path, {"openapi.json": {"openapi": "3.1.0", "info": {"title": "Bundle", "version": "1.0.0"}}})
+    model_classes = [create_model("ExtendedOpenAPI", __base__=OpenAPI) for _ in range(300)]
+    for model_class in model_classes:
+        assert isinstance(Bundler(model_class=model_class).bundle(tmp_path / "openapi.json"), model_class)
+    first = weakref.ref(model_classes[0])
+    del model_classes, model_class
+    gc.collect()
+    assert first() is None
@@ -0,0 +1,102 @@
+import gc
+from typing import Any, Dict
+
+import pytest
+from pydantic import BaseModel, create_model
+from typing_extensions import Literal
+
+from pydantic_openapi_schema.utils.builder import OpenAPIBuilder
+from pydantic_openapi_schema.utils.cache import (
+    SchemaDefinitionsCache,
+    schema_definitions_cache,
+)
+from pydantic_openapi_schema.utils.utils import construct_open_api_with_schema_class
+from tests.v3_1_0.utils import PingRequest as RenamedPingRequest
+from tests.v3_1_0.utils import SimplePingRequest, SimplePingResponse, create_open_api
+
+
+def test_cache_hits_and_misses() -> None:
+    cache = SchemaDefinitionsCache()
+    open_api = create_open_api(SimplePingRequest, RenamedPingRequest)
+
+    first = construct_open_api_with_schema_class(open_api, cache=cache)
+    assert cache.info() == (0, 2, 4096, 2)
+
+    second = construct_open_api_with_schema_class(open_api, cache=cache)
+    assert cache.info() == (2, 2, 4096, 2)
+    assert first == second == construct_open_api_with_schema_class(open_api, cache=None)
+
+    cache.clear()
+    assert cache.info() == (0, 0, 4096, 0)
+
+
+def test_cache_is_opt_in() -> None:
+    schema_definitions_cache.clear()
+    construct_open_api_with_schema_class(create_open_api(SimplePingRequest))
+    OpenAPIBuilder().build(create_open_api(SimplePingRequest))
+    assert schema_definitions_cache.info() == (0, 0, 4096, 0)
+
+
+def test_cache_evicts_least_recently_used_entries() -> None:
+    cache = SchemaDefinitionsCache(maxsize=2)
+    construct_open_api_with_schema_class(create_open_api(SimplePingRequest, SimplePingResponse), cache=cache)
+    construct_open_api_with_schema_class(create_open_api(SimplePingRequest), cache=cache)
+    construct_open_api_with_schema_class(create_open_api(RenamedPingRequest), cache=cache)
+    assert len(cache) == 2
+
+    construct_open_api_with_schema_class(create_open_api(SimplePingRequest), cache=cache)
+    assert cache.info().hits == 2
+    construct_open_api_with_schema_class(create_open_api(SimplePingResponse), cache=cache)
+    assert cache.info().hits == 2
+
+
+def test_cache_does_not_keep_models_alive() -> None:
+    cache = SchemaDefinitionsCache()
+    model = create_model("DynamicModel", value=(int, ...))
+    construct_open_api_with_schema_class(create_open_api(model), cache=cache)
+    assert len(cache) == 1
+
+    del model
+    gc.collect()
+    assert len(cache) == 0
+
+
+def test_cache_is_not_used_when_definition_names_change() -> None:
+    cache = SchemaDefinitionsCache()
+
+    class Nested(BaseModel):
+        value: int
+
+    class Other(BaseModel):
+        value: str
+
+    Other.__name__ = "Nested"
+    parent = create_model("Parent", nested=(Nested, ...))
+    other_parent = create_model("OtherParent", nested=(Other, ...))
+
+    result = construct_open_api_with_schema_class(create_open_api(parent), cache=cache)
+    assert result.components and result.components.schemas
+    assert "Nested" in result.components.schemas
+
+    result = construct_open_api_with_schema_class(create_open_api(parent, other_parent), cache=cache)
+    assert cache.info().hits == 0
+    assert result.components and result.components.schemas
+    assert "Nested" not in result.components.schemas
+
+
+@pytest.mark.parametrize("trusted", [False, True])
+def test_cached_definitions_are_not_shared(trusted: bool) -> None:
+    cache = SchemaDefinitionsCache()
+    model = create_model("Config", cfg=(Dict[str, Any], {"k": 1}), kind=(Literal["a", "b"], "a"))
+    open_api = create_open_api(model)
+    for _ in range(2):
+        result = construct_open_api_with_schema_class(open_api, cache=cache, trusted=trusted)
+        assert result.components is not None and result.components.schemas is not None
+        schema = result.components.schemas["Config"]
+        assert schema.properties is not None
+        assert schema.properties["cfg"].default == {"k": 1}  # type: ignore[union-attr]
+        schema.properties["cfg"].default["poison"] = 1  # type: ignore[union-attr]
+        schema.properties["kind"].enum.append("c")  # type: ignore[union-attr]
+    assert cache.info().hits == 1
+    result = construct_open_api_with_schema_class(open_api, cache=cache, trusted=trusted)
+    assert result.components.schemas["Config"].properties["kind"].enum == ["a", "b"]  # type: ignore
@@ -0,0 +1,85 @@
+import copy
+import pickle
+
+from pydantic_openapi_schema.utils.trusted import trusted_parse_obj
+from pydantic_openapi_schema.v3_1_0 import Reference, Schema
+from pydantic_openapi_schema.v3_1_0.compact import get_compact_fields
+
+DATA = {
+    "type": "object",
+    "title": "Pet",
+    "properties": {"id": {"type": "integer", "format": "int64"}, "tag": {"$ref": "#/components/schemas/Tag"}},
+}
+
+
+def expand(schema: Schema) -> dict:
+    return {name: getattr(schema, name) for name in Schema.__fields__}
+
+
+def test_schema_stores_set_fields() -> None:
+    schema = Schema.parse_obj(DATA)
+    assert schema.__dict__.keys() == {"type", "title", "properties"}
+    assert schema.properties is not None
+    assert schema.properties["id"].__dict__ == {"type": "integer", "schema_format": "int64"}
+    assert schema.description is None
+    assert schema.__fields_set__ == {"type", "title", "properties"}
+    assert list(dict(schema)) == list(Schema.__fields__)
+    assert len(get_compact_fields(Schema)) == len(Schema.__fields__)
+    assert get_compact_fields(Reference) == frozenset()
+
+
+def test_schema_output_is_unchanged() -> None:
+    schema = Schema.parse_obj(DATA)
+    output = schema.dict()
+    assert list(output) == list(Schema.__fields__)
+    assert output["description"] is None
+    assert output["properties"]["id"] == {
+        **dict.fromkeys(Schema.__fields__),
+        "type": "integer",
+        "schema_format": "int64",
+    }
+    assert schema.dict(by_alias=True, exclude_none=True) == DATA
+    assert schema.json(by_alias=True, exclude_unset=True) == (
+        '{"properties": {"id": {"type": "integer", "format": "int64"}, "tag": {"$ref": "#/components/schemas/Tag"}}, '
+        '"type": "object", "title": "Pet"}'
+    )
+    assert repr(schema).startswith("Schema(allOf=None, anyOf=None, oneOf=None, schema_not=None")
+    assert schema == Schema(**schema.dict())
+    assert schema != Schema(type="object")
+
+
+def test_schema_copies_stay_compact() -> None:
+    schema = Schema.parse_obj(DATA)
+    for copied in (
+        schema.copy(),
+        schema.copy(deep=True),
+        schema.copy(update={"description": "A pet."}),
+        copy.deepcopy(schema),
+        pickle.loads(pickle.dumps(schema)),
+        trusted_parse_obj(Schema, DATA),
+    ):
+        assert len(copied.__dict__) <= 4
+        assert expand(copied) == {**expand(schema), "description": copied.description}
+    assert schema.copy(update={"description": "A pet."}).description == "A pet."
+
+
+def test_schema_attribute_assignment() -> None:
+    schema = Schema(type="string")
+    schema.description = "A name."
+    assert schema.dict(exclude_unset=True) == {"type": "string", "description": "A name."}
+    schema.description = None
+    assert schema.description is None
+    assert schema.dict(exclude_unset=True) == {"type": "string", "description": None}
+
+
+def test_schema_values_keep_field_order() -> None:
+    schema = Schema(type="object", title="Pet")
+    schema.description = "A pet."
+    schema.schema_format = "pet"
+    assert list(schema.__dict__) == ["type", "schema_format", "title", "description"]
+    assert list(schema.dict(exclude_none=True)) == ["type", "schema_format", "title", "description"]
+    assert schema.json(by_alias=True, exclude_defaults=True) == (
+        '{"type": "object", "format": "pet", "title": "Pet", "description": "A pet."}'
+    )
+    trusted = trusted_parse_obj(Schema, {"title": "Pet", "x": 1, "format": "pet", "type": "object"})
+    assert list(trusted.__dict__) == ["type", "schema_format", "title"]
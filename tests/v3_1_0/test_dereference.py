@@ -0,0 +1,148 @@
+from typing import List, Optional
+
+import pytest
+from pydantic import BaseModel
+
+from pydantic_openapi_schema.utils.dereference import Dereferencer, dereference
+from pydantic_openapi_schema.utils.utils import construct_open_api_with_schema_class
+from pydantic_openapi_schema.v3_1_0 import (
+    Components,
+    Info,
+    MediaType,
+    OpenAPI,
+    Operation,
+    PathItem,
+    Reference,
+    Response,
+    Schema,
+)
+from tests.v3_1_0.utils import PATH, create_open_api
+
+
+class Tree(BaseModel):
+    name: str
+    children: List["Tree"] = []
+    parent: Optional["Tree"] = None
+
+
+Tree.update_forward_refs()
+
+
+def create_components_open_api(components: Components) -> OpenAPI:
+    return OpenAPI(info=Info(title="Dereference", version="1.0.0"), paths={}, components=components)
+
+
+def test_dereference_document() -> None:
+    open_api = OpenAPI.parse_file(PATH)
+    expected = open_api.json(by_alias=True, exclude_none=True)
+    dereferenced = dereference(open_api)
+    assert "$ref" not in dereferenced.json(by_alias=True, exclude_none=True)
+    assert open_api.json(by_alias=True, exclude_none=True) == expected
+    assert dereferenced.components is not None and dereferenced.components.schemas is not None
+    pet = dereferenced.components.schemas["Pet"]
+    assert dereferenced.paths["/pet"].put.requestBody.content["application/json"].media_type_schema is pet  # type: ignore
+    assert pet.properties is not None and pet.properties["category"].xml.name == "Category"  # type: ignore[union-attr]
+    assert pet.properties["category"] is dereferenced.components.schemas["Category"]
+
+
+def test_dereference_fan_out() -> None:
+    depth = 60
+    schemas = {
+        f"Level{index}": Schema(
+            allOf=[Reference(ref=f"#/components/schemas/Level{index + 1}") for _ in range(2)],
+            properties={"next": Reference(ref=f"#/components/schemas/Level{index + 1}")},
+        )
+        for index in range(depth)
+    }
+    schemas[f"Level{depth}"] = Schema(type="string")
+    open_api = create_components_open_api(Components(schemas=schemas))
+    assert open_api.components is not None and open_api.components.schemas is not None
+    schemas = open_api.components.schemas
+    dereferencer = Dereferencer(open_api)
+    level = dereferencer.dereference(schemas["Level0"])
+    for _ in range(depth):
+        assert level.allOf[0] is level.allOf[1]
+        assert level.allOf[0] is level.properties["next"]
+        level = level.allOf[0]
+    assert level.type == "string"
+    assert dereferencer.dereference(schemas["Level1"]) is dereferencer.dereference(schemas["Level0"]).allOf[0]
+
+
+@pytest.mark.parametrize("share_cycles", [False, True])
+def test_dereference_cycles(share_cycles: bool) -> None:
+    open_api = construct_open_api_with_schema_class(create_open_api(Tree))
+    dereferenced = dereference(open_api, share_cycles=share_cycles)
+    media_type = dereferenced.paths["/0"].post.requestBody.content["application/json"]  # type: ignore
+    tree = media_type.media_type_schema
+    assert tree.title == "Tree"
+    children, parent = tree.properties["children"].items, tree.properties["parent"]
+    if share_cycles:
+        assert children is parent is tree
+    else:
+        assert children == parent == Reference(ref="#/components/schemas/Tree")
+        assert dereferenced.json(by_alias=True, exclude_none=True).count("$ref") == 4
+
+
+def test_dereference_references() -> None:
+    responses = {
+        "Ok": Response(description="OK", content={"text/plain": MediaType(schema=Schema(type="string"))}),
+        "Alias": Reference(ref="#/components/responses/Ok", description="Alias"),
+        "Loop": Reference(ref="#/components/responses/Loop"),
+    }
+    ok = Reference(ref="#/components/responses/Alias", description="Success")
+    operation = Operation(responses={"200": ok, "201": Reference(ref="#/components/responses/Alias")})
+    open_api = create_components_open_api(Components(responses=responses))
+    open_api.paths["/items"] = PathItem(get=operation)
+    dereferencer = Dereferencer(open_api)
+    dereferenced = dereferencer.dereference(operation)
+    assert dereferenced.responses["200"].description == "Success"
+    assert dereferenced.responses["201"].description == "Alias"
+    assert dereferencer.dereference(responses["Ok"]).description == "OK"
+    assert dereferenced.responses["200"].content is dereferenced.responses["201"].content
+    assert dereferencer.dereference([ok, ok])[1].description == "Success"
+    with pytest.raises(ValueError, match="circular"):
+        dereferencer.dereference(responses["Loop"])
+    with pytest.raises(KeyError):
+        dereferencer.dereference(Reference(ref="responses.json#/Ok"))
+
+
+@pytest.mark.parametrize("plain_first", [False, True])
+def test_dereference_nested_overrides(plain_first: bool) -> None:
+    schemas = {
+        "Outer": Schema(type="array", items=Reference(ref="#/components/schemas/Inner", description="over-inner")),
+        "Inner": Schema(type="string", description="orig-inner"),
+    }
+    open_api = create_components_open_api(Components(schemas=schemas))
+    outer = Reference(ref="#/components/schemas/Outer", description="over-outer")
+    content = {"application/json": MediaType(schema=outer)}
+    if plain_first:
+        content = {"text/plain": MediaType(schema=Reference(ref="#/components/schemas/Outer")), **content}
+    response = Response(description="OK", content=content)
+    open_api.paths["/items"] = PathItem(get=Operation(responses={"200": response}))
+    dereferenced = dereference(open_api).paths["/items"].get.responses["200"].content  # type: ignore
+    schema = dereferenced["application/json"].media_type_schema
+    assert schema.description == "over-outer"
+    assert schema.items.description == "over-inner"
+    if plain_first:
+        plain = dereferenced["text/plain"].media_type_schema
+        assert plain.description is None and plain.items is schema.items
+
+
+def test_dereference_failed_walk_is_not_reused() -> None:
+    schemas = {
+        "Bad": Schema(
+            type="object",
+            properties={
+                "a": Schema(type="string"),
+                "b": Reference(ref="other.json#/X"),
+                "c": Schema(type="integer"),
+            },
+        ),
+        "Uses": Schema(allOf=[Reference(ref="#/components/schemas/Bad")]),
+    }
+    dereferencer = Dereferencer(create_components_open_api(Components(schemas=schemas)))
+    with pytest.raises(KeyError, match="other.json"):
+        dereferencer.dereference(schemas["Bad"])
+    with pytest.raises(KeyError, match="other.json"):
+        dereferencer.dereference(schemas["Uses"])
+    assert dereferencer._copies == {}
@@ -0,0 +1,144 @@
+import copy
+import gc
+import pickle
+import weakref
+
+import pytest
+from pydantic import BaseModel
+
+from pydantic_openapi_schema.utils.hash_consing import (
+    HashConsStats,
+    HashConsTable,
+    get_frozen_class,
+    hash_cons,
+)
+from pydantic_openapi_schema.utils.lazy import lazy_parse_obj
+from pydantic_openapi_schema.utils.utils import construct_open_api_with_schema_class
+from pydantic_openapi_schema.v3_1_0 import MediaType, OpenAPI, Parameter, Schema
+from tests.v3_1_0.utils import (
+    SimplePingRequest,
+    SimplePingResponse,
+    create_open_api,
+    load_document,
+)
+
+
+def test_hash_cons_shares_identical_subtrees() -> None:
+    document = {
+        "type": "object",
+        "properties": {
+            "id": {"type": "integer", "format": "int64"},
+            "parent": {"type": "integer", "format": "int64"},
+            "tags": {"type": "array", "items": {"type": "string"}},
+            "names": {"type": "array", "items": {"type": "string"}},
+            "count": {"type": "integer"},
+            "title": {"type": "integer", "title": None},
+        },
+    }
+    schema = Schema.parse_obj(document)
+    stats = hash_cons(schema)
+    assert stats.nodes == 9
+    assert stats.saved_nodes == 3
+    assert stats.saved_bytes > 0
+    assert schema.properties is not None
+    properties = schema.properties
+    assert properties["id"] is properties["parent"]
+    assert properties["tags"] is properties["names"]
+    assert properties["count"] is not properties["title"]
+    assert schema.dict(by_alias=True, exclude_unset=True) == document
+    assert schema == Schema.parse_obj(document)
+
+
+def test_hash_cons_parameter_and_media_type_trees() -> None:
+    parameters = [
+        Parameter.parse_obj({"name": "limit", "in": "query", "schema": {"type": "integer"}}),
+        Parameter.parse_obj({"name": "limit", "in": "query", "schema": {"type": "integer"}}),
+        Parameter.parse_obj({"name": "offset", "in": "query", "schema": {"type": "integer"}}),
+    ]
+    media_types = [MediaType.parse_obj({"schema": {"$ref": "#/components/schemas/Pet"}}) for _ in range(2)]
+    stats = hash_cons([parameters, media_types])
+    assert stats == HashConsStats(nodes=10, saved_nodes=5, saved_bytes=stats.saved_bytes)
+    assert parameters[0] is parameters[1]
+    assert parameters[2].param_schema is parameters[0].param_schema
+    assert media_types[0] is media_types[1]
+
+
+def test_hash_cons_freezes_shared_objects() -> None:
+    schemas = [Schema.parse_obj({"type": "array", "items": {"type": "string"}}) for _ in range(2)]
+    hash_cons(schemas)
+    shared = schemas[0]
+    assert shared is schemas[1]
+    assert isinstance(shared, Schema)
+    assert type(shared) is get_frozen_class(Schema)
+    assert type(shared).__name__ == "FrozenSchema"
+    assert repr(shared) == repr(Schema.parse_obj({"type": "array", "items": {"type": "string"}}))
+    with pytest.raises(TypeError):
+        shared.title = "Names"
+    with pytest.raises(TypeError):
+        shared.items.title = "Name"  # type: ignore[union-attr]
+
+    copied = shared.copy(deep=True)
+    unpickled = pickle.loads(pickle.dumps(shared))
+    assert copied == unpickled == copy.deepcopy(shared) == shared
+    assert type(unpickled) is type(shared)
+
+    assert type(copied) is Schema and type(copied.items) is Schema
+    copied.title = "Names"
+    copied.items.title = "Name"  # type: ignore[union-attr]
+    assert shared.title is None and shared.items.title is None  # type: ignore[union-attr]
+    shallow = shared.copy(update={"title": "Names"})
+    assert type(shallow) is Schema and shallow.title == "Names"
+    shallow.description = "Tags"
+    assert shallow.items is shared.items and shared.description is None
+
+
+def test_hash_cons_shares_objects_between_documents() -> None:
+    table = HashConsTable()
+    first, second = OpenAPI.parse_obj(load_document()), OpenAPI.parse_obj(load_document())
+    first_stats = hash_cons(first, table)
+    second_stats = hash_cons(second, table)
+    assert first_stats.nodes == second_stats.nodes == second_stats.saved_nodes > first_stats.saved_nodes > 0
+    assert len(table) == first_stats.nodes - first_stats.saved_nodes
+    assert first.components is not None and second.components is not None
+    assert first.components.schemas is not None and second.components.schemas is not None
+    assert first.components.schemas["Pet"] is second.components.schemas["Pet"]
+    assert first == second == OpenAPI.parse_obj(load_document())
+    assert first.json(by_alias=True, exclude_none=True) == OpenAPI.parse_obj(load_document()).json(
+        by_alias=True, exclude_none=True
+    )
+    assert hash_cons(first, table) == HashConsStats(nodes=len(table), saved_nodes=0, saved_bytes=0)
+    table.clear()
+    assert len(table) == 0
+
+
+def test_hash_cons_lazy_document_visits_parsed_entries() -> None:
+    open_api = lazy_parse_obj(OpenAPI, load_document())
+    assert open_api.components is not None and open_api.components.schemas is not None
+    schemas = open_api.components.schemas
+    pet, category = schemas["Pet"], schemas["Category"]
+    hash_cons(open_api)
+    assert pet.properties is not None and category.properties is not None
+    assert pet.properties["id"] is category.properties["id"]
+    assert schemas.parsed_keys == {"Pet", "Category"}  # type: ignore[attr-defined]
+    assert open_api == OpenAPI.parse_obj(load_document())
+
+
+def test_hash_cons_keeps_pydantic_schemas() -> None:
+    open_api = create_open_api(SimplePingRequest, SimplePingRequest, SimplePingResponse)
+    assert hash_cons(open_api) == HashConsStats(nodes=3, saved_nodes=0, saved_bytes=0)
+    assert construct_open_api_with_schema_class(open_api) == construct_open_api_with_schema_class(
+        create_open_api(SimplePingRequest, SimplePingRequest, SimplePingResponse)
+    )
+
+
+def test_frozen_classes_are_released_with_their_classes() -> None:
+    class Item(BaseModel):
+        name: str
+
+    frozen_class = get_frozen_class(Item)
+    assert get_frozen_class(Item) is get_frozen_class(frozen_class) is frozen_class
+    assert type(frozen_class(name="a").copy()) is Item
+    item_class = weakref.ref(Item)
+    del Item, frozen_class
+    gc.collect()
+    assert item_class() is None
@@ -0,0 +1,121 @@
+from typing import Any, Callable
+
+import pytest
+
+from pydantic_openapi_schema.utils.interning import (
+    InternStats,
+    StringInterner,
+    intern_strings,
+)
+from pydantic_openapi_schema.utils.lazy import lazy_parse_obj
+from pydantic_openapi_schema.utils.spec_index import SpecIndex
+from pydantic_openapi_schema.utils.streaming import iter_schemas
+from pydantic_openapi_schema.utils.trusted import trusted_parse_obj
+from pydantic_openapi_schema.utils.utils import construct_open_api_with_schema_class
+from pydantic_openapi_schema.v3_1_0 import OpenAPI, Reference, Schema
+from tests.v3_1_0.utils import (
+    PATH,
+    SimplePingRequest,
+    SimplePingResponse,
+    create_open_api,
+    load_document,
+)
+
+
+def test_intern_strings_shares_strings_between_documents() -> None:
+    interner = StringInterner()
+    first, second = OpenAPI.parse_obj(load_document()), OpenAPI.parse_obj(load_document())
+    first_stats = intern_strings(first, interner)
+    second_stats = intern_strings(second, interner)
+    assert first_stats.strings == second_stats.strings
+    assert first_stats.strings > len(interner) + first_stats.duplicates > len(interner)
+    assert second_stats.duplicates > first_stats.duplicates
+    assert second_stats.saved_bytes > first_stats.saved_bytes > 0
+    assert interner.stats == InternStats(*(a + b for a, b in zip(first_stats, second_stats)))
+    assert first == second == OpenAPI.parse_obj(load_document())
+
+    first_operation, second_operation = first.paths["/pet"].put, second.paths["/pet"].put
+    assert first_operation is not None and second_operation is not None
+    assert first_operation.requestBody is not None and second_operation.requestBody is not None
+    first_keys, second_keys = list(first_operation.responses), list(second_operation.responses)
+    assert all(a is b for a, b in zip(first_keys, second_keys))
+    first_body, second_body = first_operation.requestBody, second_operation.requestBody
+    assert not isinstance(first_body, Reference) and not isinstance(second_body, Reference)
+    assert list(first_body.content)[0] is list(second_body.content)[0]
+    first_ref = first_body.content["application/json"].media_type_schema
+    second_ref = second_body.content["application/json"].media_type_schema
+    assert isinstance(first_ref, Reference) and isinstance(second_ref, Reference)
+    assert first_ref.ref is second_ref.ref
+
+    interner.clear()
+    assert len(interner) == 0
+    assert interner.stats == InternStats(0, 0, 0)
+
+
+def test_intern_strings_skips_unparsed_entries() -> None:
+    open_api = lazy_parse_obj(OpenAPI, load_document())
+    open_api.paths["/pet"]
+    intern_strings(open_api, StringInterner())
+    assert open_api.paths.parsed_keys == {"/pet"}
+
+
+def test_construct_open_api_interner() -> None:
+    interner = StringInterner()
+    first = construct_open_api_with_schema_class(
+        create_open_api(SimplePingRequest, SimplePingResponse), interner=interner
+    )
+    second = construct_open_api_with_schema_class(
+        create_open_api(SimplePingRequest, SimplePingResponse), interner=interner
+    )
+    assert first == construct_open_api_with_schema_class(create_open_api(SimplePingRequest, SimplePingResponse))
+    assert interner.stats.duplicates > 0
+    assert first.components is not None and second.components is not None
+    assert first.components.schemas is not None and second.components.schemas is not None
+    assert all(a is b for a, b in zip(first.components.schemas, second.components.schemas))
+
+
+def test_intern_strings_skips_any_fields() -> None:
+    interner = StringInterner()
+    interner.intern("type")
+    interner.intern("string")
+    key, value = "".join(["ty", "pe"]), "".join(["str", "ing"])
+    payload = {key: value}
+    schema = Schema(type="object", default=payload, example=[payload], properties={key: Schema(type=value)})
+    intern_strings(schema, interner)
+    assert schema.default is payload and schema.example[0] is payload  # type: ignore[index]
+    assert next(iter(payload)) is key and payload[key] is value
+    assert schema.properties is not None and next(iter(schema.properties)) is not key
+    assert schema.properties["type"].type is not value
+
+
+def _load_schemas(loader: str, interner: StringInterner) -> Any:
+    if loader == "iter_schemas":
+        return dict(iter_schemas(PATH, interner=interner))
+    if loader == "SpecIndex":
+        with SpecIndex(PATH, interner=interner) as index:
+            return {name: index.get_schema(name) for name in index.components["schemas"]}
+    parse: Callable[..., OpenAPI] = lazy_parse_obj if loader == "lazy_parse_obj" else trusted_parse_obj
+    components = parse(OpenAPI, load_document(), interner=interner).components
+    assert components is not None and components.schemas is not None
+    return dict(components.schemas)
+
+
+@pytest.mark.parametrize("loader", ["lazy_parse_obj", "trusted_parse_obj", "iter_schemas", "SpecIndex"])
+def test_loaders_intern_strings(loader: str) -> None:
+    interner = StringInterner()
+    first, second = _load_schemas(loader, interner), _load_schemas(loader, interner)
+    assert interner.stats.duplicates > 0
+    first_properties, second_properties = first["Pet"].properties, second["Pet"].properties
+    assert all(a is b for a, b in zip(first_properties, second_properties))
+    assert first_properties["category"].ref is second_properties["category"].ref
+    assert first_properties["name"].type is second_properties["name"].type
+
+
+def test_intern_strings_without_interner() -> None:
+    first, second = OpenAPI.parse_obj(load_document()), OpenAPI.parse_obj(load_document())
+    first_stats = intern_strings(first)
+    assert first_stats.duplicates > 0
+    assert intern_strings(second) == first_stats
+    first_operation, second_operation = first.paths["/pet"].put, second.paths["/pet"].put
+    assert first_operation is not None and second_operation is not None
+    assert all(a is not b for a, b in zip(first_operation.responses, second_operation.responses))
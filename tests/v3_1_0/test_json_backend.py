@@ -0,0 +1,94 @@
+import json
+import sys
+from typing import Any, Iterator
+
+import pytest
+
+from pydantic_openapi_schema import json_backend
+from pydantic_openapi_schema.json_backend import (
+    JSONBackend,
+    OrjsonBackend,
+    get_json_backend,
+    set_json_backend,
+)
+from pydantic_openapi_schema.utils.lazy import lazy_parse_raw
+from pydantic_openapi_schema.utils.serializer import to_json_bytes
+from pydantic_openapi_schema.v3_1_0 import OpenAPI, Schema
+
+PATH = "tests/data/swagger_openapi_v3.0.1.json"
+
+orjson = pytest.importorskip("orjson")
+
+
+@pytest.fixture()
+def restore_backend() -> Iterator[None]:
+    previous = json_backend.json_backend
+    yield
+    set_json_backend(previous)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"title": "Café ☕", "escaped": 'a"b\\c\n ', "nested": [{}, [], None, True, False]},
+        [0.1, 1e16, 1.5e-7, 0.00001234, 123456.789, -0.0, 1e300, 5e-324, 2.5, 100.0, 1e22],
+        {"big": 2**70, "negative": -(2**63) - 1, "max": 2**64 - 1, "small": -(2**63)},
+        {"strings": ["1e5", "0.00001", "2E10"], "number": 7},
+    ],
+)
+@pytest.mark.parametrize("indent", [False, True])
+def test_dumps_byte_compatible(value: Any, indent: bool) -> None:
+    expected = JSONBackend().dumps(value, indent=indent)
+    assert OrjsonBackend().dumps(value, indent=indent) == expected
+    assert json.loads(expected) == value
+
+
+@pytest.mark.parametrize(
+    "data",
+    ['{"a": 12345678901234567890123, "b": -9223372036854775809}', "[NaN, Infinity, 1.5]", '["\\ud800", "é"]'],
+)
+def test_loads_fallback(data: str) -> None:
+    expected = json.dumps(json.loads(data))
+    backend = OrjsonBackend()
+    assert json.dumps(backend.loads(data)) == expected
+    assert json.dumps(backend.loads(data.encode())) == expected
+
+
+@pytest.mark.parametrize("offset", range(-19, 1))
+def test_loads_large_integer_across_chunks(offset: int) -> None:
+    padding = " " * (json_backend._SCAN_CHUNK_SIZE + offset)
+    data = f"[{padding}{2**70}, 1]"
+    backend = OrjsonBackend()
+    assert backend.loads(data) == backend.loads(data.encode()) == [2**70, 1]
+
+
+def test_to_json_bytes() -> None:
+    open_api = OpenAPI.parse_file(PATH)
+    for indent in (False, True):
+        output = to_json_bytes(open_api, indent=indent, backend=JSONBackend())
+        assert to_json_bytes(open_api, indent=indent, backend=OrjsonBackend()) == output
+        assert json.loads(output) == json.loads(open_api.json(by_alias=True, exclude_none=True))
+    schema = Schema(title="Prix €", maximum=1e16, minimum=0.00001)
+    assert to_json_bytes(schema, backend=OrjsonBackend()) == to_json_bytes(schema, backend=JSONBackend())
+    assert to_json_bytes(schema) == '{"maximum":1e+16,"minimum":1e-05,"title":"Prix €"}'.encode()
+
+
+@pytest.mark.usefixtures("restore_backend")
+def test_set_json_backend() -> None:
+    with open(PATH, "rb") as file:
+        data = file.read()
+    set_json_backend("json")
+    expected = OpenAPI.parse_raw(data)
+    assert isinstance(set_json_backend(None), JSONBackend)
+    assert isinstance(json_backend.json_backend, OrjsonBackend)
+    assert OpenAPI.parse_raw(data) == expected
+    assert lazy_parse_raw(OpenAPI, data) == expected
+    with pytest.raises(ValueError, match="unknown JSON backend"):
+        get_json_backend("ujson")
+
+
+def test_get_json_backend_without_orjson(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    assert type(get_json_backend()) is JSONBackend
+    with pytest.raises(ImportError):
+        get_json_backend("orjson")
@@ -0,0 +1,131 @@
+import copy
+import json
+import pickle
+from typing import Any, List
+
+import pytest
+
+from pydantic_openapi_schema.utils import json_cache
+from pydantic_openapi_schema.utils.hash_consing import hash_cons
+from pydantic_openapi_schema.utils.json_cache import JSONCache, cached_json
+from pydantic_openapi_schema.utils.lazy import lazy_parse_file
+from pydantic_openapi_schema.utils.serializer import to_json
+from pydantic_openapi_schema.utils.utils import construct_open_api_with_schema_class
+from pydantic_openapi_schema.v3_1_0 import OpenAPI, PathItem, Schema
+from tests.v3_1_0.utils import (
+    PATH,
+    SimplePingRequest,
+    SimplePingResponse,
+    create_open_api,
+)
+
+
+def count_conversions(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    converted: List[str] = []
+    convert_model = JSONCache._convert_model
+
+    def spy(self: JSONCache, obj: Any) -> Any:
+        converted.append(type(obj).__name__)
+        return convert_model(self, obj)
+
+    monkeypatch.setattr(JSONCache, "_convert_model", spy)
+    return converted
+
+
+def test_get_json_converts_changed_branch(monkeypatch: pytest.MonkeyPatch) -> None:
+    open_api = OpenAPI.parse_file(PATH)
+    cache = JSONCache(open_api)
+    converted = count_conversions(monkeypatch)
+    output = cache.get_json()
+    assert output == to_json(OpenAPI.parse_file(PATH)).encode()
+    assert cache.get_json() is output
+    assert len(converted) > 100
+
+    converted.clear()
+    open_api.info.title = "Pets"
+    assert cache.get_json() == to_json(open_api).encode()
+    assert converted == ["OpenAPI", "Info"]
+    output = cache.get_json()
+    open_api.info.title = "Pets"
+    assert cache.get_json() is output
+
+    converted.clear()
+    assert open_api.components is not None and open_api.components.schemas is not None
+    pet = open_api.components.schemas["Pet"]
+    assert pet.required is not None
+    pet.required.append("status")
+    assert json.loads(cache.get_json())["components"]["schemas"]["Pet"]["required"] == ["name", "photoUrls", "status"]
+    assert converted == ["OpenAPI", "Components", "Schema"]
+
+    converted.clear()
+    open_api.paths["/new"] = PathItem(summary="New")
+    open_api.paths["/new"].description = "A new path"
+    assert json.loads(cache.get_json())["paths"]["/new"] == {"summary": "New", "description": "A new path"}
+    assert converted == ["OpenAPI", "PathItem"]
+    assert cache.get_json() == to_json(open_api).encode()
+
+
+def test_get_json_shared_and_lazy_nodes() -> None:
+    open_api = lazy_parse_file(OpenAPI, PATH)
+    assert open_api.components is not None and open_api.components.schemas is not None
+    pet, category = open_api.components.schemas["Pet"], open_api.components.schemas["Category"]
+    hash_cons(open_api)
+    cache = JSONCache(open_api, indent=2)
+    assert cache.get_json() == to_json(open_api, indent=2).encode()
+    open_api.components.schemas["Name"] = Schema(type="string")
+    assert json.loads(cache.get_json())["components"]["schemas"]["Name"] == {"type": "string"}
+    assert pet.properties is not None and category.properties is not None
+    assert pet.properties["id"] is category.properties["id"]
+    pet.properties["name"] = pet.properties["id"]
+    category.properties["id"] = Schema(type="string")
+    assert cache.get_json() == to_json(open_api, indent=2).encode()
+
+
+def test_get_json_constructed_open_api() -> None:
+    open_api = construct_open_api_with_schema_class(create_open_api(SimplePingRequest, SimplePingResponse))
+    assert cached_json(open_api) == to_json(open_api).encode()
+    open_api.paths["/0"].summary = "Ping"
+    assert cached_json(open_api) == to_json(open_api).encode()
+
+
+def test_cached_json_does_not_change_document() -> None:
+    open_api = OpenAPI.parse_file(PATH)
+    assert open_api.components is not None
+    schemas = open_api.components.schemas
+    assert schemas is not None
+    output = cached_json(open_api)
+    assert type(open_api) is OpenAPI and type(open_api.paths) is dict
+    assert open_api.components.schemas is schemas and type(schemas["Pet"]) is Schema
+    schemas["Added"] = Schema(type="string")
+    assert json.loads(cached_json(open_api))["components"]["schemas"]["Added"] == {"type": "string"}
+    del schemas["Added"]
+    assert cached_json(open_api) == output
+    for copied in (pickle.loads(pickle.dumps(open_api)), copy.deepcopy(open_api)):
+        assert copied == open_api
+
+
+def test_get_json_compares_values_by_identity() -> None:
+    open_api = OpenAPI.parse_file(PATH)
+    cache = JSONCache(open_api)
+    cache.get_json()
+    assert open_api.components is not None and open_api.components.schemas is not None
+    properties = open_api.components.schemas["Pet"].properties
+    assert properties is not None
+    properties["name"] = properties["name"].copy()
+    assert cache.get_json() == to_json(open_api).encode()
+    properties["name"].title = "Name"
+    assert json.loads(cache.get_json())["components"]["schemas"]["Pet"]["properties"]["name"]["title"] == "Name"
+    properties["id"].default = 1
+    assert cache.get_json() == to_json(open_api).encode()
+    properties["id"].default = True
+    assert json.loads(cache.get_json())["components"]["schemas"]["Pet"]["properties"]["id"]["default"] is True
+
+
+def test_cached_json_keeps_recent_documents(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(json_cache, "MAX_CACHED_DOCUMENTS", 2)
+    documents = [OpenAPI.parse_file(PATH) for _ in range(3)]
+    outputs = [cached_json(document) for document in documents]
+    assert cached_json(documents[2]) is outputs[2]
+    assert cached_json(documents[1]) is outputs[1]
+    assert cached_json(documents[0]) is not outputs[0]
+    assert cached_json(documents[0]) == outputs[0]
@@ -0,0 +1,112 @@
+import copy
+import pickle
+
+import pytest
+from pydantic import ValidationError
+
+from pydantic_openapi_schema.utils.lazy import (
+    LazyModelDict,
+    lazy_parse_file,
+    lazy_parse_obj,
+    lazy_parse_raw,
+)
+from pydantic_openapi_schema.v3_1_0 import (
+    Example,
+    OpenAPI,
+    PathItem,
+    Reference,
+    Response,
+    Schema,
+)
+from tests.v3_1_0.test_swagger_openapi_v3 import ExtendedOpenAPI, ExtendedPathItem
+from tests.v3_1_0.utils import PATH, load_document
+
+
+def test_lazy_parse_obj_defers_maps() -> None:
+    open_api = lazy_parse_obj(OpenAPI, load_document())
+    assert isinstance(open_api.paths, LazyModelDict)
+    assert open_api.components is not None
+    assert isinstance(open_api.components.schemas, LazyModelDict)
+    assert open_api.paths.parsed_keys == set()
+    assert "/pet" in open_api.paths
+
+    path_item = open_api.paths["/pet"]
+    assert isinstance(path_item, PathItem)
+    assert open_api.paths["/pet"] is path_item
+    assert open_api.paths.parsed_keys == {"/pet"}
+    assert isinstance(open_api.components.schemas["Pet"], Schema)
+    assert open_api.components.schemas.parsed_keys == {"Pet"}
+
+
+def test_lazy_parse_obj_equals_parse_obj() -> None:
+    document = load_document()
+    for model_class in (OpenAPI, ExtendedOpenAPI):
+        eager = model_class.parse_obj(document)
+        assert lazy_parse_obj(model_class, document) == eager
+        assert lazy_parse_obj(model_class, document).json(by_alias=True) == eager.json(by_alias=True)
+        assert copy.deepcopy(lazy_parse_obj(model_class, document)) == eager
+        assert pickle.loads(pickle.dumps(lazy_parse_obj(model_class, document))) == eager
+    assert isinstance(lazy_parse_obj(ExtendedOpenAPI, document).paths["/pet"], ExtendedPathItem)
+
+
+def test_lazy_parse_obj_dispatches_on_ref() -> None:
+    open_api = lazy_parse_obj(
+        OpenAPI,
+        {
+            "openapi": "3.1.0",
+            "info": {"title": "Test", "version": "1.0.0"},
+            "components": {
+                "examples": {"ref": {"$ref": "#/components/examples/Other"}, "other": {"value": 1}},
+                "responses": {"ok": {"description": "OK"}},
+            },
+        },
+    )
+    assert open_api.components is not None
+    examples = open_api.components.examples
+    assert examples is not None
+    assert examples["ref"] == Reference(ref="#/components/examples/Other")
+    assert examples["other"] == Example(value=1)
+    assert open_api.components.responses == {"ok": Response(description="OK")}
+
+
+def test_lazy_parse_obj_raises_on_access() -> None:
+    open_api = lazy_parse_obj(
+        OpenAPI,
+        {"openapi": "3.1.0", "info": {"title": "Test", "version": "1.0.0"}, "paths": {"/a": {"get": "invalid"}}},
+    )
+    assert open_api.paths is not None
+    with pytest.raises(ValidationError) as error:
+        open_api.paths["/a"]
+    assert error.value.errors()[0]["loc"] == ("paths", "/a", "get")
+    assert open_api.paths.parsed_keys == set()
+
+
+def test_lazy_parse_obj_validates_other_fields() -> None:
+    with pytest.raises(ValidationError):
+        lazy_parse_obj(OpenAPI, {"openapi": "3.1.0", "paths": {}})
+
+
+def test_lazy_model_dict_mutation() -> None:
+    parsed = []
+
+    def parse(key: str, value: int) -> str:
+        parsed.append(key)
+        return str(value)
+
+    lazy = LazyModelDict({"a": 1, "b": 2, "c": 3}, parse)
+    copied = lazy.copy()
+    lazy["a"] = "x"
+    assert lazy.pop("b") == "2"
+    assert lazy.setdefault("c") == "3"
+    lazy.update(d="4")
+    assert parsed == ["b", "c"]
+    assert lazy == {"a": "x", "c": "3", "d": "4"}
+    assert dict(copied) == {"a": "1", "b": "2", "c": "3"}
+
+
+def test_lazy_parse_raw_and_file() -> None:
+    with open(PATH, encoding="utf-8") as file:
+        raw = file.read()
+    eager = OpenAPI.parse_file(PATH)
+    assert lazy_parse_raw(OpenAPI, raw) == eager
+    assert lazy_parse_file(OpenAPI, PATH) == eager
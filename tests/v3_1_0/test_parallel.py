@@ -0,0 +1,81 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Type
+
+import pytest
+from pydantic import BaseModel, create_model
+
+from pydantic_openapi_schema.utils import OpenAPIBuilder
+from pydantic_openapi_schema.utils import registry as registry_module
+from pydantic_openapi_schema.utils.cache import SchemaDefinitionsCache
+from pydantic_openapi_schema.utils.registry import SchemaNameRegistry
+from pydantic_openapi_schema.utils.utils import (
+    _group_schema_classes,
+    construct_open_api_with_schema_class,
+)
+from tests.v3_1_0.utils import Customer, Owner, Pet
+from tests.v3_1_0.utils import PingRequest as RenamedPingRequest
+from tests.v3_1_0.utils import (
+    Shop,
+    SimplePingRequest,
+    SimplePingResponse,
+    Tag,
+    create_open_api,
+)
+
+MODELS = (Owner, SimplePingRequest, Customer, Shop, RenamedPingRequest, Pet, SimplePingResponse)
+
+
+def test_group_schema_classes() -> None:
+    groups = _group_schema_classes([Customer, Owner, SimplePingRequest, Shop])
+    assert [classes for classes, _ in groups] == [[Customer], [Owner, Shop], [SimplePingRequest]]
+    assert groups[1][1] == {Owner, Pet, Tag, Shop}
+
+
+def test_thread_pool_matches_serial() -> None:
+    open_api = create_open_api(*MODELS)
+    serial = construct_open_api_with_schema_class(open_api, cache=None)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        parallel = construct_open_api_with_schema_class(open_api, cache=None, executor=executor)
+    assert parallel.json(by_alias=True, exclude_none=True) == serial.json(by_alias=True, exclude_none=True)
+
+
+def test_thread_pool_creates_renamed_classes_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    created = []
+
+    def count_classes(name: str, **kwargs: Any) -> Type[BaseModel]:
+        created.append(name)
+        return create_model(name, **kwargs)
+
+    monkeypatch.setattr(registry_module, "create_model", count_classes)
+    registry = SchemaNameRegistry()
+    open_api = create_open_api(*MODELS)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for _ in range(2):
+            construct_open_api_with_schema_class(open_api, cache=None, registry=registry, executor=executor)
+    assert created
+    assert len(created) == len(registry)
+
+
+def test_process_pool_matches_serial() -> None:
+    open_api = create_open_api(*MODELS)
+    cache = SchemaDefinitionsCache()
+    serial = construct_open_api_with_schema_class(open_api, cache=None)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        parallel = construct_open_api_with_schema_class(open_api, cache=cache, executor=executor)
+        assert cache.info().currsize == len(MODELS)
+        cached = construct_open_api_with_schema_class(open_api, cache=cache, executor=executor)
+    assert parallel.json(by_alias=True, exclude_none=True) == serial.json(by_alias=True, exclude_none=True)
+    assert cached.json(by_alias=True, exclude_none=True) == serial.json(by_alias=True, exclude_none=True)
+    assert cache.info().hits == len(MODELS)
+
+
+def test_builder_with_executor() -> None:
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        builder = OpenAPIBuilder(cache=None, executor=executor)
+        first = builder.build(create_open_api(Owner, Customer))
+        second = builder.build(create_open_api(Owner, Customer, Shop))
+    expected = construct_open_api_with_schema_class(create_open_api(Owner, Customer, Shop), cache=None)
+    assert first.components is not None and second.components is not None
+    assert second.json(by_alias=True, exclude_none=True) == expected.json(by_alias=True, exclude_none=True)
+    assert first.components.schemas is not None and second.components.schemas is not None
+    assert first.components.schemas["Owner"] is second.components.schemas["Owner"]
@@ -0,0 +1,52 @@
+from typing import List
+
+from pydantic_openapi_schema.utils import OpenAPIBuilder
+from pydantic_openapi_schema.utils.profiling import BuildProfiler, PhaseStats
+from pydantic_openapi_schema.utils.utils import construct_open_api_with_schema_class
+from tests.v3_1_0.utils import (
+    Owner,
+    SimplePingRequest,
+    SimplePingResponse,
+    create_open_api,
+)
+
+
+def test_profiler_records_phases() -> None:
+    exported: List[PhaseStats] = []
+    profiler = BuildProfiler(callback=exported.append)
+    open_api = create_open_api(SimplePingRequest, SimplePingResponse, Owner)
+
+    result = construct_open_api_with_schema_class(open_api, cache=None, profiler=profiler)
+
+    assert result == construct_open_api_with_schema_class(open_api, cache=None)
+    assert exported == profiler.phases
+    assert [stats.name for stats in profiler.phases] == [
+        "copy",
+        "extract",
+        "resolve_names",
+        "create_classes",
+        "generate",
+        "parse",
+    ]
+    phases = {stats.name: stats for stats in profiler.phases}
+    assert phases["extract"].nodes > 3
+    assert phases["extract"].schema_classes == 3
+    assert phases["generate"].schema_classes == 3
+    assert phases["generate"].nodes == phases["parse"].nodes == 5
+    assert all(stats.seconds >= 0 for stats in profiler.phases)
+    assert profiler.seconds == sum(stats.seconds for stats in profiler.phases)
+
+
+def test_profiler_with_copy_on_write_and_builder() -> None:
+    profiler = BuildProfiler()
+    builder = OpenAPIBuilder(copy_on_write=True, cache=None, profiler=profiler)
+    builder.build(create_open_api(SimplePingRequest, Owner))
+    profiler.clear()
+
+    builder.build(create_open_api(SimplePingRequest, Owner, SimplePingResponse))
+
+    phases = {stats.name: stats for stats in profiler.phases}
+    assert "copy" not in phases
+    assert phases["resolve_names"].schema_classes == 3
+    assert phases["generate"].schema_classes == 1
+    assert phases["parse"].nodes == 1
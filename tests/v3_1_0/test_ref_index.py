@@ -0,0 +1,98 @@
+import pytest
+
+from pydantic_openapi_schema.utils.lazy import lazy_parse_file
+from pydantic_openapi_schema.utils.ref_index import ReferenceIndex
+from pydantic_openapi_schema.v3_1_0 import (
+    Info,
+    MediaType,
+    OpenAPI,
+    Operation,
+    PathItem,
+    Reference,
+    RequestBody,
+    Response,
+    Schema,
+)
+
+PATH = "tests/data/swagger_openapi_v3.0.1.json"
+
+
+def create_open_api() -> OpenAPI:
+    return OpenAPI(
+        info=Info(title="Refs", version="1.0.0"),
+        paths={
+            "/a~b/{id}": PathItem(
+                post=Operation(
+                    requestBody=Reference(ref="#/components/requestBodies/New%20Item"),
+                    responses={
+                        "200": Response(
+                            description="OK",
+                            content={
+                                "application/json": MediaType(schema=Reference(ref="#/components/schemas/Item/items"))
+                            },
+                        ),
+                    },
+                )
+            ),
+            "/external": PathItem(ref="paths.json#/external", summary="External"),
+        },
+    )
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_resolve_and_referrers(lazy: bool) -> None:
+    open_api = lazy_parse_file(OpenAPI, PATH) if lazy else OpenAPI.parse_file(PATH)
+    index = ReferenceIndex(open_api)
+    assert open_api.components is not None and open_api.components.schemas is not None
+    pet = open_api.components.schemas["Pet"]
+    assert index.resolve("#/components/schemas/Pet") is pet
+    assert "#/components/schemas/Category" in index
+    assert len(index) == 6
+    assert index.unresolved == {}
+    location = "/paths/~1pet~1{petId}/get/responses/200/content/application~1json/schema"
+    assert location in index.get_referrers(pet)
+    assert index.get_referrers(pet) == index.get_referrers("#/components/schemas/Pet")
+    assert len(index.get_referrers(pet)) == 10
+    assert index.get_ref(location) == "#/components/schemas/Pet"
+    assert index.get_referrers(open_api.info) == []
+    with pytest.raises(KeyError):
+        index.resolve("#/components/schemas/Missing")
+
+
+def test_add_component() -> None:
+    open_api = create_open_api()
+    index = ReferenceIndex(open_api)
+    assert index.unresolved == {
+        "#/components/requestBodies/New%20Item": ["/paths/~1a~0b~1{id}/post/requestBody"],
+        "#/components/schemas/Item/items": ["/paths/~1a~0b~1{id}/post/responses/200/content/application~1json/schema"],
+        "paths.json#/external": ["/paths/~1external"],
+    }
+
+    item = Schema(
+        type="array", items=Schema(type="object", properties={"tag": Reference(ref="#/components/schemas/Tag")})
+    )
+    items = item.items
+    index.add_component("schemas", "Item", item)
+    assert index.resolve("#/components/schemas/Item/items") is items
+    assert index.get_referrers(items) == ["/paths/~1a~0b~1{id}/post/responses/200/content/application~1json/schema"]
+    assert index.get_referrers("#/components/schemas/Tag") == ["/components/schemas/Item/items/properties/tag"]
+    assert index.get("#/components/schemas/Tag") is None
+
+    tag = Schema(type="string")
+    request_body = RequestBody(
+        content={"application/json": MediaType(schema=Reference(ref="#/components/schemas/Tag"))}
+    )
+    index.add_component("schemas", "Tag", tag)
+    index.add_component("requestBodies", "New Item", request_body)
+    assert open_api.components is not None and open_api.components.requestBodies == {"New Item": request_body}
+    assert index.resolve("#/components/requestBodies/New%20Item") is request_body
+    assert index.get_referrers(tag) == [
+        "/components/schemas/Item/items/properties/tag",
+        "/components/requestBodies/New Item/content/application~1json/schema",
+    ]
+    assert list(index.unresolved) == ["paths.json#/external"]
+
+    index.add_component("schemas", "Item", Schema(type="string"))
+    assert index.get("#/components/schemas/Item/items") is None
+    assert index.get_referrers(tag) == ["/components/requestBodies/New Item/content/application~1json/schema"]
+    assert sorted(index.unresolved) == ["#/components/schemas/Item/items", "paths.json#/external"]
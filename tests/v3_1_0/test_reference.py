@@ -0,0 +1,167 @@
+from typing import Any, Callable, Dict, Iterable, Type
+
+import pytest
+from pydantic import BaseModel, ValidationError
+from pydantic.fields import SHAPE_SINGLETON, ModelField
+
+from pydantic_openapi_schema import v3_1_0
+from pydantic_openapi_schema.v3_1_0 import (
+    Components,
+    MediaType,
+    OpenAPI,
+    Operation,
+    Parameter,
+    PathItem,
+    Reference,
+    Schema,
+)
+from pydantic_openapi_schema.v3_1_0.reference import (
+    ReferenceUnionField,
+    dispatch_references,
+    get_reference_union_fields,
+)
+
+
+def test_every_reference_union_is_dispatched() -> None:
+    models = [getattr(v3_1_0, name) for name in v3_1_0.__all__]
+    dispatched = [
+        model
+        for model in models
+        if isinstance(model, type) and issubclass(model, BaseModel) and get_reference_union_fields(model)
+    ]
+    assert {model.__name__ for model in dispatched} >= {
+        "Components",
+        "Encoding",
+        "Header",
+        "MediaType",
+        "OpenAPI",
+        "Operation",
+        "Parameter",
+        "PathItem",
+        "Response",
+        "Schema",
+    }
+    for model in dispatched:
+        assert not model.__config__.smart_union
+        for union_field in get_reference_union_fields(model):
+            if union_field.model_index is None or union_field.model_index == union_field.ref_index:
+                continue
+            field = next(field for field in model.__fields__.values() if field.alias == union_field.keys[0])
+            if field.shape != SHAPE_SINGLETON:
+                field = field.sub_fields[0]  # type: ignore[index]
+            members = field.sub_fields
+            assert members is not None
+            ref_check = members[union_field.ref_index].validators[0]
+            model_check = members[union_field.model_index].validators[0]
+            assert (ref_check.__func__, ref_check.__self__) == (ReferenceUnionField.require_ref, union_field)
+            assert (model_check.__func__, model_check.__self__) == (ReferenceUnionField.reject_ref, union_field)
+
+
+def test_dispatch_references_again() -> None:
+    def count_validators(fields: Iterable[ModelField]) -> int:
+        return sum(len(field.validators) + count_validators(field.sub_fields or ()) for field in fields)
+
+    validators = count_validators(Schema.__fields__.values())
+    get_reference_union_fields.cache_clear()
+    dispatch_references(Schema)
+    assert count_validators(Schema.__fields__.values()) == validators
+
+
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    [
+        ({"$ref": "#/components/schemas/Pet"}, Reference(ref="#/components/schemas/Pet")),
+        ({"ref": "#/components/schemas/Pet"}, Reference(ref="#/components/schemas/Pet")),
+        ({"type": "string"}, Schema(type="string")),
+    ],
+)
+def test_schema_union_members(data: Dict[str, Any], expected: BaseModel) -> None:
+    media_type = MediaType.parse_obj({"schema": data})
+    parameter = Parameter.parse_obj({"name": "id", "in": "query", "schema": data})
+    assert type(media_type.media_type_schema) is type(expected)
+    assert media_type.media_type_schema == expected
+    assert type(parameter.param_schema) is type(expected)
+    assert parameter.param_schema == expected
+
+
+def test_nested_unions() -> None:
+    schema = Schema.parse_obj(
+        {"allOf": [{"$ref": "#/a"}, {"properties": {"b": {"$ref": "#/b"}, "c": {"items": {"type": "integer"}}}}]}
+    )
+    assert schema.allOf is not None
+    assert schema.allOf[0] == Reference(ref="#/a")
+    nested = schema.allOf[1]
+    assert isinstance(nested, Schema) and nested.properties is not None
+    assert nested.properties["b"] == Reference(ref="#/b")
+    assert nested.properties["c"] == Schema(items=Schema(type="integer"))
+
+
+def test_path_item_keeps_ref() -> None:
+    components = Components.parse_obj(
+        {"pathItems": {"pets": {"$ref": "#/paths/pets"}}, "examples": {"pet": {"$ref": "#/examples/pet"}}}
+    )
+    assert components.pathItems == {"pets": PathItem(ref="#/paths/pets")}
+    assert components.examples == {"pet": Reference(ref="#/examples/pet")}
+
+
+def test_callbacks() -> None:
+    operation = Operation.parse_obj(
+        {
+            "callbacks": {
+                "onEvent": {"{$request.body#/url}": {"post": {"responses": {"200": {"description": "ok"}}}}},
+                "other": {"$ref": "#/components/callbacks/other"},
+            }
+        }
+    )
+    assert operation.callbacks is not None
+    assert isinstance(operation.callbacks["onEvent"]["{$request.body#/url}"], PathItem)  # type: ignore[index]
+    assert operation.callbacks["other"] == Reference(ref="#/components/callbacks/other")
+
+
+def test_errors_are_reported_for_the_field() -> None:
+    with pytest.raises(ValidationError) as error:
+        MediaType.parse_obj({"schema": {"minLength": -1}})
+    assert ("schema", "minLength") in [item["loc"] for item in error.value.errors()]
+
+
+def test_invalid_nested_objects_are_validated_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    depth = 12
+    calls = []
+
+    def count_calls(model: Type[BaseModel]) -> Callable[..., None]:
+        init = model.__init__
+
+        def __init__(self: BaseModel, **data: Any) -> None:
+            calls.append(model)
+            init(self, **data)
+
+        return __init__
+
+    for model in (Reference, Schema):
+        monkeypatch.setattr(model, "__init__", count_calls(model))
+    schema: Dict[str, Any] = {"type": "string", "minLength": -1}
+    for _ in range(depth):
+        schema = {"type": "array", "items": schema}
+    with pytest.raises(ValidationError) as error:
+        OpenAPI.parse_obj(
+            {
+                "info": {"title": "Nested", "version": "1.0.0"},
+                "components": {"schemas": {"Nested": schema}},
+            }
+        )
+    assert [item["loc"] for item in error.value.errors()] == [
+        ("components", "schemas", "Nested", *["items"] * depth, "minLength")
+    ]
+    assert calls == [Schema] * (depth + 1)
+
+
+def test_deeply_nested_schema() -> None:
+    depth = 300
+    schema: Dict[str, Any] = {"$ref": "#/components/schemas/Leaf"}
+    for _ in range(depth):
+        schema = {"items": schema}
+    parsed: Any = Schema.parse_obj(schema)
+    for _ in range(depth):
+        assert isinstance(parsed, Schema)
+        parsed = parsed.items
+    assert parsed == Reference(ref="#/components/schemas/Leaf")
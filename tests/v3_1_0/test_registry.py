@@ -0,0 +1,135 @@
+import gc
+import weakref
+from typing import Type
+
+from pydantic import BaseModel, create_model
+
+from pydantic_openapi_schema.utils.cache import SchemaDefinitionsCache
+from pydantic_openapi_schema.utils.registry import (
+    SchemaNameRegistry,
+    resolve_schema_names,
+)
+from pydantic_openapi_schema.utils.utils import (
+    OpenAPI310PydanticSchema,
+    construct_open_api_with_schema_class,
+)
+from pydantic_openapi_schema.v3_1_0 import (
+    Info,
+    MediaType,
+    OpenAPI,
+    Operation,
+    PathItem,
+    Reference,
+    RequestBody,
+    Response,
+)
+from tests.v3_1_0.test_util import PingRequest, PingResponse
+from tests.v3_1_0.utils import PingRequest as RenamedPingRequest
+
+
+class Parent(BaseModel):
+    child: PingResponse
+
+
+def create_open_api(*models: Type[BaseModel]) -> OpenAPI:
+    return OpenAPI(
+        info=Info(title="My own API", version="v0.0.1"),
+        paths={
+            f"/{index}": PathItem(
+                post=Operation(
+                    requestBody=RequestBody(
+                        content={
+                            "application/json": MediaType(
+                                media_type_schema=OpenAPI310PydanticSchema(schema_class=model)
+                            )
+                        }
+                    ),
+                    responses={"200": Response(description="pong")},
+                )
+            )
+            for index, model in enumerate(models)
+        },
+    )
+
+
+def get_reference(open_api: OpenAPI, index: int) -> str:
+    assert open_api.paths
+    operation = open_api.paths[f"/{index}"].post
+    assert operation and isinstance(operation.requestBody, RequestBody)
+    reference = operation.requestBody.content["application/json"].media_type_schema
+    assert isinstance(reference, Reference)
+    return reference.ref
+
+
+def test_resolve_schema_names() -> None:
+    class Duplicate(BaseModel):
+        __schema_name__ = "PingRequest"
+
+    assert resolve_schema_names([PingRequest, RenamedPingRequest]) == {
+        PingRequest: "PingRequest",
+        RenamedPingRequest: "RenamedPingRequest",
+    }
+    assert (
+        resolve_schema_names([PingRequest, Duplicate])
+        == resolve_schema_names([Duplicate, PingRequest])
+        == {
+            PingRequest: "tests__v3_1_0__test_util__PingRequest",
+            Duplicate: "tests__v3_1_0__test_registry__test_resolve_schema_names___locals___Duplicate",
+        }
+    )
+
+
+def test_models_with_same_name_get_unique_references() -> None:
+    class PingResponse(BaseModel):
+        other: int
+
+    open_api = construct_open_api_with_schema_class(create_open_api(Parent, PingResponse))
+    assert open_api.components and open_api.components.schemas
+
+    references = [get_reference(open_api, index) for index in range(2)]
+    assert references == [
+        "#/components/schemas/Parent",
+        "#/components/schemas/tests__v3_1_0__test_registry__test_models_with_same_name_get_unique_references___locals___PingResponse",
+    ]
+    assert list(open_api.components.schemas) == [
+        "PingResponse",
+        "Parent",
+        "tests__v3_1_0__test_registry__test_models_with_same_name_get_unique_references___locals___PingResponse",
+    ]
+
+
+def test_registry_reuses_schema_classes() -> None:
+    registry = SchemaNameRegistry()
+    open_api = create_open_api(PingRequest, RenamedPingRequest)
+    first = construct_open_api_with_schema_class(open_api, registry=registry, cache=None)
+    assert len(registry) == 1
+    schema_class = registry.get_schema_class(RenamedPingRequest, "RenamedPingRequest")
+
+    second = construct_open_api_with_schema_class(open_api, registry=registry, cache=None)
+    assert len(registry) == 1
+    assert registry.get_schema_class(RenamedPingRequest, "RenamedPingRequest") is schema_class
+    assert registry.get_schema_class(PingRequest, "PingRequest") is PingRequest
+    assert first == second
+
+    registry.clear()
+    assert len(registry) == 0
+
+
+def test_registry_does_not_keep_models_alive() -> None:
+    cache = SchemaDefinitionsCache()
+    registry = SchemaNameRegistry()
+    model = create_model("DynamicModel", value=(int, ...))
+    model.__schema_name__ = "Renamed"  # type: ignore[attr-defined]
+    for default_registry in (False, True):
+        open_api = create_open_api(model)
+        if default_registry:
+            construct_open_api_with_schema_class(open_api, cache=cache)
+        else:
+            construct_open_api_with_schema_class(open_api, registry=registry, cache=cache)
+    assert len(registry) == len(cache) == 1
+    model_ref = weakref.ref(model)
+
+    del model, open_api
+    gc.collect()
+    assert model_ref() is None
+    assert len(registry) == len(cache) == 0
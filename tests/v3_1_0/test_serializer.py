@@ -0,0 +1,89 @@
+import gc
+import json
+import weakref
+from typing import Any
+
+import pytest
+from pydantic import BaseModel, create_model
+
+from pydantic_openapi_schema.utils.hash_consing import hash_cons
+from pydantic_openapi_schema.utils.serializer import to_dict, to_json
+from pydantic_openapi_schema.utils.utils import construct_open_api_with_schema_class
+from pydantic_openapi_schema.v3_1_0 import Example, OpenAPI, Reference, Schema
+from tests.v3_1_0.utils import (
+    PATH,
+    Container,
+    ExtraSchema,
+    Hidden,
+    Point,
+    SimplePingRequest,
+    SimplePingResponse,
+    Wrapper,
+    create_open_api,
+)
+
+
+def assert_serialized(obj: BaseModel, **dumps_kwargs: Any) -> None:
+    assert to_json(obj, **dumps_kwargs) == obj.json(by_alias=True, exclude_none=True, **dumps_kwargs)
+    assert to_dict(obj) == obj.dict(by_alias=True, exclude_none=True)
+
+
+def test_to_json_equals_json() -> None:
+    open_api = OpenAPI.parse_file(PATH)
+    assert_serialized(open_api)
+    assert_serialized(open_api, indent=2, sort_keys=True)
+    hash_cons(open_api)
+    assert_serialized(open_api)
+
+
+def test_to_json_constructed_open_api() -> None:
+    open_api = construct_open_api_with_schema_class(create_open_api(SimplePingRequest, SimplePingResponse))
+    assert_serialized(open_api)
+    unconstructed = create_open_api(SimplePingRequest)
+    assert to_dict(unconstructed) == unconstructed.dict(by_alias=True, exclude_none=True)
+
+
+def test_to_json_compact_key_order() -> None:
+    schema = Schema(type="object", title="Pet")
+    schema.description = "A pet"
+    schema.schema_format = "pet"
+    assert list(to_dict(schema)) == ["type", "format", "title", "description"]
+    assert_serialized(schema)
+
+    extra_schema = ExtraSchema(**{"x-order": 1, "type": "string", "not": {"type": "integer"}})
+    extra_schema.title = "Name"
+    assert list(to_dict(extra_schema)) == ["not", "type", "title", "x-order"]
+    assert_serialized(extra_schema)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"nested": [Reference(ref="#/components/schemas/Pet"), None], "point": Point(1, 2)},
+        (Schema(type="string"), {1, 2}),
+        Example(value=Schema(schema_not=Schema(type="null"))),
+        None,
+    ],
+)
+def test_to_json_values(value: Any) -> None:
+    assert_serialized(Container(value=value, scores={"a": 1}))
+
+
+def test_to_json_unsupported_classes() -> None:
+    container = Container(
+        value=1, wrapped=Wrapper(__root__=[Schema(type="string")]), hidden=Hidden(name="a", secret="b")
+    )
+    assert to_dict(container) == {"value": 1, "wrapped": [{"type": "string"}], "hidden": {"name": "a"}, "scores": {}}
+    assert_serialized(container)
+    assert json.loads(to_json(container.wrapped)) == [{"type": "string"}]  # type: ignore[arg-type]
+    assert_serialized(container.hidden)  # type: ignore[arg-type]
+
+
+def test_encoders_of_released_classes_are_not_kept() -> None:
+    model_classes = [create_model("Model", name=(str, ...)) for _ in range(300)]
+    for model_class in model_classes:
+        assert to_dict(Container(value=[model_class(name="a")])) == {"value": [{"name": "a"}], "scores": {}}
+    first = weakref.ref(model_classes[0])
+    del model_classes, model_class
+    gc.collect()
+    assert first() is None
@@ -0,0 +1,59 @@
+import json
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from pydantic_openapi_schema.utils.spec_index import SpecIndex
+from pydantic_openapi_schema.v3_1_0 import OpenAPI, PathItem, Schema
+from tests.v3_1_0.test_swagger_openapi_v3 import ExtendedOpenAPI, ExtendedPathItem
+
+PATH = "tests/data/swagger_openapi_v3.0.1.json"
+
+
+def test_spec_index_equals_parse_file() -> None:
+    for model_class in (OpenAPI, ExtendedOpenAPI):
+        open_api = model_class.parse_file(PATH)
+        assert open_api.components is not None
+        with SpecIndex(PATH, model_class=model_class) as index:
+            assert list(index.paths) == list(open_api.paths)
+            assert index.paths.parsed_keys == set()
+            for path, path_item in open_api.paths.items():
+                assert index.get_path_item(path) == path_item
+            assert dict(index.components["schemas"]) == open_api.components.schemas
+            assert dict(index.components["securitySchemes"]) == open_api.components.securitySchemes
+            assert index.components["responses"] == {}
+            assert index.webhooks == {}
+        assert isinstance(SpecIndex(PATH, model_class=model_class).get_path_item("/pet"), PathItem)
+    assert isinstance(SpecIndex(PATH, model_class=ExtendedOpenAPI).get_path_item("/pet"), ExtendedPathItem)
+
+
+def test_spec_index_parses_on_access(tmp_path: Path) -> None:
+    path = tmp_path / "spec.json"
+    document = {
+        "openapi": "3.1.0",
+        "info": {"title": 'Braces {[" in strings', "version": "1.0.0"},
+        "paths": {'/a"{b}': {"summary": "}]\\", "get": {"responses": {}}}, "/invalid": {"get": "invalid"}},
+        "components": {"schemas": {"Pet": {"$ref": "#/components/schemas/Animal"}, "Animal": {"type": "object"}}},
+    }
+    path.write_text(json.dumps(document, indent=2), encoding="utf-8")
+    with SpecIndex(path) as index:
+        assert list(index.paths) == ['/a"{b}', "/invalid"]
+        assert index.get_path_item('/a"{b}').summary == "}]\\"
+        assert index.get_schema("Animal") == Schema(type="object")
+        assert index.get_component("schemas", "Pet") == Schema.parse_obj(document["components"]["schemas"]["Pet"])
+        assert index.components["schemas"].parsed_keys == {"Pet", "Animal"}
+        with pytest.raises(ValidationError):
+            index.get_path_item("/invalid")
+        with pytest.raises(KeyError):
+            index.get_path_item("/missing")
+
+
+def test_spec_index_requires_object(tmp_path: Path) -> None:
+    path = tmp_path / "spec.json"
+    path.write_text("[]", encoding="utf-8")
+    with pytest.raises(ValueError):
+        SpecIndex(path)
+    path.write_text('{"paths": {"/a": {}', encoding="utf-8")
+    with pytest.raises(ValueError):
+        SpecIndex(path)
@@ -0,0 +1,61 @@
+import io
+import json
+
+import pytest
+
+from pydantic_openapi_schema.utils.streaming import (
+    StreamEntry,
+    iter_entries,
+    iter_path_items,
+    iter_schemas,
+)
+from pydantic_openapi_schema.v3_1_0 import OpenAPI, PathItem, Schema
+from tests.v3_1_0.test_swagger_openapi_v3 import ExtendedOpenAPI, ExtendedPathItem
+
+PATH = "tests/data/swagger_openapi_v3.0.1.json"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_iter_entries_equals_parse_file(chunk_size: int) -> None:
+    open_api = OpenAPI.parse_file(PATH)
+    assert open_api.components is not None
+    assert dict(iter_path_items(PATH, chunk_size=chunk_size)) == open_api.paths
+    assert dict(iter_schemas(PATH, chunk_size=chunk_size)) == open_api.components.schemas
+    entries = list(iter_entries(PATH, chunk_size=chunk_size))
+    security_schemes = {entry.key: entry.value for entry in entries if entry.location[-1] == "securitySchemes"}
+    assert security_schemes == open_api.components.securitySchemes
+    assert [entry.location for entry in entries if entry.location[0] != "components"] == [("paths",)] * len(
+        open_api.paths
+    )
+
+
+def test_iter_path_items_model_class() -> None:
+    open_api = ExtendedOpenAPI.parse_file(PATH)
+    path_items = dict(iter_path_items(PATH, model_class=ExtendedOpenAPI))
+    assert path_items == open_api.paths
+    assert all(isinstance(path_item, ExtendedPathItem) for path_item in path_items.values())
+
+
+def test_iter_entries_reads_incrementally() -> None:
+    document = {
+        "openapi": "3.1.0",
+        "info": {"title": 'Braces {[" in strings', "version": "1.0.0"},
+        "paths": {'/a"{b}': {"summary": "}]\\"}, "/c": {"summary": "c"}},
+        "webhooks": {"hook": {"$ref": "#/components/pathItems/Hook"}},
+        "components": {"schemas": {"Pet": {"type": "object", "maximum": 1.5, "enum": [True, None]}}},
+    }
+    file = io.BytesIO(json.dumps(document).encode() + b" " * 100_000)
+    entries = iter_entries(file, chunk_size=16)
+    assert next(entries) == StreamEntry(("paths",), '/a"{b}', PathItem(summary="}]\\"))
+    assert file.tell() < 200
+    assert list(entries) == [
+        StreamEntry(("paths",), "/c", PathItem(summary="c")),
+        StreamEntry(("webhooks",), "hook", PathItem(ref="#/components/pathItems/Hook")),
+        StreamEntry(("components", "schemas"), "Pet", Schema(type="object", maximum=1.5, enum=[True, None])),
+    ]
+
+
+@pytest.mark.parametrize("content", [b"[]", b'{"paths": {"/a": {}', b'{"paths": {"/a" {}}}', b'{"info": "a}'])
+def test_iter_entries_invalid_json(content: bytes) -> None:
+    with pytest.raises(ValueError):
+        list(iter_entries(io.BytesIO(content), chunk_size=4))
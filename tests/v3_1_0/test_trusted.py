@@ -0,0 +1,114 @@
+from enum import Enum
+from typing import Dict, List, Optional, Union
+
+import pytest
+from pydantic import BaseModel, Field, confloat, conint
+from pydantic.schema import schema
+from typing_extensions import Literal
+
+from pydantic_openapi_schema.utils.trusted import (
+    construct_model,
+    trusted_parse_file,
+    trusted_parse_obj,
+    trusted_parse_raw,
+)
+from pydantic_openapi_schema.utils.utils import construct_open_api_with_schema_class
+from pydantic_openapi_schema.v3_1_0 import (
+    MediaType,
+    OpenAPI,
+    Parameter,
+    PathItem,
+    Reference,
+    Schema,
+)
+from tests.v3_1_0.test_swagger_openapi_v3 import ExtendedOpenAPI
+from tests.v3_1_0.utils import create_open_api
+
+
+class Color(str, Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class Cat(BaseModel):
+    kind: Literal["cat"]
+    lives: conint(ge=1, le=9) = 9  # type: ignore
+
+
+class Dog(BaseModel):
+    kind: Literal["dog"]
+    weight: confloat(gt=0, multiple_of=2) = 4  # type: ignore
+
+
+class Item(BaseModel):
+    name: str = Field(alias="itemName", description="name of the item", example="foo")
+    color: Color = Color.RED
+    counts: Dict[str, List[int]] = {}
+    pet: Union[Cat, Dog] = Field(discriminator="kind")
+    parent: Optional["Item"] = None
+    size: float = 1
+
+
+Item.update_forward_refs()
+
+
+def test_construct_model_equals_parse_obj() -> None:
+    definitions = schema([Item], ref_prefix="#/components/schemas/")["definitions"]
+    for definition in definitions.values():
+        parsed = Schema.parse_obj(definition)
+        constructed = construct_model(Schema, definition)
+        assert constructed == parsed
+        assert constructed.__fields_set__ == parsed.__fields_set__
+        assert constructed.json(by_alias=True, exclude_none=True) == parsed.json(by_alias=True, exclude_none=True)
+
+
+def test_construct_model_dispatches_on_ref() -> None:
+    media_type = construct_model(MediaType, {"schema": {"$ref": "#/components/schemas/Item"}, "unknown": 1})
+    assert isinstance(media_type.media_type_schema, Reference)
+    assert media_type.media_type_schema.ref == "#/components/schemas/Item"
+    assert media_type.__fields_set__ == {"media_type_schema"}
+
+    schema_object = construct_model(Schema, {"additionalProperties": False, "items": {"type": "string"}})
+    assert schema_object.additionalProperties is False
+    assert schema_object.items == Schema(type="string")
+
+
+def test_construct_open_api_trusted() -> None:
+    open_api = create_open_api(Item, Cat)
+    trusted = construct_open_api_with_schema_class(open_api, cache=None, trusted=True)
+    validated = construct_open_api_with_schema_class(open_api, cache=None)
+    assert trusted == validated
+    assert trusted.json(by_alias=True, exclude_none=True) == validated.json(by_alias=True, exclude_none=True)
+
+
+def test_trusted_parse_file_equals_parse_file() -> None:
+    path = "tests/data/swagger_openapi_v3.0.1.json"
+    for model_class in (OpenAPI, ExtendedOpenAPI):
+        loaded = trusted_parse_file(model_class, path)
+        parsed = model_class.parse_file(path)
+        assert loaded == parsed
+        assert loaded.json(by_alias=True, exclude_none=True) == parsed.json(by_alias=True, exclude_none=True)
+
+
+def test_trusted_parse_raw() -> None:
+    raw = (
+        '{"openapi": "3.1.0", "info": {"title": "API", "version": "1"}, "paths": {"/": {"post": {'
+        '"callbacks": {"onEvent": {"{$request.body#/url}": {"post": {"responses": {"200": {"description": "ok"}}}}}},'
+        '"parameters": [{"name": "id", "in": "query", "schema": {"$ref": "#/components/schemas/Id"}}]}}}}'
+    )
+    open_api = trusted_parse_raw(OpenAPI, raw)
+    assert open_api.paths is not None
+    operation = open_api.paths["/"].post
+    assert operation is not None and operation.callbacks is not None and operation.parameters is not None
+    callback = operation.callbacks["onEvent"]
+    assert isinstance(callback, dict)
+    assert isinstance(callback["{$request.body#/url}"], PathItem)
+    parameter = operation.parameters[0]
+    assert isinstance(parameter, Parameter)
+    assert parameter.param_in == "query"
+    assert parameter.param_schema == Reference(ref="#/components/schemas/Id")
+
+
+def test_trusted_parse_obj_requires_dict() -> None:
+    with pytest.raises(TypeError):
+        trusted_parse_obj(OpenAPI, [])
@@ -1,17 +1,26 @@
+import gc
+import weakref
+from typing import Optional, Type
+
 from pydantic import BaseModel, Field
 
+from pydantic_openapi_schema.utils.introspection import get_schema_fields
 from pydantic_openapi_schema.utils.utils import (
     OpenAPI310PydanticSchema,
     construct_open_api_with_schema_class,
 )
 from pydantic_openapi_schema.v3_1_0 import (
+    Components,
+    Example,
     Info,
     MediaType,
     OpenAPI,
     Operation,
     PathItem,
+    Reference,
     RequestBody,
     Response,
+    Schema,
 )
 from tests.v3_1_0.utils import PingRequest as OtherPingRequest
 from tests.v3_1_0.utils import PingResponse as OtherPingResponse
@@ -356,3 +365,102 @@ def test_should_not_modify_schema_when_no_pydantic_models_are_present() -> None:
         paths={},
     )
     assert construct_open_api_with_schema_class(open_api) == open_api
+
+
+def test_construct_open_api_with_schema_class_copy_on_write() -> None:
+    open_api = OpenAPI(
+        info=Info(title="My own API", version="v0.0.1"),
+        paths={
+            "/ping": PathItem(
+                post=Operation(
+                    requestBody=RequestBody(
+                        content={
+                            "application/json": MediaType(
+                                media_type_schema=OpenAPI310PydanticSchema(schema_class=PingRequest)
+                            )
+                        }
+                    ),
+                    responses={"200": Response(description="pong")},
+                )
+            ),
+            "/pong": PathItem(get=Operation(responses={"200": Response(description="pong")})),
+        },
+        components=Components(schemas={"Existing": Schema(type="string")}),
+    )
+    original = open_api.copy(deep=True)
+
+    result = construct_open_api_with_schema_class(open_api, copy_on_write=True)
+
+    assert result == construct_open_api_with_schema_class(open_api)
+    assert open_api == original
+    assert result.info is open_api.info
+    assert result.paths and open_api.paths
+    assert result.paths["/pong"] is open_api.paths["/pong"]
+    assert result.paths["/ping"].post and open_api.paths["/ping"].post
+    assert result.paths["/ping"].post.responses is open_api.paths["/ping"].post.responses
+    assert result.paths["/ping"].post.requestBody is not open_api.paths["/ping"].post.requestBody
+    assert result.components and result.components.schemas
+    assert list(result.components.schemas) == ["Existing", "PingRequest"]
+    assert result.components.schemas["Existing"] is open_api.components.schemas["Existing"]  # type: ignore
+
+
+def test_construct_open_api_only_visits_fields_that_can_hold_schemas() -> None:
+    class ExtendedOperation(Operation):
+        x_schema: Optional[Schema] = None
+
+    open_api = OpenAPI(
+        info=Info(title="My own API", version="v0.0.1"),
+        paths={
+            "/ping": PathItem(
+                post=ExtendedOperation(
+                    x_schema=OpenAPI310PydanticSchema(schema_class=PingRequest),
+                    responses={
+                        "200": Response(
+                            description="pong",
+                            content={
+                                "application/json": MediaType(
+                                    examples={
+                                        "pong": Example(value=OpenAPI310PydanticSchema(schema_class=PongResponse))
+                                    }
+                                )
+                            },
+                        )
+                    },
+                )
+            )
+        },
+    )
+    result = construct_open_api_with_schema_class(open_api)
+    assert result.paths and isinstance(result.paths["/ping"].post, ExtendedOperation)
+    assert result.paths["/ping"].post.x_schema == Reference(ref="#/components/schemas/PingRequest")
+    assert result.components and result.components.schemas
+    assert list(result.components.schemas) == ["PingRequest"]
+
+
+def test_construct_open_api_with_deeply_nested_schemas() -> None:
+    schema = Schema(items=OpenAPI310PydanticSchema(schema_class=PingRequest))
+    for _ in range(5000):
+        schema = Schema.construct(items=schema)
+    open_api = OpenAPI(
+        info=Info(title="My own API", version="v0.0.1"),
+        components=Components.construct(schemas={"Nested": schema}),
+    )
+    result = construct_open_api_with_schema_class(open_api, copy_on_write=True)
+    assert result.components and result.components.schemas
+    assert list(result.components.schemas) == ["Nested", "PingRequest"]
+
+
+def test_schema_fields_of_released_classes_are_not_kept() -> None:
+    def create_operation_class() -> Type[Operation]:
+        class ExtendedOperation(Operation):
+            x_schema: Optional[Schema] = None
+
+        return ExtendedOperation
+
+    operation_classes = [create_operation_class() for _ in range(300)]
+    for operation_class in operation_classes:
+        assert "x_schema" in get_schema_fields(operation_class)
+    first = weakref.ref(operation_classes[0])
+    del operation_classes, operation_class
+    gc.collect()
+    assert first() is None
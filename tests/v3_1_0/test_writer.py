@@ -0,0 +1,118 @@
+import asyncio
+import io
+import json
+from pathlib import Path
+from typing import Any, List, Optional
+
+import pytest
+
+from pydantic_openapi_schema.utils.utils import construct_open_api_with_schema_class
+from pydantic_openapi_schema.utils.writer import (
+    aiter_json,
+    aiter_yaml,
+    iter_json,
+    iter_yaml,
+    write_json,
+    write_yaml,
+)
+from pydantic_openapi_schema.v3_1_0 import OpenAPI, Schema
+from tests.v3_1_0.utils import (
+    PATH,
+    Container,
+    ExtraSchema,
+    Hidden,
+    Point,
+    SimplePingRequest,
+    SimplePingResponse,
+    Wrapper,
+    create_open_api,
+)
+
+VALUES = [
+    {"nested": [Schema(type="string"), None, {}], "point": Point(1, 2), 2: [], None: 2.5, True: "é"},
+    (Schema(schema_not=Schema(type="null")), {1}, float("nan"), float("inf"), -1e16),
+    ["yes", "No", "1.0", "", "a: b", " x", "x ", "#y", "- z", '"q"\n\t\\', "/pets/{id}", "Café ☕ \x85"],
+]
+
+
+def assert_json(obj: Any, indent: Optional[int] = None, chunk_size: int = 64) -> None:
+    chunks = list(iter_json(obj, indent=indent, chunk_size=chunk_size))
+    assert b"".join(chunks) == obj.json(by_alias=True, exclude_none=True, indent=indent).encode()
+    assert all(len(chunk) >= chunk_size for chunk in chunks[:-1])
+
+
+@pytest.mark.parametrize("indent", [None, 0, 2])
+def test_iter_json_equals_json(indent: Optional[int]) -> None:
+    open_api = OpenAPI.parse_file(PATH)
+    assert_json(open_api, indent=indent)
+    assert_json(
+        construct_open_api_with_schema_class(create_open_api(SimplePingRequest, SimplePingResponse)), indent=indent
+    )
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_iter_json_values(value: Any) -> None:
+    container = Container(
+        value=value, wrapped=Wrapper(__root__=[Schema(type="string")]), hidden=Hidden(name="a", secret="b")
+    )
+    assert_json(container)
+    assert_json(container, indent=2)
+    extra_schema = ExtraSchema(**{"x-order": value, "type": "string", "not": {"type": "integer"}})
+    extra_schema.title = "Name"
+    assert_json(extra_schema)
+    assert_json(Wrapper(__root__=[]))
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_iter_yaml_values(value: Any) -> None:
+    yaml = pytest.importorskip("yaml")
+    container = Container(value=value, wrapped=Wrapper(__root__=[Schema(type="string")]))
+    expected = json.loads(container.json(by_alias=True, exclude_none=True), parse_constant=str)
+    loaded = yaml.safe_load(b"".join(iter_yaml(container, chunk_size=16)))
+    assert json.loads(json.dumps(loaded).replace("NaN", '"NaN"').replace("Infinity", '"Infinity"')) == expected
+    assert list(loaded) == list(expected)
+
+
+def test_write_files(tmp_path: Path) -> None:
+    yaml = pytest.importorskip("yaml")
+    open_api = OpenAPI.parse_file(PATH)
+    expected = open_api.json(by_alias=True, exclude_none=True, indent=2).encode()
+    assert write_json(open_api, tmp_path / "openapi.json", indent=2) == len(expected)
+    assert (tmp_path / "openapi.json").read_bytes() == expected
+    file = io.BytesIO()
+    write_yaml(open_api, file)
+    assert yaml.safe_load(file.getvalue()) == json.loads(expected)
+    assert write_yaml(open_api, str(tmp_path / "openapi.yaml")) == len(file.getvalue())
+
+
+def test_yaml_line_separators() -> None:
+    yaml = pytest.importorskip("yaml")
+    schema = Schema(title="a b", description="c d", properties={"e  f": Schema(type="string")})
+    document = b"".join(iter_yaml(schema))
+    assert " ".encode() not in document
+    assert " ".encode() not in document
+    assert b'"a\\Lb"' in document
+    assert b'"c\\Pd"' in document
+    assert yaml.safe_load(document) == json.loads(schema.json(by_alias=True, exclude_none=True))
+
+
+def test_aiter_chunks() -> None:
+    open_api = OpenAPI.parse_file(PATH)
+
+    async def collect() -> List[bytes]:
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        ticker = asyncio.ensure_future(tick())
+        chunks = [chunk async for chunk in aiter_json(open_api, chunk_size=1024)]
+        ticker.cancel()
+        assert ticks >= len(chunks) - 1 > 1
+        assert b"".join([chunk async for chunk in aiter_yaml(open_api)]) == b"".join(iter_yaml(open_api))
+        return chunks
+
+    assert b"".join(asyncio.run(collect())) == open_api.json(by_alias=True, exclude_none=True).encode()
@@ -1,4 +1,21 @@
-from pydantic import BaseModel, Field
+import json
+from typing import Any, Dict, List, NamedTuple, Optional, Type
+
+from pydantic import BaseModel, Extra, Field
+
+from pydantic_openapi_schema.utils.utils import OpenAPI310PydanticSchema
+from pydantic_openapi_schema.v3_1_0 import (
+    Info,
+    MediaType,
+    OpenAPI,
+    Operation,
+    PathItem,
+    RequestBody,
+    Response,
+    Schema,
+)
+
+PATH = "tests/data/swagger_openapi_v3.0.1.json"
 
 
 class PingRequest(BaseModel):
@@ -17,3 +34,89 @@ class PingResponse(BaseModel):
 
     resp_foo: str = Field(description="foo value of the response")
     resp_bar: str = Field(description="bar value of the response")
+
+
+class SimplePingRequest(BaseModel):
+    req_foo: str
+
+
+class SimplePingResponse(BaseModel):
+    resp_foo: str
+
+
+class Tag(BaseModel):
+    name: str
+
+
+class Pet(BaseModel):
+    name: str
+    tags: List[Tag]
+
+
+class Owner(BaseModel):
+    pets: List[Pet]
+
+
+class Shop(BaseModel):
+    tags: List[Tag]
+
+
+class Address(BaseModel):
+    street: str
+
+
+class Customer(BaseModel):
+    address: Address
+
+
+class ExtraSchema(Schema):
+    class Config:
+        extra = Extra.allow
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+
+
+class Wrapper(BaseModel):
+    __root__: List[Schema]
+
+
+class Hidden(BaseModel):
+    name: str
+    secret: Optional[str] = Field(None, exclude=True)
+
+
+class Container(BaseModel):
+    value: Any
+    wrapped: Optional[Wrapper] = None
+    hidden: Optional[Hidden] = None
+    scores: Dict[str, float] = {}
+
+
+def load_document() -> Dict[str, Any]:
+    with open(PATH, encoding="utf-8") as file:
+        document: Dict[str, Any] = json.load(file)
+    return document
+
+
+def create_open_api(*models: Type[BaseModel]) -> OpenAPI:
+    return OpenAPI(
+        info=Info(title="My own API", version="v0.0.1"),
+        paths={
+            f"/{index}": PathItem(
+                post=Operation(
+                    requestBody=RequestBody(
+                        content={
+                            "application/json": MediaType(
+                                media_type_schema=OpenAPI310PydanticSchema(schema_class=model)
+                            )
+                        }
+                    ),
+                    responses={"200": Response(description="pong")},
+                )
+            )
+            for index, model in enumerate(models)
+        },
+    )